@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Multi-Account Supervisor
+Startet pro aktiviertem Account aus config.json einen eigenen Worker-Prozess
+(eigene Session, eigener Browser bei Bedarf, eigenes Log) und fasst den Durchsatz zusammen.
+
+Die nur-lesbaren Tabellen (Einsatz-Datenbank, Fahrzeugtypen) werden einmal vom
+Supervisor geladen und in eine Datei mit Index und einzeln kodierten Einträgen
+geschrieben. Die Worker mappen sie per mmap und dekodieren einen Einsatztyp erst
+beim Zugriff - die Daten liegen nur einmal im Speicher (Page-Cache des Systems),
+pro Worker bleibt nur der kleine Index.
+"""
+
+import copy
+import json
+import mmap
+import multiprocessing
+import os
+import queue
+import re
+import struct
+import sys
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+from colorama import Fore, init
+
+from http_client import create_session
+from vehicle_types import VEHICLE_TYPES
+
+init(autoreset=True)
+
+CACHE_DIR = 'cache'
+SHARED_TABLES_FILE = os.path.join(CACHE_DIR, 'shared_tables.bin')
+SHARED_TABLES_MAGIC = b'LSSTAB01'
+MISSION_CACHE_MAX_AGE = 86400  # 24 Stunden, wie im Bot
+
+
+def account_slug(account, index):
+    """Bildet einen dateinamen-tauglichen Kurznamen für einen Account"""
+    name = account.get('name') or account.get('email', '') or f'account{index}'
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_').lower()
+    return slug or f'account{index}'
+
+
+def build_account_config(base_config, account, slug):
+    """Erstellt die Konfiguration für einen einzelnen Account-Worker"""
+    config = copy.deepcopy(base_config)
+    config.pop('accounts', None)
+    config['credentials'] = {
+        'email': account.get('email', ''),
+        'password': account.get('password', '')
+    }
+
+    # Eigenes Log pro Account
+    logging_config = config.setdefault('logging', {})
+    log_file = logging_config.get('file', 'bot.log')
+    root, ext = os.path.splitext(log_file)
+    logging_config['file'] = f"{root}_{slug}{ext or '.log'}"
+
+    # Account-spezifische Überschreibungen (z.B. "headless_browser": false)
+    config.setdefault('bot', {}).update(account.get('bot', {}))
+    return config
+
+
+def write_shared_tables(base_url, path=SHARED_TABLES_FILE):
+    """Lädt Einsatz-Datenbank und Fahrzeugtypen einmalig und schreibt sie für die Worker"""
+    mission_cache = {}
+    timestamp = 0
+    mission_cache_file = os.path.join(CACHE_DIR, 'mission_cache.json')
+
+    # Vorhandenen Cache des Bots nutzen, wenn er frisch genug ist
+    try:
+        if os.path.exists(mission_cache_file):
+            with open(mission_cache_file, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            if time.time() - cache_data.get('timestamp', 0) < MISSION_CACHE_MAX_AGE:
+                mission_cache = cache_data.get('missions', {})
+                timestamp = cache_data.get('timestamp', 0)
+    except Exception as e:
+        print(f"{Fore.YELLOW}⚠ Konnte Mission-Cache nicht lesen: {e}")
+
+    if not mission_cache:
+        try:
+            response = create_session().get(f'{base_url}/einsaetze.json')
+            if response.status_code == 200:
+                for mission in response.json():
+                    mission_cache[str(mission.get('id', ''))] = {
+                        'name': mission.get('name', ''),
+                        'requirements': mission.get('requirements', {}),
+                        'chances': mission.get('chances', {}),
+                        'average_credits': mission.get('average_credits', 0)
+                    }
+                timestamp = time.time()
+                with open(mission_cache_file, 'w', encoding='utf-8') as f:
+                    json.dump({'timestamp': timestamp, 'missions': mission_cache}, f, indent=2, ensure_ascii=False)
+            else:
+                print(f"{Fore.YELLOW}⚠ Einsatz-Datenbank nicht verfügbar (Status {response.status_code}) - Worker laden selbst")
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠ Fehler beim Laden der Einsatz-Datenbank: {e} - Worker laden selbst")
+
+    # Aufbau: Kennung, Länge des Kopfs (uint32), Kopf (JSON mit Index Einsatz-ID -> [Offset, Länge]), Einträge
+    records = []
+    index = {}
+    offset = 0
+    for mission_id, mission in mission_cache.items():
+        record = json.dumps(mission, ensure_ascii=False).encode('utf-8')
+        index[mission_id] = [offset, len(record)]
+        records.append(record)
+        offset += len(record)
+
+    header = json.dumps({
+        'timestamp': timestamp,
+        'vehicle_types': {str(type_id): info['name'] for type_id, info in VEHICLE_TYPES.items()},
+        'missions': index,
+    }, ensure_ascii=False).encode('utf-8')
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(SHARED_TABLES_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, path)
+    return len(mission_cache)
+
+
+class SharedTable(Mapping):
+    """Nur-lesbare Einsatz-Datenbank aus der gemappten Datei - Einträge werden erst beim Zugriff dekodiert"""
+
+    def __init__(self, mm, index, base):
+        self.mm = mm          # mmap bleibt offen, solange die Tabelle lebt
+        self.index = index    # Einsatz-ID -> [Offset, Länge] relativ zu base
+        self.base = base
+
+    def __getitem__(self, mission_id):
+        offset, length = self.index[mission_id]
+        start = self.base + offset
+        return json.loads(self.mm[start:start + length].decode('utf-8'))
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+
+def load_shared_tables(path=SHARED_TABLES_FILE):
+    """Mappt die gemeinsamen Tabellen (nur lesend) - 'missions' ist eine SharedTable"""
+    try:
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(SHARED_TABLES_MAGIC)] != SHARED_TABLES_MAGIC:
+            mm.close()
+            return None
+        header_start = len(SHARED_TABLES_MAGIC) + 4
+        (header_length,) = struct.unpack('<I', mm[len(SHARED_TABLES_MAGIC):header_start])
+        header = json.loads(mm[header_start:header_start + header_length].decode('utf-8'))
+        return {
+            'timestamp': header.get('timestamp', 0),
+            'vehicle_types': header.get('vehicle_types', {}),
+            'missions': SharedTable(mm, header.get('missions', {}), header_start + header_length),
+        }
+    except Exception:
+        return None
+
+
+def run_account_worker(slug, config, shared_tables_path, stats_queue, stop_event):
+    """Worker-Prozess: betreibt einen Bot für genau einen Account"""
+    # Import erst im Worker, damit der Supervisor ohne Selenium/Browser auskommt
+    from bot_standalone import LeitstellenspielBot, stop_logging
+
+    def report(kind, **data):
+        data.update({'account': slug, 'kind': kind, 'time': time.time()})
+        try:
+            stats_queue.put(data)
+        except Exception:
+            pass
+
+    bot = None
+    try:
+        bot = LeitstellenspielBot(config=config)
+
+        tables = load_shared_tables(shared_tables_path)
+        if tables:
+            if tables.get('missions'):
+                bot.mission_cache = tables['missions']
+                bot.mission_cache_age = tables.get('timestamp') or time.time()
+            bot.api_vehicle_types = tables.get('vehicle_types', {})
+
+        # Browser startet erst bei Bedarf (bot.ensure_browser)
+        if not bot.login():
+            report('error', message='Login fehlgeschlagen')
+            return
+
+        report('started')
+        bot.start_metrics_server()
+
+        wait_time = config.get('bot', {}).get('check_interval', 30)
+        while not stop_event.is_set():
+            cycle_start = time.time()
+            bot.begin_cycle()
+            try:
+                try:
+                    bot.ensure_logged_in()
+                    processed = bot.process_missions() or 0
+                finally:
+                    # Auch nach einem Fehler abschließen, sonst bleibt das Profiling aktiv
+                    bot.end_cycle()
+                bot.close_idle_browser()
+                report('cycle', processed=processed, duration=time.time() - cycle_start)
+            except Exception as e:
+                bot.logger.error(f"{Fore.RED}Fehler im Zyklus: {e}")
+                report('error', message=str(e))
+
+            # Unterbrechbar warten
+            stop_event.wait(wait_time)
+
+    except Exception as e:
+        report('error', message=str(e))
+    finally:
+        if bot:
+            bot.stop_metrics_server()
+            bot.close_browser()
+        report('stopped')
+        # Worker-Prozesse führen kein atexit aus - ausstehende Log-Einträge selbst schreiben
+        stop_logging()
+
+
+class AccountPool:
+    def __init__(self, config_path='config.json'):
+        """Initialisiert den Supervisor mit der gemeinsamen config.json"""
+        if not os.path.exists(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+
+        self.base_url = self.config.get('game', {}).get('base_url', 'https://www.leitstellenspiel.de')
+        # Spawn auf allen Plattformen: jeder Worker startet mit sauberem Logging und eigenem Browser
+        self.context = multiprocessing.get_context('spawn')
+        self.stats_queue = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.workers = {}  # slug -> Process
+        self.stats = {}  # slug -> Durchsatz-Statistik
+        self.started_at = None
+
+    def enabled_accounts(self):
+        """Liefert alle aktivierten Accounts mit eindeutigem Kurznamen"""
+        accounts = []
+        used = set()
+        for index, account in enumerate(self.config.get('accounts', []), 1):
+            if not account.get('enabled', True):
+                continue
+            if not account.get('email') or not account.get('password'):
+                print(f"{Fore.YELLOW}⚠ Account #{index} ohne Login-Daten übersprungen")
+                continue
+            slug = account_slug(account, index)
+            if slug in used:
+                slug = f'{slug}_{index}'
+            used.add(slug)
+            accounts.append((slug, account))
+        return accounts
+
+    def start(self):
+        """Lädt die gemeinsamen Tabellen und startet einen Worker pro Account"""
+        accounts = self.enabled_accounts()
+        if not accounts:
+            print(f"{Fore.RED}Keine aktivierten Accounts in config.json gefunden!")
+            return False
+
+        print(f"{Fore.CYAN}Lade gemeinsame Tabellen...")
+        mission_count = write_shared_tables(self.base_url)
+        print(f"{Fore.GREEN}✓ {mission_count} Einsatztypen, {len(VEHICLE_TYPES)} Fahrzeugtypen bereitgestellt")
+
+        self.started_at = time.time()
+        for index, (slug, account) in enumerate(accounts):
+            config = build_account_config(self.config, account, slug)
+            if config.get('metrics', {}).get('enabled', False):
+                # Eigener Metrik-Port pro Account
+                config['metrics']['port'] = config['metrics'].get('port', 9108) + index
+            process = self.context.Process(
+                target=run_account_worker,
+                args=(slug, config, SHARED_TABLES_FILE, self.stats_queue, self.stop_event),
+                name=f'account-{slug}',
+                daemon=True
+            )
+            process.start()
+            self.workers[slug] = process
+            self.stats[slug] = {
+                'cycles': 0,
+                'missions_processed': 0,
+                'cycle_time': 0.0,
+                'errors': 0,
+                'status': 'startet',
+                'started_at': time.time()
+            }
+            print(f"{Fore.GREEN}✓ Worker für '{account.get('name', slug)}' gestartet (PID {process.pid})")
+
+        return True
+
+    def handle_report(self, report):
+        """Verbucht eine Meldung eines Workers"""
+        stats = self.stats.get(report.get('account'))
+        if stats is None:
+            return
+
+        kind = report.get('kind')
+        if kind == 'started':
+            stats['status'] = 'läuft'
+        elif kind == 'cycle':
+            stats['cycles'] += 1
+            stats['missions_processed'] += report.get('processed', 0)
+            stats['cycle_time'] += report.get('duration', 0.0)
+        elif kind == 'error':
+            stats['errors'] += 1
+            print(f"{Fore.RED}✗ [{report['account']}] {report.get('message', '')}")
+        elif kind == 'stopped':
+            stats['status'] = 'beendet'
+
+    def print_summary(self):
+        """Gibt den Durchsatz pro Account und gesamt aus"""
+        total_missions = 0
+        total_per_hour = 0.0
+
+        print(f"{Fore.MAGENTA}{'='*60}")
+        print(f"{Fore.MAGENTA}Durchsatz - {datetime.now().strftime('%H:%M:%S')}")
+        for slug, stats in self.stats.items():
+            process = self.workers.get(slug)
+            if process and not process.is_alive() and stats['status'] != 'beendet':
+                stats['status'] = f'abgestürzt (Exit {process.exitcode})'
+
+            runtime_hours = max(time.time() - stats['started_at'], 1) / 3600
+            per_hour = stats['missions_processed'] / runtime_hours
+            avg_cycle = stats['cycle_time'] / stats['cycles'] if stats['cycles'] else 0
+            total_missions += stats['missions_processed']
+            total_per_hour += per_hour
+
+            print(f"{Fore.CYAN}  {slug}: {stats['missions_processed']} Einsätze in {stats['cycles']} Zyklen "
+                  f"({per_hour:.1f}/h, Ø Zyklus {avg_cycle:.1f}s, {stats['errors']} Fehler) - {stats['status']}")
+
+        print(f"{Fore.GREEN}  Gesamt: {total_missions} Einsätze ({total_per_hour:.1f}/h)")
+        print(f"{Fore.MAGENTA}{'='*60}")
+
+    def run(self, summary_interval=60):
+        """Überwacht die Worker und fasst regelmäßig den Durchsatz zusammen"""
+        if not self.start():
+            return
+
+        print(f"\n{Fore.GREEN}Account-Pool läuft... (Strg+C zum Beenden)\n")
+        last_summary = time.time()
+
+        try:
+            while any(p.is_alive() for p in self.workers.values()):
+                try:
+                    self.handle_report(self.stats_queue.get(timeout=1))
+                except queue.Empty:
+                    pass
+
+                if time.time() - last_summary >= summary_interval:
+                    self.print_summary()
+                    last_summary = time.time()
+
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}Account-Pool wird beendet...")
+        finally:
+            self.stop()
+
+    def stop(self, timeout=30):
+        """Beendet alle Worker (erst freundlich, dann hart)"""
+        self.stop_event.set()
+        for process in self.workers.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+        # Restliche Meldungen einsammeln
+        while True:
+            try:
+                self.handle_report(self.stats_queue.get_nowait())
+            except (queue.Empty, OSError, ValueError):
+                break
+
+        self.print_summary()
+
+
+if __name__ == '__main__':
+    config_file = sys.argv[1] if len(sys.argv) > 1 else 'config.json'
+    AccountPool(config_file).run()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zyklus-Benchmark
+Lässt process_missions() gegen den lokalen Fake-Server laufen und misst:
+Einsätze pro Minute, p50/p95 Alarmierungsdauer pro Einsatz, HTTP-Anfragen und
+WebDriver-Befehle pro Einsatz sowie den Spitzen-Speicherverbrauch (RSS).
+
+Ergebnisse werden als JSON gespeichert und lassen sich mit --compare vergleichen:
+    python benchmarks/bench_cycle.py --scenarios 10 100
+    python benchmarks/bench_cycle.py --compare benchmarks/results/alt.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_server import FakeLeitstellenspielServer
+from rate_governor import DEFAULT_BUDGETS
+
+DEFAULT_SCENARIOS = [10, 100, 1000]
+
+# Kennzahl -> True wenn größer besser ist (für den Vergleich)
+METRICS = {
+    'missions_per_minute': True,
+    'dispatch_p50_ms': False,
+    'dispatch_p95_ms': False,
+    'http_requests_per_mission': False,
+    'webdriver_commands_per_mission': False,
+    'peak_rss_mb': False,
+}
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def percentile(values, pct):
+    """Perzentil mit linearer Interpolation"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+class RssSampler:
+    def __init__(self, interval=0.2):
+        """Misst den Spitzen-RSS des Prozesses inkl. Kindprozessen (Browser, Treiber)"""
+        self.interval = interval
+        self.peak = 0
+        self.running = False
+        self.thread = None
+
+    def sample(self):
+        if psutil:
+            try:
+                process = psutil.Process()
+                total = process.memory_info().rss
+                for child in process.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+                return total
+            except psutil.Error:
+                return 0
+        try:
+            import resource
+            # Linux: KB, macOS: Bytes - nur eigener Prozess
+            usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return usage if platform.system() == 'Darwin' else usage * 1024
+        except ImportError:
+            return 0
+
+    def run(self):
+        while self.running:
+            self.peak = max(self.peak, self.sample())
+            time.sleep(self.interval)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name='rss-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join()
+        self.peak = max(self.peak, self.sample())
+        return self.peak
+
+
+class CallCounter:
+    def __init__(self):
+        """Zählt HTTP-Anfragen der requests-Session und WebDriver-Befehle"""
+        self.http = 0
+        self.webdriver = 0
+
+    def wrap_session(self, session):
+        original = session.request
+
+        def counted_request(*args, **kwargs):
+            self.http += 1
+            return original(*args, **kwargs)
+
+        session.request = counted_request
+
+    def wrap_driver(self, driver):
+        original = driver.execute
+
+        def counted_execute(*args, **kwargs):
+            self.webdriver += 1
+            return original(*args, **kwargs)
+
+        driver.execute = counted_execute
+
+
+def build_config(base_url, missions, headless=True, lean=False):
+    """Bot-Konfiguration für einen Benchmark-Lauf"""
+    return {
+        'credentials': {'email': 'bench@example.invalid', 'password': 'bench'},
+        'game': {'base_url': base_url},
+        'bot': {
+            'check_interval': 0,
+            'auto_dispatch': True,
+            'auto_follow_up': False,
+            'max_missions_per_cycle': missions,
+            'headless_browser': headless,
+            'lean_browser': lean,
+            'reuse_session': False,
+            'browser_idle_timeout': 0,
+            'auto_set_status6_on_fail': False,
+        },
+        'features': {'alliance_mission': False},
+        # Budgets praktisch unbegrenzt - gemessen wird der Bot, nicht das Anfrage-Budget
+        'limits': {'budgets': {name: {'rate': 1e6, 'burst': 1e6} for name in DEFAULT_BUDGETS}},
+        'logging': {'level': 'WARNING', 'file': 'bench.log'},
+    }
+
+
+def run_scenario(missions, latency_ms=0, headless=True, lean=False, max_cycles=5):
+    """Führt ein Szenario aus und liefert die Kennzahlen"""
+    from bot_standalone import LeitstellenspielBot
+
+    server = FakeLeitstellenspielServer(port=0, missions=missions, latency_ms=latency_ms).start()
+    workdir = tempfile.mkdtemp(prefix='lss_bench_')
+    old_cwd = os.getcwd()
+    os.chdir(workdir)  # Cache, Logs und Debug-Dateien landen im Temp-Ordner
+
+    counter = CallCounter()
+    sampler = RssSampler()
+    latencies = []
+    bot = None
+
+    try:
+        bot = LeitstellenspielBot(config=build_config(server.base_url, missions, headless, lean))
+        logging.getLogger('bot_standalone').setLevel(logging.WARNING)
+
+        # Eingeloggte Session direkt setzen - gemessen wird der Zyklus, nicht der Login
+        bot.session.cookies.set('_session_id', server.create_session(), path='/')
+        bot.logged_in = True
+        bot.update_mission_cache()
+        counter.wrap_session(bot.session)
+
+        original_launch = bot.launch_driver
+
+        def counted_launch(*args, **kwargs):
+            driver = original_launch(*args, **kwargs)
+            if driver:
+                counter.wrap_driver(driver)
+            return driver
+
+        bot.launch_driver = counted_launch
+
+        original_dispatch = bot.dispatch_vehicles
+
+        def timed_dispatch(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original_dispatch(*args, **kwargs)
+            finally:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        bot.dispatch_vehicles = timed_dispatch
+
+        # Zähler erst ab hier (Mission-Cache-Aufbau gehört nicht zum Zyklus)
+        counter.http = 0
+        server_requests_before = sum(server.request_stats().values())
+
+        sampler.start()
+        start = time.perf_counter()
+        processed = 0
+        cycles = 0
+        for cycles in range(1, max_cycles + 1):
+            done = bot.process_missions() or 0
+            processed += done
+            if done == 0 or server.state.alarms >= missions:
+                break
+        duration = time.perf_counter() - start
+        peak_rss = sampler.stop()
+
+        server_requests = sum(server.request_stats().values()) - server_requests_before
+        per_mission = max(processed, 1)
+        return {
+            'missions': missions,
+            'latency_ms': latency_ms,
+            'lean_browser': lean,
+            'cycles': cycles,
+            'processed': processed,
+            'alarms': server.state.alarms,
+            'duration_s': round(duration, 3),
+            'missions_per_minute': round(processed / duration * 60, 2) if duration else 0.0,
+            'dispatch_p50_ms': round(percentile(latencies, 50), 1),
+            'dispatch_p95_ms': round(percentile(latencies, 95), 1),
+            'http_requests_per_mission': round(counter.http / per_mission, 2),
+            'server_requests_per_mission': round(server_requests / per_mission, 2),
+            'webdriver_commands_per_mission': round(counter.webdriver / per_mission, 2),
+            'peak_rss_mb': round(peak_rss / (1024 * 1024), 1),
+        }
+    finally:
+        if sampler.running:
+            sampler.stop()
+        if bot:
+            bot.close_browser()
+        os.chdir(old_cwd)
+        server.stop()
+
+
+def compare(current, baseline, threshold=10.0):
+    """Vergleicht zwei Ergebnis-Dateien und markiert Verschlechterungen über threshold Prozent"""
+    baseline_runs = {run['missions']: run for run in baseline.get('runs', [])}
+    regressions = 0
+
+    for run in current.get('runs', []):
+        old = baseline_runs.get(run['missions'])
+        if not old:
+            continue
+        print(f"\n{run['missions']} Einsätze:")
+        for metric, higher_is_better in METRICS.items():
+            new_value, old_value = run.get(metric, 0), old.get(metric, 0)
+            if not old_value:
+                continue
+            change = (new_value - old_value) / old_value * 100
+            worse = change < -threshold if higher_is_better else change > threshold
+            marker = '  ✗ REGRESSION' if worse else ''
+            regressions += 1 if worse else 0
+            print(f"  {metric:32s} {old_value:>10} -> {new_value:>10} ({change:+.1f}%){marker}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Zyklus-Benchmark gegen den Fake-Server')
+    parser.add_argument('--scenarios', type=int, nargs='+', default=DEFAULT_SCENARIOS,
+                        help='Anzahl offener Einsätze je Szenario')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Künstliche Server-Latenz')
+    parser.add_argument('--lean', action='store_true', help='Lean-Browser-Modus verwenden')
+    parser.add_argument('--visible', action='store_true', help='Browser sichtbar starten')
+    parser.add_argument('--output', help='Ergebnis-Datei (Standard: benchmarks/results/cycle_<Zeit>.json)')
+    parser.add_argument('--compare', metavar='BASELINE', help='Mit früherem Ergebnis vergleichen')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Regressionsschwelle in Prozent')
+    args = parser.parse_args()
+
+    runs = []
+    for missions in args.scenarios:
+        print(f"▶ Szenario: {missions} Einsätze ...")
+        result = run_scenario(missions, args.latency_ms, not args.visible, args.lean)
+        runs.append(result)
+        print(f"  {result['missions_per_minute']} Einsätze/min, p50 {result['dispatch_p50_ms']} ms, "
+              f"p95 {result['dispatch_p95_ms']} ms, {result['http_requests_per_mission']} HTTP/Einsatz, "
+              f"{result['webdriver_commands_per_mission']} WebDriver/Einsatz, {result['peak_rss_mb']} MB RSS")
+
+    results = {
+        'benchmark': 'cycle',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': runs,
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"cycle_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nErgebnis gespeichert: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {regressions} Kennzahlen schlechter als {args.threshold:.0f}%")
+            sys.exit(1)
+        print("\n✓ Keine Regressionen")
+
+
+if __name__ == '__main__':
+    main()
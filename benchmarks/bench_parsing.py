@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmarks für die Parsing-Hotpaths
+Misst Operationen pro Sekunde (timeit) und Speicher pro Aufruf (tracemalloc) für:
+parse_missing_text, extract_mission_list (mList aus get_missions),
+get_mission_requirements_from_cache, analyze_mission_requirements und
+parse_help_requirements (Textsuche aus get_mission_requirements_from_help).
+
+Eingaben werden generiert (Fake-Server-Daten) bzw. aus aufgezeichneten Dateien
+gelesen (debug_sprechwunsch.html, cache/debug/*last_missions_response*.gz, cache/mission_cache.json).
+
+    python benchmarks/bench_parsing.py
+    python benchmarks/bench_parsing.py --filter extract_mission_list --json benchmarks/results/parsing.json
+    python benchmarks/bench_parsing.py --compare benchmarks/results/parsing_alt.json
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime
+from string import Template
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from bs4 import BeautifulSoup
+
+from fake_server import GameState, MISSION_TYPES, load_fixture
+
+MISSING_TEXTS = [
+    'Fehlende Fahrzeuge: 1 Löschfahrzeug',
+    'Fehlende Fahrzeuge: 2 Löschfahrzeuge, 1 Drehleiter',
+    'Fehlende Fahrzeuge: 1 Löschfahrzeug, 1 Rettungswagen',
+    'Fehlende Fahrzeuge: 3 Rettungswagen, 1 Notarzteinsatzfahrzeug, 1 Rettungshubschrauber',
+    'Fehlende Fahrzeuge: 4 Löschfahrzeuge, 2 Drehleitern, 1 Rüstwagen, 1 GW-A, 1 GW-L',
+    'Fehlende Fahrzeuge: 2 Funkstreifenwagen',
+    'Fehlende Fahrzeuge: 2 Löschfahrzeuge, 1 Einsatzleitwagen, 1 ITW',
+    'Fehlende Fahrzeuge: 1 Einsatzleitwagen 2, 2 Rettungswagen, 1 KdoW-LNA, 1 GW-Öl',
+]
+
+
+def read_recorded(path):
+    """Liest eine aufgezeichnete Datei (auch .gz aus cache/debug/), falls vorhanden"""
+    try:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def latest_capture(recorded_dir, name):
+    """Pfad der neuesten Debug-Datei mit name in cache/debug/ (oder der alte Pfad in cache/)"""
+    captures = sorted(glob.glob(os.path.join(recorded_dir, 'cache', 'debug', f'*_{name}_*.gz')))
+    return captures[-1] if captures else os.path.join(recorded_dir, 'cache', f'{name}.txt')
+
+
+def build_mission_cache(size):
+    """Mission-Cache im Format von update_mission_cache() mit size Einträgen"""
+    cache = {}
+    for i in range(size):
+        mission_type = MISSION_TYPES[i % len(MISSION_TYPES)]
+        cache[str(i)] = {
+            'name': f"{mission_type['name']} {i}",
+            'requirements': mission_type['requirements'],
+            'chances': mission_type['chances'],
+            'average_credits': mission_type['average_credits'],
+        }
+    return cache
+
+
+def build_cases(bot, bot_module, recorded_dir):
+    """Erstellt alle Benchmark-Fälle: Name -> (Funktion, Beschreibung der Eingabe)"""
+    cases = {}
+
+    # parse_missing_text
+    cases['parse_missing_text/generated'] = (
+        lambda: [bot.parse_missing_text(text) for text in MISSING_TEXTS],
+        f'{len(MISSING_TEXTS)} Fehlend-Texte')
+
+    # mList-Extraktion
+    for count in (10, 100, 1000):
+        js = GameState(missions=count).mission_markers()
+        cases[f'extract_mission_list/{count}'] = (
+            lambda js=js: bot_module.extract_mission_list(js),
+            f'{count} Einsätze, {len(js) // 1024} KB')
+    recorded_js = read_recorded(latest_capture(recorded_dir, 'last_missions_response'))
+    if recorded_js and 'const mList' in recorded_js:
+        cases['extract_mission_list/recorded'] = (
+            lambda: bot_module.extract_mission_list(recorded_js),
+            f'aufgezeichnet, {len(recorded_js) // 1024} KB')
+
+    # Anforderungen aus dem Mission-Cache
+    generated_cache = build_mission_cache(500)
+    type_ids = list(generated_cache.keys())
+
+    def from_cache(cache=generated_cache, ids=type_ids):
+        bot.mission_cache = cache
+        return [bot.get_mission_requirements_from_cache(type_id) for type_id in ids[:50]]
+
+    cases['requirements_from_cache/generated'] = (from_cache, '50 Abfragen, 500 Einsatztypen')
+
+    recorded_cache = read_recorded(os.path.join(recorded_dir, 'cache', 'mission_cache.json'))
+    if recorded_cache:
+        missions = json.loads(recorded_cache).get('missions', {})
+        if missions:
+            recorded_ids = list(missions.keys())
+            cases['requirements_from_cache/recorded'] = (
+                lambda: from_cache(missions, recorded_ids),
+                f'50 Abfragen, {len(missions)} Einsatztypen (aufgezeichnet)')
+
+    # analyze_mission_requirements
+    state = GameState(missions=10)
+    mission_page = Template(load_fixture('mission_page.html')).safe_substitute(
+        mission_id=900001, mission_type_id=1, caption='Wohnungsbrand', address='Teststraße 1',
+        alert='<div class="alert alert-danger">Fehlende Fahrzeuge: 2 Löschfahrzeuge</div>',
+        vehicle_rows=state.vehicle_rows())
+    generated_soup = BeautifulSoup(mission_page, 'html.parser')
+    cases['analyze_mission_requirements/generated'] = (
+        lambda: bot.analyze_mission_requirements(generated_soup, 900001),
+        f'Einsatzseite, {len(mission_page) // 1024} KB')
+
+    recorded_page = read_recorded(os.path.join(recorded_dir, 'debug_sprechwunsch.html'))
+    if recorded_page:
+        recorded_soup = BeautifulSoup(recorded_page, 'html.parser')
+        cases['analyze_mission_requirements/recorded'] = (
+            lambda: bot.analyze_mission_requirements(recorded_soup, 0),
+            f'debug_sprechwunsch.html, {len(recorded_page) // 1024} KB')
+
+    # Textsuche der Einsatz-Hilfe
+    help_texts = []
+    for mission_type in MISSION_TYPES:
+        rows = '\n'.join(f'        <tr><td>{line}</td></tr>' for line in mission_type['help'])
+        page = Template(load_fixture('mission_help.html')).safe_substitute(
+            name=mission_type['name'], requirement_rows=rows, average_credits=mission_type['average_credits'])
+        help_texts.append(BeautifulSoup(page, 'html.parser').get_text())
+    cases['parse_help_requirements/generated'] = (
+        lambda: [bot_module.parse_help_requirements(text) for text in help_texts],
+        f'{len(help_texts)} Hilfe-Seiten')
+
+    if recorded_page:
+        recorded_text = BeautifulSoup(recorded_page, 'html.parser').get_text()
+        cases['parse_help_requirements/recorded'] = (
+            lambda: bot_module.parse_help_requirements(recorded_text),
+            f'Text von debug_sprechwunsch.html, {len(recorded_text) // 1024} KB')
+
+    return cases
+
+
+def measure(func, min_time=0.5):
+    """Liefert (Aufrufe/s, Spitzen-KB pro Aufruf, Allokationen pro Aufruf)"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=3, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base_current, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+    return 1.0 / best, (peak - base_current) / 1024, allocations
+
+
+def compare(current, baseline, threshold=10.0):
+    """Vergleicht Aufrufe/s mit einem früheren Ergebnis"""
+    old_runs = {run['case']: run for run in baseline.get('runs', [])}
+    regressions = 0
+    for run in current['runs']:
+        old = old_runs.get(run['case'])
+        if not old or not old.get('ops_per_sec'):
+            continue
+        change = (run['ops_per_sec'] - old['ops_per_sec']) / old['ops_per_sec'] * 100
+        worse = change < -threshold
+        regressions += 1 if worse else 0
+        print(f"  {run['case']:45s} {old['ops_per_sec']:>12,.0f} -> {run['ops_per_sec']:>12,.0f} ops/s "
+              f"({change:+.1f}%){'  ✗ REGRESSION' if worse else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmarks für die Parsing-Hotpaths')
+    parser.add_argument('--filter', help='Nur Fälle, deren Name diesen Text enthält')
+    parser.add_argument('--recorded-dir', default=REPO_DIR, help='Ordner mit aufgezeichneten Dateien')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Mindestmesszeit pro Fall in Sekunden')
+    parser.add_argument('--json', dest='output', help='Ergebnis als JSON speichern')
+    parser.add_argument('--compare', metavar='BASELINE', help='Mit früherem Ergebnis vergleichen')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Regressionsschwelle in Prozent')
+    args = parser.parse_args()
+
+    recorded_dir = os.path.abspath(args.recorded_dir)
+    old_cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix='lss_parse_bench_'))  # Bot legt cache/ im Arbeitsordner an
+    try:
+        import bot_standalone
+        bot = bot_standalone.LeitstellenspielBot(config={'logging': {'level': 'CRITICAL', 'file': 'bench.log'}})
+        logging.getLogger('bot_standalone').setLevel(logging.CRITICAL)
+
+        cases = build_cases(bot, bot_standalone, recorded_dir)
+        runs = []
+        print(f"{'Fall':45s} {'ops/s':>12s} {'µs/op':>10s} {'Peak KB':>9s} {'Allok.':>8s}  Eingabe")
+        for name, (func, description) in cases.items():
+            if args.filter and args.filter not in name:
+                continue
+            ops, peak_kb, allocations = measure(func, args.min_time)
+            runs.append({'case': name, 'input': description, 'ops_per_sec': round(ops, 1),
+                         'peak_kb': round(peak_kb, 1), 'allocations': allocations})
+            print(f"{name:45s} {ops:>12,.0f} {1e6 / ops:>10.1f} {peak_kb:>9.1f} {allocations:>8d}  {description}")
+    finally:
+        os.chdir(old_cwd)
+
+    results = {
+        'benchmark': 'parsing',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'runs': runs,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nErgebnis gespeichert: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokaler Ersatz-Server für Leitstellenspiel.de
+Liefert Einsatzliste, API-Endpunkte, Einsatzseiten und die Alarmierung aus
+Fixtures bzw. generierten Daten, damit komplette Bot-Zyklen offline gemessen
+und regressionsgetestet werden können.
+
+Start:  python benchmarks/fake_server.py --missions 100 --latency-ms 50
+Bot:    "game": {"base_url": "http://127.0.0.1:8765"} in config.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+# Fahrzeugarten: (vehicle_type, Checkbox-Attribute wie im Spiel, Bezeichnung)
+VEHICLE_KINDS = [
+    (0, {'lf_only': '1', 'fire': '1'}, 'LF 20'),
+    (3, {'elw': '1', 'elw_or_battalion_chief_vehicle': '1'}, 'ELW 1'),
+    (2, {'dlk': '1'}, 'DLK 23'),
+    (23, {'rtw': '1', 'ambulance': '1'}, 'RTW'),
+    (24, {'nef': '1'}, 'NEF'),
+    (27, {'fustw': '1', 'fustw_or_police_motorcycle': '1'}, 'FuStW'),
+]
+
+# Einsatztypen im Format von /einsaetze.json (plus Fehlend-Text wie in mission_markers)
+MISSION_TYPES = [
+    {'id': 0, 'name': 'Brennender PKW', 'requirements': {'firetrucks': 1}, 'chances': {},
+     'average_credits': 250, 'missing': 'Fehlende Fahrzeuge: 1 Löschfahrzeug',
+     'help': ['1 Löschfahrzeuge (LF)']},
+    {'id': 1, 'name': 'Wohnungsbrand', 'requirements': {'firetrucks': 2, 'battalion_chief_vehicles': 1}, 'chances': {},
+     'average_credits': 1200, 'missing': 'Fehlende Fahrzeuge: 2 Löschfahrzeuge, 1 Einsatzleitwagen',
+     'help': ['2 Löschfahrzeuge (LF)', '1 Einsatzleitwagen (ELW 1)']},
+    {'id': 2, 'name': 'Verkehrsunfall', 'requirements': {'firetrucks': 1, 'ambulances': 1}, 'chances': {},
+     'average_credits': 600, 'missing': 'Fehlende Fahrzeuge: 1 Löschfahrzeug, 1 Rettungswagen',
+     'help': ['1 Löschfahrzeuge (LF)', '1 Rettungswagen']},
+    {'id': 3, 'name': 'Herzinfarkt', 'requirements': {'ambulances': 1}, 'chances': {'nef': 70},
+     'average_credits': 400, 'missing': 'Fehlende Fahrzeuge: 1 Rettungswagen, 1 Notarzteinsatzfahrzeug',
+     'help': ['1 Rettungswagen', '1 Notarzteinsatzfahrzeug']},
+    {'id': 4, 'name': 'Ladendiebstahl', 'requirements': {'police_cars': 1}, 'chances': {},
+     'average_credits': 300, 'missing': 'Fehlende Fahrzeuge: 1 Funkstreifenwagen',
+     'help': ['1 Funkstreifenwagen']},
+]
+
+VEHICLES_PER_KIND_ON_PAGE = 10  # So viele freie Fahrzeuge je Art zeigt eine Einsatzseite
+
+SIGN_IN_PAGE = """<!DOCTYPE html>
+<html lang="de_DE"><head><meta charset="utf-8"><title>Anmelden</title></head>
+<body>
+<form action="/users/sign_in" method="post" id="new_user">
+    <input type="email" name="user[email]" id="user_email">
+    <input type="password" name="user[password]" id="user_password">
+    <input type="submit" name="commit" value="Einloggen">
+</form>
+</body></html>
+"""
+
+FALLBACK_MAIN_PAGE = """<!DOCTYPE html>
+<html lang="de_DE"><head><meta charset="utf-8"><title>Leitstellenspiel</title></head>
+<body><ul id="radio_messages_important"></ul><ul id="radio_messages"></ul></body></html>
+"""
+
+
+def load_fixture(name, base_dir=FIXTURES_DIR):
+    """Lädt eine Fixture-Datei als Text"""
+    with open(os.path.join(base_dir, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class GameState:
+    def __init__(self, missions=10, seed=42, vehicles_per_mission=3):
+        """Erzeugt einen reproduzierbaren Spielstand"""
+        self.lock = threading.Lock()
+        self.reset(missions, seed, vehicles_per_mission)
+
+    def reset(self, missions=10, seed=42, vehicles_per_mission=3):
+        """Setzt Einsätze, Fahrzeuge und Gebäude neu auf"""
+        rng = random.Random(seed)
+        with self.lock:
+            self.credits = 1_000_000
+            self.alarms = 0
+            self.buildings = []
+            self.vehicles = {}
+            self.missions = {}
+
+            building_count = max(2, missions // 10 + 2)
+            for i in range(building_count):
+                self.buildings.append({
+                    'id': 1000 + i,
+                    'caption': f'Wache {i + 1}',
+                    'building_type': 0 if i % 2 == 0 else 2,
+                    'latitude': 51.0 + rng.uniform(-0.5, 0.5),
+                    'longitude': 10.0 + rng.uniform(-0.5, 0.5),
+                    'level': rng.randint(0, 3),
+                    'is_building': False,
+                })
+
+            vehicle_count = max(20, missions * vehicles_per_mission)
+            for i in range(vehicle_count):
+                type_id, attrs, caption = VEHICLE_KINDS[i % len(VEHICLE_KINDS)]
+                building = self.buildings[i % building_count]
+                vehicle_id = 50000 + i
+                self.vehicles[vehicle_id] = {
+                    'id': vehicle_id,
+                    'caption': f'{caption} ({i + 1})',
+                    'vehicle_type': type_id,
+                    'building_id': building['id'],
+                    'fms_real': 2,
+                    'fms_show': 2,
+                    'attrs': attrs,
+                }
+
+            for i in range(missions):
+                mission_type = MISSION_TYPES[i % len(MISSION_TYPES)]
+                mission_id = 900000 + i
+                self.missions[mission_id] = {
+                    'id': mission_id,
+                    'mtid': mission_type['id'],
+                    'caption': mission_type['name'],
+                    'address': f'Teststraße {i + 1}, 12345 Teststadt',
+                    'latitude': 51.0 + rng.uniform(-0.5, 0.5),
+                    'longitude': 10.0 + rng.uniform(-0.5, 0.5),
+                    'icon': 'fire_rot' if i % 3 else 'fire_gelb',
+                    'vehicle_state': 0,
+                    'missing_text': mission_type['missing'],
+                    'patients_count': 0,
+                    'possible_patients_count': 0,
+                    'created_at': int(time.time()) - rng.randint(0, 3600),
+                }
+
+    def mission_markers(self):
+        """Einsatzliste im Format von mission_markers_own.js.erb (mit Trailing Commas wie im Original)"""
+        with self.lock:
+            entries = []
+            for mission in self.missions.values():
+                entries.append(json.dumps({
+                    'id': mission['id'],
+                    'caption': mission['caption'],
+                    'address': mission['address'],
+                    'mtid': mission['mtid'],
+                    'latitude': mission['latitude'],
+                    'longitude': mission['longitude'],
+                    'icon': mission['icon'],
+                    'vehicle_state': mission['vehicle_state'],
+                    'missing_text': mission['missing_text'],
+                    'patients_count': mission['patients_count'],
+                    'possible_patients_count': mission['possible_patients_count'],
+                    'created_at': mission['created_at'],
+                    'filter_id': 'fire',
+                }, ensure_ascii=False))
+        body = ',\n'.join(entries)
+        return f"const mList = [\n{body},\n];\nmissionMarkerBulkAdd(mList);\n"
+
+    def vehicle_rows(self):
+        """HTML-Zeilen der freien Fahrzeuge (begrenzt pro Fahrzeugart, wie beim Nachladen im Spiel)"""
+        rows = []
+        shown = {}
+        with self.lock:
+            for vehicle in self.vehicles.values():
+                if vehicle['fms_real'] != 2:
+                    continue
+                type_id = vehicle['vehicle_type']
+                if shown.get(type_id, 0) >= VEHICLES_PER_KIND_ON_PAGE:
+                    continue
+                shown[type_id] = shown.get(type_id, 0) + 1
+                attrs = ' '.join(f'{k}="{v}"' for k, v in vehicle['attrs'].items())
+                rows.append(
+                    f'                <tr class="vehicle_select_table_tr" id="vehicle_element_content_{vehicle["id"]}">'
+                    f'<td><input type="checkbox" class="vehicle_checkbox" name="vehicle_ids[]" value="{vehicle["id"]}" '
+                    f'id="vehicle_checkbox_{vehicle["id"]}" vehicle_state="2" vehicle_type_id="{type_id}" '
+                    f'building_id="{vehicle["building_id"]}" {attrs}></td>'
+                    f'<td><label for="vehicle_checkbox_{vehicle["id"]}">{vehicle["caption"]}</label></td>'
+                    f'<td>Wache</td><td>{random.randint(1, 30)} km</td></tr>'
+                )
+        return '\n'.join(rows)
+
+    def alarm(self, mission_id, vehicle_ids):
+        """Alarmiert Fahrzeuge - der Einsatz gilt danach als versorgt"""
+        with self.lock:
+            mission = self.missions.get(mission_id)
+            if not mission:
+                return False
+            for vehicle_id in vehicle_ids:
+                vehicle = self.vehicles.get(vehicle_id)
+                if vehicle and vehicle['fms_real'] == 2:
+                    vehicle['fms_real'] = 3
+                    vehicle['fms_show'] = 3
+            if vehicle_ids:
+                mission['missing_text'] = None
+                mission['vehicle_state'] = 1
+                mission['icon'] = mission['icon'].replace('_rot', '_gelb')
+                self.alarms += 1
+            return True
+
+    def api_vehicles(self):
+        with self.lock:
+            return [{k: v for k, v in vehicle.items() if k != 'attrs'} for vehicle in self.vehicles.values()]
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'FakeLeitstellenspiel/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # --- Hilfsfunktionen -------------------------------------------------
+
+    def count(self, route):
+        with self.server.stats_lock:
+            self.server.stats[route] = self.server.stats.get(route, 0) + 1
+
+    def delay(self):
+        latency = self.server.latency_ms
+        if latency:
+            jitter = self.server.jitter_ms
+            time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)) / 1000.0)
+
+    def is_authenticated(self):
+        if not self.server.require_login:
+            return True
+        cookies = self.headers.get('Cookie', '')
+        match = re.search(r'_session_id=([^;]+)', cookies)
+        return bool(match and match.group(1) in self.server.sessions)
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def send_json(self, payload, status=200):
+        self.send_body(status, json.dumps(payload, ensure_ascii=False), 'application/json; charset=utf-8')
+
+    def redirect(self, location, headers=None):
+        headers = dict(headers or {})
+        headers['Location'] = location
+        self.send_body(302, '', headers=headers)
+
+    def read_form(self):
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        raw = self.rfile.read(length).decode('utf-8') if length else ''
+        return parse_qs(raw)
+
+    # --- Routen ----------------------------------------------------------
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path
+        query = parse_qs(url.query)
+        state = self.server.state
+        self.delay()
+
+        if path == '/__stats':
+            with self.server.stats_lock:
+                stats = dict(self.server.stats)
+            return self.send_json({'requests': stats, 'alarms': state.alarms, 'open_missions': len(state.missions)})
+
+        if path == '/robots.txt':
+            self.count('robots')
+            return self.send_body(200, 'User-agent: *\n', 'text/plain; charset=utf-8')
+
+        if path == '/users/sign_in':
+            self.count('sign_in')
+            return self.send_body(200, SIGN_IN_PAGE)
+
+        if path == '/einsaetze.json':
+            self.count('einsaetze')
+            return self.send_json([{k: v for k, v in t.items() if k not in ('missing', 'help')} for t in MISSION_TYPES])
+
+        match = re.match(r'^/einsaetze/(\d+)$', path)
+        if match:
+            self.count('mission_help')
+            mission_type = next((t for t in MISSION_TYPES if t['id'] == int(match.group(1))), None)
+            if not mission_type:
+                return self.send_body(404, 'Not found')
+            rows = '\n'.join(f'        <tr><td>{line}</td></tr>' for line in mission_type['help'])
+            page = Template(self.server.help_template).safe_substitute(
+                name=mission_type['name'], requirement_rows=rows, average_credits=mission_type['average_credits'])
+            return self.send_body(200, page)
+
+        # Ab hier nur mit Login
+        if not self.is_authenticated():
+            self.count('unauthorized')
+            return self.redirect('/users/sign_in')
+
+        if path == '/':
+            self.count('main')
+            return self.send_body(200, self.server.main_page)
+
+        if path == '/map/mission_markers_own.js.erb':
+            self.count('mission_markers')
+            return self.send_body(200, state.mission_markers(), 'text/javascript; charset=utf-8')
+
+        if path == '/map/mission_markers_alliance.js.erb':
+            self.count('mission_markers_alliance')
+            return self.send_body(200, 'const mList = [];\n', 'text/javascript; charset=utf-8')
+
+        if path == '/api/credits':
+            self.count('api_credits')
+            return self.send_json({'user_credits': state.credits, 'user_credits_current': state.credits})
+
+        if path in ('/api/vehicles', '/api/v2/vehicles'):
+            self.count('api_vehicles')
+            return self.send_json(state.api_vehicles())
+
+        if path == '/api/buildings':
+            self.count('api_buildings')
+            return self.send_json(state.buildings)
+
+        match = re.match(r'^/missions/(\d+)$', path)
+        if match:
+            self.count('mission_page')
+            mission = state.missions.get(int(match.group(1)))
+            if not mission:
+                return self.send_body(404, 'Einsatz nicht gefunden')
+            alert = ''
+            if query.get('alarm') == ['ok']:
+                alert = '<div class="alert alert-success">Fahrzeuge wurden alarmiert.</div>'
+            page = Template(self.server.mission_template).safe_substitute(
+                mission_id=mission['id'], mission_type_id=mission['mtid'], caption=mission['caption'],
+                address=mission['address'], alert=alert, vehicle_rows=state.vehicle_rows())
+            return self.send_body(200, page)
+
+        self.count('not_found')
+        self.send_body(404, 'Not found')
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        state = self.server.state
+        self.delay()
+
+        if path == '/__reset':
+            query = parse_qs(urlparse(self.path).query)
+            missions = int(query.get('missions', [len(state.missions)])[0])
+            seed = int(query.get('seed', [42])[0])
+            state.reset(missions, seed)
+            with self.server.stats_lock:
+                self.server.stats = {}
+            return self.send_json({'missions': missions})
+
+        if path == '/users/sign_in':
+            self.count('sign_in_post')
+            form = self.read_form()
+            if not form.get('user[email]') or not form.get('user[password]'):
+                return self.send_body(200, SIGN_IN_PAGE)
+            token = secrets.token_hex(16)
+            self.server.sessions.add(token)
+            return self.redirect('/', {'Set-Cookie': f'_session_id={token}; Path=/; HttpOnly'})
+
+        if not self.is_authenticated():
+            self.count('unauthorized')
+            return self.redirect('/users/sign_in')
+
+        match = re.match(r'^/missions/(\d+)/alarm$', path)
+        if match:
+            self.count('alarm')
+            mission_id = int(match.group(1))
+            form = self.read_form()
+            vehicle_ids = [int(v) for v in form.get('vehicle_ids[]', []) if v.isdigit()]
+            if not state.alarm(mission_id, vehicle_ids):
+                return self.send_body(404, 'Einsatz nicht gefunden')
+            return self.redirect(f'/missions/{mission_id}?alarm=ok')
+
+        match = re.match(r'^/vehicles/(\d+)/set_fms/(\d+)$', path)
+        if match:
+            self.count('set_fms')
+            vehicle = state.vehicles.get(int(match.group(1)))
+            if vehicle:
+                vehicle['fms_real'] = int(match.group(2))
+            return self.send_body(200, 'ok', 'text/plain; charset=utf-8')
+
+        self.count('not_found')
+        self.send_body(404, 'Not found')
+
+
+class FakeLeitstellenspielServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=8765, missions=10, latency_ms=0, jitter_ms=0,
+                 seed=42, require_login=True, verbose=False):
+        """Erstellt den Server (port=0 wählt einen freien Port)"""
+        super().__init__((host, port), FakeRequestHandler)
+        self.state = GameState(missions, seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.require_login = require_login
+        self.verbose = verbose
+        self.sessions = set()
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+        self.thread = None
+
+        self.mission_template = load_fixture('mission_page.html')
+        self.help_template = load_fixture('mission_help.html')
+        # Aufgezeichnete Hauptseite (Funk-Panel ohne Sprechwünsche), sonst Minimalversion
+        try:
+            self.main_page = load_fixture('debug_sprechwunsch.html', REPO_DIR)
+        except OSError:
+            self.main_page = FALLBACK_MAIN_PAGE
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def create_session(self):
+        """Legt eine gültige Session an (für Benchmarks ohne Browser-Login)"""
+        token = secrets.token_hex(16)
+        self.sessions.add(token)
+        return token
+
+    def request_stats(self):
+        """Liefert die Anzahl Anfragen pro Route"""
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def start(self):
+        """Startet den Server in einem Hintergrund-Thread"""
+        self.thread = threading.Thread(target=self.serve_forever, name='fake-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Beendet den Server"""
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lokaler Ersatz-Server für Leitstellenspiel.de')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--missions', type=int, default=10, help='Anzahl offener Einsätze')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Künstliche Antwortzeit pro Anfrage')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Zufällige Abweichung der Antwortzeit')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-login', action='store_true', help='Keine Anmeldung erforderlich')
+    parser.add_argument('--verbose', action='store_true', help='Jede Anfrage protokollieren')
+    args = parser.parse_args()
+
+    server = FakeLeitstellenspielServer(args.host, args.port, args.missions, args.latency_ms, args.jitter_ms,
+                                        args.seed, not args.no_login, args.verbose)
+    print(f"Fake-Server läuft auf {server.base_url} ({args.missions} Einsätze, {args.latency_ms:.0f} ms Latenz)")
+    print('Strg+C zum Beenden')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
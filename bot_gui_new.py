@@ -16,6 +16,9 @@ import os
 import warnings
 import traceback
 import re
+from log_view import LogView, guess_level
+from gui_charts import Sparkline
+from event_bus import MISSION_DISPATCHED, MISSION_FAILED, RADIO_HANDLED, CREDITS_UPDATED
 
 # Unterdrücke PyInstaller Temp-Ordner Warnung
 warnings.filterwarnings("ignore", message=".*Failed to remove temporary directory.*")
@@ -80,7 +83,8 @@ class BotGUI:
             'missions_success': 0,
             'missions_failed': 0,
             'total_processing_time': 0,  # in Sekunden
-            'missions_per_hour': []  # Liste mit Timestamps
+            'missions_per_hour': [],  # Liste mit Timestamps
+            'radio_messages': 0
         }
 
         # Log-Queue
@@ -94,6 +98,8 @@ class BotGUI:
         self.setup_ui()
         self.update_log_display()
         self.update_stats_display()
+        self.update_charts()
+        self.process_events()
 
     def check_license(self):
         """Prüft Lizenz beim Start"""
@@ -292,11 +298,15 @@ class BotGUI:
 
         # Tabs erstellen
         self.tabview.add("Dashboard")
+        self.tabview.add("Leistung")
         self.tabview.add("Einstellungen")
 
         # Dashboard Tab
         self.setup_dashboard_tab()
 
+        # Leistungs-Tab (Live-Diagramme)
+        self.setup_performance_tab()
+
         # Einstellungen Tab
         self.setup_settings_tab()
 
@@ -336,6 +346,17 @@ class BotGUI:
         )
         self.start_button.pack(fill="x", padx=20, pady=10)
 
+        # Profiling der nächsten Durchläufe
+        self.profile_button = ctk.CTkButton(
+            control_frame,
+            text="Profil aufzeichnen (3 Zyklen)",
+            command=self.request_profile,
+            height=30,
+            fg_color="#7f8c8d",
+            hover_color="#636e72"
+        )
+        self.profile_button.pack(fill="x", padx=20, pady=(0, 10))
+
         # Status
         self.status_label = ctk.CTkLabel(
             control_frame,
@@ -378,12 +399,35 @@ class BotGUI:
         right_panel = ctk.CTkFrame(main_container)
         right_panel.pack(side="right", fill="both", expand=True)
 
+        log_header = ctk.CTkFrame(right_panel, fg_color="transparent")
+        log_header.pack(fill="x", pady=(10, 10), padx=20)
+
         log_label = ctk.CTkLabel(
-            right_panel,
+            log_header,
             text="LIVE LOGS",
             font=ctk.CTkFont(size=18, weight="bold")
         )
-        log_label.pack(pady=(10, 10), padx=20, anchor="w")
+        log_label.pack(side="left")
+
+        # Suche (markiert Treffer) und Level-Filter
+        search_button = ctk.CTkButton(log_header, text="Suchen", width=70, command=self.search_log)
+        search_button.pack(side="right")
+
+        self.log_search_entry = ctk.CTkEntry(log_header, placeholder_text="Suche...", width=160)
+        self.log_search_entry.pack(side="right", padx=(10, 5))
+        self.log_search_entry.bind("<Return>", lambda event: self.search_log())
+
+        self.log_search_label = ctk.CTkLabel(log_header, text="", width=70, text_color="#95a5a6")
+        self.log_search_label.pack(side="right")
+
+        self.log_level_menu = ctk.CTkOptionMenu(
+            log_header,
+            values=["DEBUG", "INFO", "WARNING", "ERROR"],
+            width=100,
+            command=self.filter_log
+        )
+        self.log_level_menu.set("DEBUG")
+        self.log_level_menu.pack(side="right")
 
         # Log-Textfeld
         self.log_text = ctk.CTkTextbox(
@@ -392,6 +436,62 @@ class BotGUI:
             wrap="word"
         )
         self.log_text.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        self.log_view = LogView(self.log_text, max_lines=2000)
+
+    def setup_performance_tab(self):
+        """Erstellt die Live-Diagramme (gespeist aus bot.metrics_snapshot())"""
+        performance = self.tabview.tab("Leistung")
+
+        container = ctk.CTkScrollableFrame(performance, fg_color="transparent")
+        container.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.charts = {
+            'missions_per_minute': Sparkline(container, "Einsätze pro Minute", colors=('#2ecc71',)),
+            'dispatch_latency': Sparkline(container, "Alarmierungsdauer", unit="ms",
+                                          colors=('#3498db', '#e74c3c'), labels=('p50', 'p95')),
+            'calls_per_mission': Sparkline(container, "Aufrufe pro Einsatz",
+                                           colors=('#f39c12', '#9b59b6'), labels=('HTTP', 'WebDriver')),
+            'cycle_duration': Sparkline(container, "Zyklusdauer", unit="s", colors=('#1abc9c',)),
+            'backlog': Sparkline(container, "Offene Einsätze im Zyklus", colors=('#e67e22',)),
+        }
+        for chart in self.charts.values():
+            chart.pack(fill="x", pady=5)
+
+        self.last_snapshot = None
+        self.calls_base = None
+
+    def update_charts(self):
+        """Schiebt alle 2 Sekunden neue Werte in die Diagramme"""
+        try:
+            if self.running and self.bot:
+                snapshot = self.bot.metrics_snapshot()
+                previous, self.last_snapshot = self.last_snapshot, snapshot
+                if previous:
+                    elapsed = max(snapshot['time'] - previous['time'], 0.001)
+                    dispatches = snapshot['dispatches'] - previous['dispatches']
+                    self.charts['missions_per_minute'].push(dispatches / elapsed * 60)
+                    self.charts['dispatch_latency'].push(snapshot['dispatch_p50_ms'], snapshot['dispatch_p95_ms'])
+                    # Aufrufe seit der letzten Alarmierung mitzählen (auch Sprechwünsche, Einsatzliste)
+                    base = self.calls_base or previous
+                    missions = snapshot['dispatches'] - base['dispatches']
+                    if missions > 0:
+                        self.charts['calls_per_mission'].push(
+                            (snapshot['http_calls'] - base['http_calls']) / missions,
+                            (snapshot['webdriver_calls'] - base['webdriver_calls']) / missions
+                        )
+                        self.calls_base = snapshot
+                    elif self.calls_base is None:
+                        self.calls_base = previous
+                    self.charts['cycle_duration'].push(snapshot['cycle_seconds'])
+                    self.charts['backlog'].push(snapshot['backlog'])
+            else:
+                self.last_snapshot = None
+                self.calls_base = None
+        except Exception as e:
+            if self.bot:
+                self.bot.logger.debug("Diagramme nicht aktualisiert: %s", e, exc_info=True)
+
+        self.root.after(2000, self.update_charts)
 
     def setup_settings_tab(self):
         """Erstellt die Einstellungen-Seite"""
@@ -623,6 +723,14 @@ class BotGUI:
 
         self.add_log("Bot gestoppt!")
 
+    def request_profile(self):
+        """Profiliert die nächsten 3 Zyklen des laufenden Bots"""
+        if not self.running or not self.bot:
+            self.add_log("⚠ Profiling ist nur bei laufendem Bot möglich")
+            return
+        self.bot.request_profile(3)
+        self.add_log("🔬 Profiling für die nächsten 3 Zyklen aktiviert - Ergebnis in cache/profile_*.prof")
+
     def run_bot(self):
         """Führt den Bot aus"""
         self.add_log(">>> Bot-Thread gestartet")
@@ -641,6 +749,7 @@ class BotGUI:
                 },
                 "headless": settings.get('headless', True),
                 "bot": {
+                    "headless_browser": settings.get('headless', True),
                     "check_interval": settings.get('check_interval', 30),
                     "max_missions_per_cycle": settings.get('max_missions', 10),
                     "auto_dispatch": settings.get('auto_dispatch', True),
@@ -697,43 +806,24 @@ class BotGUI:
                         msg = self.format(record)
                         # Entferne ANSI-Farbcodes
                         msg = re.sub(r'\x1b\[[0-9;]*m', '', msg)
-                        self.gui_callback(msg)
+                        self.gui_callback(msg, record.levelno)
                     except:
                         pass
 
             gui_handler = GUILogHandler(self.add_log)
-            gui_handler.setLevel(logging.DEBUG)
+            # Level am Handler - der Logger bleibt auf dem konfigurierten Level (logging.level), sonst würde
+            # jeder DEBUG-Eintrag gebaut und über Queue und Datei geschrieben
+            gui_handler.setLevel(self.bot.logger.getEffectiveLevel())
             gui_handler.setFormatter(logging.Formatter('%(message)s'))
             self.bot.logger.addHandler(gui_handler)
-            self.bot.logger.setLevel(logging.DEBUG)
 
             self.add_log(">>> GUI-Logger-Handler hinzugefügt")
             self.add_log(f"Email: {settings.get('email', 'Nicht gesetzt')}")
             self.add_log(f"Headless: {'Ja' if settings.get('headless', True) else 'Nein'}")
             self.add_log(f"Intervall: {settings.get('check_interval', 30)}s")
 
-            # Initialisiere Browser
-            self.add_log("Starte Browser...")
+            # Browser wird erst bei Bedarf gestartet (Login ohne gespeicherte Session, Alarmierung)
             self.add_log(f"Headless-Modus: {settings.get('headless', True)}")
-            headless = settings.get('headless', True)
-
-            try:
-                self.add_log("Rufe init_browser() auf...")
-                result = self.bot.init_browser(headless=headless)
-                result_text = "Erfolgreich" if result else "Fehlgeschlagen"
-                self.add_log(f"init_browser() Ergebnis: {result_text}")
-                if not result:
-                    self.add_log("FEHLER: Browser konnte nicht gestartet werden!")
-                    self.add_log("Tipp: Installiere Chrome oder Firefox")
-                    self.stop_bot()
-                    return
-            except Exception as e:
-                self.add_log(f"FEHLER beim Browser-Start: {str(e)}")
-                self.add_log(f"Traceback: {traceback.format_exc()}")
-                self.stop_bot()
-                return
-
-            self.add_log("Browser gestartet!")
 
             # Login
             self.add_log("Versuche Login...")
@@ -802,108 +892,45 @@ class BotGUI:
                     self.add_log(f"⚠ Update-Check Fehler: {e}")
                     pass  # Ignoriere Update-Check-Fehler
 
+            # Start-Credits (Ausgangswert für credits_earned)
+            start_credits = self.bot.get_credits()
+            if start_credits is not None:
+                self.add_log(f"Start-Credits: {start_credits:,}")
+
             # Hauptschleife
+            self.bot.start_metrics_server()
             cycle = 0
             while self.running:
                 cycle += 1
+                self.bot.begin_cycle()
                 self.add_log(f"\n=== Zyklus #{cycle} ===")
 
                 try:
-                    # Lizenz-Check alle ~5 Minuten (bei 30s Intervall: alle 10 Zyklen)
-                    if cycle % 10 == 0:
-                        self.add_log("🔐 Prüfe Lizenz (Online)...")
-                        valid, message = self.license_manager.check_license(force_online=True)
-                        if not valid:
-                            self.add_log(f"✗ Lizenz ungültig: {message}")
-                            self.add_log("⚠ Bot wird gestoppt!")
-                            self.stop_bot()
-                            break
-                        else:
-                            self.add_log(f"✓ {message}")
-
-                    # SPRECHWUNSCH-PRÜFUNG VOR EINSÄTZEN
                     try:
-                        self.add_log(">>> Starte Sprechwunsch-Prüfung...")
-                        self.bot.handle_radio_messages()
-                        self.add_log(">>> Sprechwunsch-Prüfung abgeschlossen")
-                    except Exception as e:
-                        self.add_log(f"FEHLER beim Bearbeiten von Sprechwünschen: {e}")
-
-                    # Hole Einsätze
-                    missions = self.bot.get_missions()
-                    self.add_log(f"Gefunden: {len(missions)} offene Einsätze")
-
-                    if len(missions) == 0:
-                        self.add_log("Keine Einsaetze vorhanden")
-                    else:
-                        # Bearbeite Einsätze
-                        max_missions = self.bot.config.get('bot', {}).get('max_missions_per_cycle', 10)
-
-                        for i, mission in enumerate(missions[:max_missions], 1):
-                            if not self.running:
+                        # Lizenz-Check alle ~5 Minuten (bei 30s Intervall: alle 10 Zyklen)
+                        if cycle % 10 == 0:
+                            self.add_log("🔐 Prüfe Lizenz (Online)...")
+                            valid, message = self.license_manager.check_license(force_online=True)
+                            if not valid:
+                                self.add_log(f"✗ Lizenz ungültig: {message}")
+                                self.add_log("⚠ Bot wird gestoppt!")
+                                self.stop_bot()
                                 break
-
-                            title = mission.get('title', 'Unbekannt')
-                            mission_id = mission.get('id')
-
-                            self.add_log(f"[{i}/{min(len(missions), max_missions)}] {title} (ID: {mission_id})")
-
-                            # Prüfe ob Einsatz Fahrzeuge braucht
-                            missing_text_raw = mission.get('missing_text', '')
-                            patients_count = mission.get('patients_count', 0)
-                            possible_patients_count = mission.get('possible_patients_count', 0)
-
-                            # Parse missing_text - extrahiere 'vehicles' aus JSON/Dict
-                            if isinstance(missing_text_raw, dict):
-                                missing_text = missing_text_raw.get('vehicles', '')
-                            elif isinstance(missing_text_raw, str) and missing_text_raw.strip().startswith('{'):
-                                try:
-                                    missing_data = json.loads(missing_text_raw)
-                                    missing_text = missing_data.get('vehicles', '')
-                                except:
-                                    missing_text = missing_text_raw
                             else:
-                                missing_text = missing_text_raw
-
-                            if missing_text:
-                                self.add_log(f"  Fehlend: {missing_text}")
-
-                            # Bearbeite Einsatz
-                            try:
-                                # Hole Einsatzdetails
-                                details = self.bot.get_mission_details(mission_id)
-
-                                if details:
-                                    # Alarmiere Fahrzeuge
-                                    if self.bot.config.get('bot', {}).get('auto_dispatch', True):
-                                        self.add_log(f"  Alarmiere Fahrzeuge...")
-                                        self.bot.dispatch_vehicles(mission_id, title, missing_text_from_api=missing_text,
-                                                                 patients_count=patients_count, possible_patients_count=possible_patients_count)
-                                        self.stats['missions_processed'] += 1
-                                        time.sleep(0.5)
-
-                                    # Behandle Nachalarmierung
-                                    if details.get('has_follow_up') and self.bot.config.get('bot', {}).get('auto_follow_up', True):
-                                        self.add_log(f"  Behandle Nachalarmierung...")
-                                        self.bot.handle_follow_up(mission_id)
-                                        time.sleep(0.5)
-
-                                    self.add_log(f"  OK Einsatz bearbeitet")
-
-                                    # SPRECHWUNSCH-PRÜFUNG NACH JEDEM EINSATZ
-                                    try:
-                                        self.add_log("  🔍 Prüfe auf Sprechwünsche...")
-                                        self.bot.handle_radio_messages()
-                                    except Exception as e:
-                                        self.add_log(f"  ⚠ Fehler bei Sprechwunsch-Prüfung: {e}")
-                                else:
-                                    self.add_log(f"  ÜBERSPRINGEN: Keine Details verfügbar")
-                            
-                            except Exception as e:
-                                self.add_log(f"  FEHLER: {str(e)}")
-
-                            # Kurze Pause zwischen Einsätzen
-                            time.sleep(0.5)
+                                self.add_log(f"✓ {message}")
+
+                        # Sprechwünsche, Einsätze und Nachalarmierung - dieselbe Schleife wie im Konsolenbetrieb,
+                        # die Statistiken kommen als Ereignisse (process_events im Tk-Thread)
+                        self.bot.process_missions(keep_running=lambda: self.running)
+
+                        # Kontostand nur alle bot.credits_interval Sekunden (Credits kommen als Ereignis)
+                        self.bot.sample_credits()
+                    finally:
+                        # Roundtrips des Zyklus - auch nach einem Fehler, sonst bleibt das Profiling aktiv
+                        self.bot.end_cycle()
+
+                    # Ungenutzten Browser freigeben (wird bei Bedarf neu gestartet)
+                    self.bot.close_idle_browser()
 
                     # Warte bis zum nächsten Durchlauf
                     wait_time = self.bot.config.get('check_interval', 30)
@@ -924,28 +951,72 @@ class BotGUI:
             self.add_log(traceback.format_exc())
             self.stop_bot()
         finally:
-            if self.bot and self.bot.driver:
+            if self.bot:
+                self.bot.stop_metrics_server()
+            if self.bot:
+                # Auch den Standby-Browser beenden und Seiten-Statistik/Driver-Cache sichern
+                had_browser = self.bot.driver is not None
                 try:
-                    self.bot.driver.quit()
-                    self.add_log("Browser geschlossen")
+                    self.bot.close_browser()
+                    if had_browser:
+                        self.add_log("Browser geschlossen")
                 except:
                     pass
 
-    def add_log(self, message):
-        """Fügt eine Log-Nachricht hinzu"""
+    def process_events(self):
+        """Übernimmt die Ereignisse des Bot-Threads gesammelt in die Statistiken (läuft im Tk-Thread)"""
+        try:
+            if self.bot:
+                for event in self.bot.events.drain():
+                    self.apply_event(event)
+        except Exception:
+            pass
+
+        # Wiederhole alle 250ms
+        self.root.after(250, self.process_events)
+
+    def apply_event(self, event):
+        """Verbucht ein einzelnes Bot-Ereignis"""
+        data = event.data
+        if event.kind in (MISSION_DISPATCHED, MISSION_FAILED):
+            self.stats['missions_processed'] += 1
+            self.stats['total_processing_time'] += data.get('seconds', 0)
+            if event.kind == MISSION_DISPATCHED:
+                self.stats['missions_success'] += 1
+                self.stats['vehicles_dispatched'] += data.get('vehicles', 0)
+            else:
+                self.stats['missions_failed'] += 1
+        elif event.kind == RADIO_HANDLED:
+            self.stats['radio_messages'] += data.get('count', 0)
+        elif event.kind == CREDITS_UPDATED:
+            self.stats['credits_earned'] = data['earned']
+
+    def add_log(self, message, level=None):
+        """Fügt eine Log-Nachricht hinzu (level = Logging-Level, sonst aus dem Text geschätzt)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
-        self.log_queue.put(log_message)
+        if level is None:
+            level = guess_level(message)
+        for line in str(message).strip('\n').split('\n'):
+            self.log_queue.put((level, f"[{timestamp}] {line}"))
+
+    def filter_log(self, level_name):
+        """Zeigt nur Log-Zeilen ab dem gewählten Level"""
+        self.log_view.set_level(level_name)
+
+    def search_log(self):
+        """Markiert alle Treffer der Suche im Log (leere Suche = wieder automatisch scrollen)"""
+        matches = self.log_view.search(self.log_search_entry.get())
+        self.log_search_label.configure(text=f"{matches} Treffer" if self.log_search_entry.get().strip() else "")
 
     def update_log_display(self):
-        """Aktualisiert die Log-Anzeige"""
+        """Aktualisiert die Log-Anzeige - alle neuen Zeilen mit einem Insert pro Tick"""
         try:
-            while True:
-                message = self.log_queue.get_nowait()
-                self.log_text.insert("end", message)
-                self.log_text.see("end")
+            for _ in range(2000):
+                level, line = self.log_queue.get_nowait()
+                self.log_view.add(line, level)
         except queue.Empty:
             pass
+        self.log_view.flush()
 
         # Wiederhole alle 100ms
         self.root.after(100, self.update_log_display)
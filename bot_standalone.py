@@ -14,11 +14,14 @@ import json
 import sys
 import os
 import random
+import re
 
 # Bot imports
 import requests
 from bs4 import BeautifulSoup
 import logging
+import atexit
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from colorama import init, Fore, Style
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -28,6 +31,24 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from vehicle_types import VEHICLE_TYPES, CATEGORY_TO_TYPES
+from dispatch_memory import DispatchMemory
+from session_store import SessionStore
+from driver_cache import DriverCache
+from page_stats import PageLoadStats
+from instrumentation import StageTimer, StageStats, CallAccounting
+from metrics import MetricsRegistry, MetricsServer
+from profiling import CycleProfiler
+from debug_store import DebugStore
+from credit_tracker import CreditTracker
+from session_guard import SessionGuard
+from http_client import create_session
+from rate_governor import RateGovernor
+from fleet import FleetSnapshot, NUMPY_AVAILABLE
+from geo_index import GeoIndex, coordinates
+from log_view import LogView, guess_level
+from missing_text import parse_missing_text
+from event_bus import (EventBus, MISSION_STARTED, MISSION_DISPATCHED, MISSION_FAILED,
+                       RADIO_HANDLED, CREDITS_UPDATED)
 
 # Colorama initialisieren
 init(autoreset=True)
@@ -41,9 +62,114 @@ def random_delay(min_seconds=0.5, max_seconds=2.0):
     delay = random.uniform(min_seconds, max_seconds)
     time.sleep(delay)
 
+MLIST_PATTERN = re.compile(r'const mList = (\[.*?\]);', re.DOTALL)
+TRAILING_COMMA_PATTERN = re.compile(r',(\s*[}\]])')
+
+def extract_mission_list(js_text):
+    """Extrahiert die Einsatzliste (const mList = [...]) aus mission_markers_own.js.erb
+
+    Returns:
+        list: Einsätze wie von der Seite geliefert, oder None wenn mList fehlt
+    """
+    match = MLIST_PATTERN.search(js_text)
+    if not match:
+        return None
+
+    # Entferne trailing commas (JavaScript erlaubt sie, JSON nicht)
+    json_str = TRAILING_COMMA_PATTERN.sub(r'\1', match.group(1))
+    return json.loads(json_str)
+
+# Fahrzeugtypen-Mapping der Einsatz-Hilfe (was wir suchen -> was wir zurückgeben)
+HELP_VEHICLE_MAPPING = {
+    'RTW': ['Rettungswagen', 'RTW'],
+    'NEF': ['Notarzteinsatzfahrzeug', 'NEF'],
+    'KTW': ['Krankentransportwagen', 'KTW'],
+    'NAW': ['Notarztwagen', 'NAW'],
+    'RTH': ['Rettungshubschrauber', 'RTH'],
+    'ITW': ['Intensivtransportwagen', 'ITW'],
+    'LF': ['Löschfahrzeug', 'LF'],
+    'DLK': ['Drehleiter', 'DLK'],
+    'TLF': ['Tanklöschfahrzeug', 'TLF'],
+    'RW': ['Rüstwagen', 'RW'],
+    'GW': ['Gerätewagen', 'GW'],
+    'ELW': ['Einsatzleitwagen', 'ELW'],
+    'MTW': ['Mannschaftstransportwagen', 'MTW'],
+    'SW': ['Schlauchwagen', 'SW'],
+    'FuStW': ['Funkstreifenwagen', 'FuStW'],
+    'GefKw': ['Gefangenenkraftwagen', 'GefKw'],
+    'GW-A': ['GW-A', 'GW A'],
+    'GW-L': ['GW-L', 'GW L'],
+    'GW-Öl': ['GW-Öl', 'GW Öl'],
+    'GW-Mess': ['GW-Mess', 'GW Mess'],
+}
+HELP_STOP_KEYWORDS = ['Weitere', 'Einsatzvarianten', 'Wahrscheinlichkeit', 'Voraussetzung']
+
+def parse_help_requirements(text_content):
+    """Liest die Mindestanforderungen aus dem Text der Einsatz-Hilfe-Seite"""
+    requirements = {}
+    in_requirements = False
+
+    for line in text_content.split('\n'):
+        line = line.strip()
+
+        # Starte bei "Mindestanforderung"
+        if 'Mindestanforderung' in line:
+            in_requirements = True
+            continue
+
+        # Stoppe bei bestimmten Schlüsselwörtern
+        if in_requirements and any(keyword in line for keyword in HELP_STOP_KEYWORDS):
+            break
+
+        if in_requirements and line:
+            # Suche nach Muster: "Zahl x Fahrzeugtyp" oder "Zahl Fahrzeugtyp"
+            match = re.match(r'^(\d+)\s*x?\s*(.+)$', line)
+            if match:
+                count = int(match.group(1))
+                vehicle_desc = match.group(2).strip()
+
+                # Bereinige Beschreibung (entferne Klammern etc.)
+                vehicle_desc = re.sub(r'\s*\([^)]*\).*$', '', vehicle_desc)
+                vehicle_desc = vehicle_desc.split(' oder ')[0].strip()
+
+                # Finde passenden Fahrzeugtyp
+                for vtype, aliases in HELP_VEHICLE_MAPPING.items():
+                    for alias in aliases:
+                        if alias.lower() in vehicle_desc.lower():
+                            if vtype in requirements:
+                                requirements[vtype] = max(requirements[vtype], count)
+                            else:
+                                requirements[vtype] = count
+                            break
+
+    return requirements
+
+# Im Lean-Modus blockierte Ressourcen (Bilder, Schriften, Kartenkacheln, Tracking)
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*tile.openstreetmap.org*', '*tiles.*', '*/tiles/*', '*mapbox*', '*api.maptiler.com*',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*hotjar*',
+]
+
+LOG_LISTENER = None  # Hintergrund-Schreiber des Loggings (einmal pro Prozess)
+
+
+def stop_logging():
+    """Schreibt ausstehende Log-Einträge und beendet den Hintergrund-Schreiber"""
+    global LOG_LISTENER
+    listener, LOG_LISTENER = LOG_LISTENER, None
+    if listener:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+
+
 class LeitstellenspielBot:
-    def __init__(self, config_path='config.json'):
-        """Initialisiert den Bot mit der Konfiguration"""
+    def __init__(self, config_path='config.json', config=None):
+        """Initialisiert den Bot mit der Konfiguration (config = bereits geladenes Dict, z.B. vom Account-Pool)"""
         # Bestimme den richtigen Pfad (für .exe und normale Ausführung)
         if getattr(sys, 'frozen', False):
             # Läuft als .exe
@@ -61,12 +187,32 @@ class LeitstellenspielBot:
         if not os.path.isabs(config_path):
             config_path = os.path.join(base_path, config_path)
 
-        self.config = self.load_config(config_path)
-        self.session = requests.Session()
-        self.driver = None
-        self.base_url = 'https://www.leitstellenspiel.de'
+        self.config = config if config is not None else self.load_config(config_path)
+        # Gemeinsamer HTTP-Client (Pool, Timeouts pro Endpunkt, Wiederholung, gzip/brotli)
+        self.session = create_session(self.config.get('game', {}))
+        self.public_session = create_session()  # Ohne Spiel-Cookies (GitHub-Updates)
+        self.driver = None  # Browser wird erst bei Bedarf gestartet (ensure_browser)
+        self.browser_last_used = None
+        self.driver_cache = DriverCache(self.cache_dir)
+        self.standby_driver = None  # Vorgewärmter Ersatz-Browser (bot.standby_browser)
+        self.standby_starting = False
+        self.standby_closing = False  # close_browser() lief - ein noch startender Standby wird verworfen
+        self.standby_lock = threading.Lock()
+        self.lean_browser = self.config.get('bot', {}).get('lean_browser', False)
+        self.page_stats = PageLoadStats(self.cache_dir)
+        # Ladezeit nur jeder N-ten Einsatzseite messen (extra execute_script-Aufruf), 0 = aus
+        self.page_stats_every = self.config.get('bot', {}).get('page_stats_every', 10)
+        self.page_loads = 0
+        self.base_url = self.config.get('game', {}).get('base_url', 'https://www.leitstellenspiel.de').rstrip('/')
         self.setup_logging()
         self.logged_in = False
+        self.session_store = None  # Gespeicherte Login-Cookies (wird beim Login angelegt)
+        # Abgelaufene Session an jeder Antwort erkennen und einmalig (serialisiert) neu einloggen -
+        # während einer Alarmierung gehört der Browser der Alarmierung, dann erst im nächsten Durchlauf
+        self.driver_busy = False
+        self.session_guard = SessionGuard(self.login, on_expired=self.session_expired,
+                                          can_relogin=lambda: not self.driver_busy)
+        self.session_guard.attach(self.session)
         self.mission_cache = {}
         self.mission_cache_file = os.path.join(self.cache_dir, 'mission_cache.json')
         self.mission_cache_age = None
@@ -75,6 +221,64 @@ class LeitstellenspielBot:
         self.api_vehicles = []
         self.api_buildings = []
         self.api_vehicle_types = {}  # Mapping von vehicle_type ID zu Name
+
+        # Verfügbarkeit der Flotte als NumPy-Spalten (ohne NumPy: None)
+        self.fleet = FleetSnapshot() if NUMPY_AVAILABLE else None
+        self.fleet_refresh_interval = self.config.get('bot', {}).get('fleet_refresh_interval', 120)
+
+        # Gitter-Index der Wachen für die Auswahl der nächsten Fahrzeuge
+        self.geo_index = GeoIndex()
+        self.mission_positions = {}  # Einsatz-ID -> (lat, lon) aus der letzten Einsatzliste
+
+        # Gedächtnis für kürzlich alarmierte Einsätze (überspringt bereits versorgte Einsätze)
+        self.dispatch_memory = DispatchMemory(
+            ttl_seconds=self.config.get('bot', {}).get('dispatch_memory_ttl', 300)
+        )
+        self.last_selected_by_type = {}  # Was beim letzten dispatch_vehicles() geschickt wurde
+
+        # Phasen-Zeitmessung der Alarmierung (Datensätze in cache/dispatch_timings.jsonl nur auf Wunsch)
+        timings_file = None
+        logging_config = self.config.get('logging', {})
+        if logging_config.get('dispatch_timings', False):
+            timings_file = os.path.join(self.cache_dir, 'dispatch_timings.jsonl')
+        self.stage_stats = StageStats(
+            records_file=timings_file,
+            max_bytes=int(float(logging_config.get('dispatch_timings_max_mb', 5)) * 1024 * 1024),
+        )
+        self.stage_timer = None
+
+        # Zählung der WebDriver-Befehle und HTTP-Anfragen pro Bot-Methode
+        self.call_accounting = None
+        if self.config.get('logging', {}).get('call_accounting', True):
+            self.call_accounting = CallAccounting([__file__])
+            self.call_accounting.wrap_session(self.session)
+
+        # Anfrage-Budget für HTTP, Browser und Alarmierungen (limits.budgets) - ersetzt feste Pausen
+        self.rate_governor = RateGovernor(self.config.get('limits', {}).get('budgets'))
+        self.rate_governor.wrap_session(self.session)
+
+        # Metriken für den Dauerbetrieb (Endpunkt nur mit metrics.enabled)
+        self.setup_metrics()
+        self.metrics_server = None
+        self.cycle_started = None
+        self.last_cycle_seconds = None
+        self.mission_backlog = 0
+        self.last_dispatched_count = 0  # Fahrzeuge der letzten erfolgreichen Alarmierung
+
+        # Profiling der nächsten N Durchläufe (bot.profile_cycles oder GUI-Button)
+        self.profiler = CycleProfiler(self.cache_dir)
+        profile_cycles = self.config.get('bot', {}).get('profile_cycles', 0)
+        if profile_cycles:
+            self.profiler.request(profile_cycles)
+
+        # Debug-Dateien (Seitenquelltexte etc.) - standardmäßig nur bei Log-Level DEBUG
+        self.debug_store = self.create_debug_store()
+
+        # Ereignisse für das GUI (Einsätze, Sprechwünsche, Credits)
+        self.events = EventBus()
+
+        # Credits: Kontostand nur alle bot.credits_interval Sekunden, dazwischen Schätzung pro Einsatz
+        self.credit_tracker = CreditTracker(interval=self.config.get('bot', {}).get('credits_interval', 300))
         
     def load_config(self, config_path):
         """Lädt die Konfigurationsdatei"""
@@ -92,105 +296,511 @@ class LeitstellenspielBot:
             raise ValueError(error_msg)
     
     def setup_logging(self):
-        """Richtet das Logging-System ein"""
+        """Richtet das Logging-System ein (Datei und Konsole werden im Hintergrund-Thread geschrieben)"""
+        global LOG_LISTENER
+        self.logger = logging.getLogger(__name__)
+
+        # Nur einmal pro Prozess einrichten
+        root = logging.getLogger()
+        if LOG_LISTENER is not None:
+            return
+
+        # Bereits vorhandene Handler (z.B. basicConfig eines Aufrufers) schreiben sonst synchron im Bot-Thread -
+        # sie wandern hinter die Queue
+        # (die QueueHandler eines früheren, inzwischen gestoppten Listeners entfallen)
+        existing = [handler for handler in root.handlers if not isinstance(handler, QueueHandler)]
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
         # Hole Logging-Konfiguration mit Defaults
         logging_config = self.config.get('logging', {})
         log_level = getattr(logging, logging_config.get('level', 'INFO'), logging.INFO)
         log_file = os.path.join(self.cache_dir, logging_config.get('file', 'bot.log'))
-
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
+        max_bytes = int(float(logging_config.get('max_size_mb', 5)) * 1024 * 1024)
+        backup_count = int(logging_config.get('max_files', 10))
+
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                           encoding='utf-8', delay=True)
+        handlers = [file_handler]
+        # Konsole nur, wenn nicht schon ein vorhandener Handler dorthin schreibt
+        if not any(type(handler) is logging.StreamHandler for handler in existing):
+            handlers.append(logging.StreamHandler())
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        # Der Bot-Thread legt Einträge nur in die Queue, Datei-/Konsolen-I/O blockiert nie die Alarmierung
+        log_queue = queue.SimpleQueue()
+        LOG_LISTENER = QueueListener(log_queue, *existing, *handlers, respect_handler_level=True)
+        LOG_LISTENER.start()
+        atexit.register(stop_logging)
+
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(log_level)
+        if existing:
+            self.logger.warning(f"{Fore.YELLOW}⚠ {len(existing)} vorhandene Log-Handler hinter die Log-Queue verschoben")
+
+    def setup_metrics(self):
+        """Legt die Metriken an (Zähler werden immer geführt, der Endpunkt ist optional)"""
+        self.metrics = MetricsRegistry()
+        self.metric_cycles = self.metrics.counter('cycles_total', 'Abgeschlossene Durchläufe')
+        self.metric_cycle_duration = self.metrics.histogram('cycle_duration_seconds', 'Dauer eines Durchlaufs')
+        self.metric_last_cycle = self.metrics.gauge('last_cycle_timestamp_seconds', 'Zeitpunkt des letzten Durchlaufs')
+        self.metric_dispatches = self.metrics.counter('dispatches_total', 'Alarmierungen nach Ergebnis (success/failure)')
+        self.metric_dispatch_duration = self.metrics.histogram('dispatch_duration_seconds', 'Dauer einer Alarmierung')
+        self.metric_status_updates = self.metrics.counter('vehicle_status_updates_total', 'Statuswechsel nach Status und Ergebnis')
+        self.metric_radio_messages = self.metrics.counter('radio_messages_handled_total', 'Bearbeitete Sprechwünsche')
+        self.metric_cache = self.metrics.counter('cache_requests_total', 'Cache-Zugriffe nach Cache und Ergebnis (hit/miss)')
+        self.metric_browser_starts = self.metrics.counter('browser_starts_total', 'Browser-Starts')
+        self.metric_browser_recoveries = self.metrics.counter('browser_recoveries_total', 'Ersetzte abgestürzte Browser nach Quelle')
+        self.metric_vehicles = self.metrics.counter('vehicles_dispatched_total', 'Alarmierte Fahrzeuge')
+        self.metric_backlog = self.metrics.gauge('mission_backlog', 'Noch offene Einsätze im laufenden Durchlauf')
+        self.metric_credits = self.metrics.gauge('credits_balance', 'Zuletzt abgefragter Kontostand')
+        self.metric_credits_estimated = self.metrics.counter('credits_estimated_total', 'Geschätzte Credits alarmierter Einsätze (average_credits)')
+        self.metric_vehicles_available = self.metrics.gauge('vehicles_available', 'Verfügbare Fahrzeuge (FMS 1/2) nach Kategorie')
+        self.metric_budget_wait = self.metrics.counter('rate_limit_wait_seconds_total', 'Wartezeit auf das Anfrage-Budget nach Budget')
+
+    def start_metrics_server(self):
+        """Startet den lokalen Metrik-Endpunkt, falls metrics.enabled gesetzt ist"""
+        metrics_config = self.config.get('metrics', {})
+        if not metrics_config.get('enabled', False) or self.metrics_server:
+            return
+        try:
+            self.metrics_server = MetricsServer(self.metrics, metrics_config.get('host', '127.0.0.1'),
+                                                metrics_config.get('port', 9108)).start()
+            self.logger.info(f"{Fore.CYAN}📈 Metriken unter http://{self.metrics_server.host}:{self.metrics_server.port}/metrics")
+        except OSError as e:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Metrik-Endpunkt konnte nicht gestartet werden: {e}")
+            self.metrics_server = None
+
+    def stop_metrics_server(self):
+        """Beendet den Metrik-Endpunkt"""
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+
+    def create_debug_store(self):
+        """Legt die Ablage für Debug-Dateien an (debug.capture: "auto" = nur bei Log-Level DEBUG)"""
+        debug_config = self.config.get('debug', {})
+        capture = debug_config.get('capture', 'auto')
+        if capture == 'auto':
+            level = getattr(logging, self.config.get('logging', {}).get('level', 'INFO'), logging.INFO)
+            capture = level <= logging.DEBUG
+        return DebugStore(
+            os.path.join(self.cache_dir, 'debug'),
+            enabled=bool(capture),
+            max_files=debug_config.get('max_files', 50),
+            max_bytes=int(float(debug_config.get('max_size_mb', 20)) * 1024 * 1024)
         )
-        self.logger = logging.getLogger(__name__)
 
-    def init_browser(self, headless=True):
-        """Initialisiert den Selenium-Browser"""
+    def save_debug_file(self, name, content):
+        """Speichert eine Debug-Datei im Hintergrund (nur wenn die Ablage aktiv ist)"""
+        path = self.debug_store.capture(name, content)
+        if path:
+            self.logger.info(f"{Fore.CYAN}Debug-Datei gespeichert: {path}")
+        return path
+
+    def request_profile(self, cycles=3):
+        """Lässt die nächsten cycles Durchläufe unter cProfile laufen"""
+        self.profiler.request(cycles)
+        self.logger.info(f"{Fore.CYAN}🔬 Profiling für die nächsten {cycles} Durchläufe aktiviert")
+
+    def begin_cycle(self):
+        """Markiert den Beginn eines Durchlaufs (holt einen während der Alarmierung verschobenen Re-Login nach)"""
+        self.cycle_started = time.time()
+        self.profiler.begin()
+        if self.session_guard.pending:
+            self.logger.info(f"{Fore.CYAN}Session war während einer Alarmierung abgelaufen - Re-Login jetzt")
+            self.session_guard.pending = False
+            self.ensure_logged_in()
+
+    def end_cycle(self):
+        """Schließt einen Durchlauf ab: Profil, Metriken und Roundtrip-Zusammenfassung"""
         try:
-            self.logger.info(f"{Fore.CYAN}Initialisiere Browser...")
+            result = self.profiler.end()
+            if result:
+                path, summary = result
+                self.logger.info(f"{Fore.GREEN}🔬 Profil gespeichert: {path}")
+                self.logger.info(f"Top-Funktionen (kumulierte Zeit):\n{summary}")
+        except Exception as e:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Profil konnte nicht gespeichert werden: {e}")
+
+        now = time.time()
+        if self.cycle_started is not None:
+            self.last_cycle_seconds = now - self.cycle_started
+            self.metric_cycle_duration.observe(self.last_cycle_seconds)
+            self.cycle_started = None
+        self.set_backlog(0)
+        self.metric_cycles.inc()
+        self.metric_last_cycle.set(now)
+        self.log_call_summary()
+        self.log_budget_summary()
+
+    def set_backlog(self, count):
+        """Anzahl der im laufenden Durchlauf noch offenen Einsätze"""
+        self.mission_backlog = max(int(count), 0)
+        self.metric_backlog.set(self.mission_backlog)
+
+    def metrics_snapshot(self):
+        """Momentaufnahme der Kennzahlen für das GUI (Zähler seit Start, Raten bildet der Aufrufer)"""
+        calls = self.call_accounting.lifetime if self.call_accounting else {}
+        return {
+            'time': time.time(),
+            'dispatches': self.metric_dispatches.value(result='success') + self.metric_dispatches.value(result='failure'),
+            'vehicles': self.metric_vehicles.value(),
+            'http_calls': calls.get('http', 0),
+            'webdriver_calls': calls.get('webdriver', 0),
+            'dispatch_p50_ms': self.stage_stats.percentile('total', 50),
+            'dispatch_p95_ms': self.stage_stats.percentile('total', 95),
+            'cycle_seconds': self.last_cycle_seconds,
+            'backlog': self.mission_backlog,
+            'budget_wait_seconds': self.rate_governor.lifetime,
+        }
 
-            # Versuche Chrome mit automatischem ChromeDriver
+    def create_driver(self, backend, headless=True, driver_path=None):
+        """Startet einen WebDriver für 'chrome' oder 'firefox' (driver_path = gecachter Treiber)"""
+        if backend == 'chrome':
+            from selenium.webdriver.chrome.service import Service as ChromeService
+            from selenium.webdriver.chrome.options import Options
+
+            chrome_options = Options()
+            if headless:
+                chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument('--disable-gpu')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            chrome_options.add_argument('--window-size=1920,1080')
+            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+            chrome_options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            if self.lean_browser:
+                # Nicht auf Bilder/Subressourcen warten, Bilder gar nicht laden
+                chrome_options.page_load_strategy = 'eager'
+                chrome_options.add_experimental_option('prefs', {
+                    'profile.managed_default_content_settings.images': 2
+                })
+
+            if driver_path:
+                driver = webdriver.Chrome(service=ChromeService(driver_path), options=chrome_options)
+                self.logger.info(f"{Fore.GREEN}✓ Chrome-Browser gestartet (Treiber aus Cache)")
+                return driver
+
+            # Versuche mit automatischem ChromeDriver Management
             try:
-                from selenium.webdriver.chrome.service import Service
-                from selenium.webdriver.chrome.options import Options
-
-                chrome_options = Options()
-                if headless:
-                    chrome_options.add_argument('--headless=new')
-                chrome_options.add_argument('--disable-gpu')
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                chrome_options.add_argument('--window-size=1920,1080')
-                chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-                chrome_options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
-                chrome_options.add_experimental_option('useAutomationExtension', False)
-
-                # Versuche mit automatischem ChromeDriver Management
-                try:
-                    from selenium.webdriver.chrome.service import Service as ChromeService
-                    from webdriver_manager.chrome import ChromeDriverManager
+                from webdriver_manager.chrome import ChromeDriverManager
+
+                service = ChromeService(ChromeDriverManager().install())
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+                self.logger.info(f"{Fore.GREEN}✓ Chrome-Browser gestartet (mit webdriver-manager)")
+            except ImportError:
+                # Fallback: Ohne webdriver-manager
+                driver = webdriver.Chrome(options=chrome_options)
+                self.logger.info(f"{Fore.GREEN}✓ Chrome-Browser gestartet")
+            return driver
+
+        if backend == 'firefox':
+            from selenium.webdriver.firefox.service import Service as FirefoxService
+            from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+            firefox_options = FirefoxOptions()
+            if headless:
+                firefox_options.add_argument('--headless')
+            firefox_options.add_argument('--disable-gpu')
+            if self.lean_browser:
+                firefox_options.page_load_strategy = 'eager'
+                firefox_options.set_preference('permissions.default.image', 2)
+
+            if driver_path:
+                driver = webdriver.Firefox(service=FirefoxService(driver_path), options=firefox_options)
+                self.logger.info(f"{Fore.GREEN}✓ Firefox-Browser gestartet (Treiber aus Cache)")
+                return driver
+
+            # Versuche mit automatischem GeckoDriver Management
+            try:
+                from webdriver_manager.firefox import GeckoDriverManager
 
-                    service = ChromeService(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    self.logger.info(f"{Fore.GREEN}✓ Chrome-Browser gestartet (mit webdriver-manager)")
-                except ImportError:
-                    # Fallback: Ohne webdriver-manager
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                    self.logger.info(f"{Fore.GREEN}✓ Chrome-Browser gestartet")
+                service = FirefoxService(GeckoDriverManager().install())
+                driver = webdriver.Firefox(service=service, options=firefox_options)
+                self.logger.info(f"{Fore.GREEN}✓ Firefox-Browser gestartet (mit webdriver-manager)")
+            except ImportError:
+                # Fallback: Ohne webdriver-manager
+                driver = webdriver.Firefox(options=firefox_options)
+                self.logger.info(f"{Fore.GREEN}✓ Firefox-Browser gestartet")
+            return driver
 
-                return True
+        raise ValueError(f"Unbekannter Browser: {backend}")
 
-            except Exception as e:
-                self.logger.warning(f"{Fore.YELLOW}Chrome nicht verfügbar: {e}")
+    def remember_driver(self, backend, driver):
+        """Speichert Treiberpfad und Versionen des gestarteten Browsers im Driver-Cache"""
+        try:
+            capabilities = driver.capabilities or {}
+            browser_version = capabilities.get('browserVersion', '')
+            if backend == 'chrome':
+                driver_version = capabilities.get('chrome', {}).get('chromedriverVersion', '').split(' ')[0]
+            else:
+                driver_version = capabilities.get('moz:geckodriverVersion', '')
+            driver_path = getattr(getattr(driver, 'service', None), 'path', None)
 
-                # Versuche Firefox
-                try:
-                    from selenium.webdriver.firefox.service import Service as FirefoxService
-                    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+            if not self.driver_cache.record_success(backend, driver_path, browser_version, driver_version):
+                self.logger.warning(f"{Fore.YELLOW}⚠ Browser {browser_version} passt nicht zu Treiber {driver_version} - wird beim nächsten Start neu aufgelöst")
+        except Exception as e:
+            self.logger.debug(f"Konnte Driver-Cache nicht aktualisieren: {e}")
 
-                    firefox_options = FirefoxOptions()
-                    if headless:
-                        firefox_options.add_argument('--headless')
-                    firefox_options.add_argument('--disable-gpu')
+    def apply_lean_profile(self, backend, driver):
+        """Blockiert Kartenkacheln, Schriften und Tracking-Skripte (nur Chrome, per DevTools)"""
+        if backend != 'chrome':
+            self.logger.info(f"{Fore.CYAN}Lean-Modus: Bilder blockiert (URL-Filter nur mit Chrome)")
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+            self.logger.info(f"{Fore.CYAN}Lean-Modus aktiv: {len(LEAN_BLOCKED_URLS)} URL-Muster blockiert")
+        except Exception as e:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Lean-Modus: URL-Filter nicht verfügbar: {e}")
 
-                    # Versuche mit automatischem GeckoDriver Management
-                    try:
-                        from webdriver_manager.firefox import GeckoDriverManager
+    def ensure_single_tab(self):
+        """Schließt zusätzliche Tabs/Fenster, damit immer derselbe Tab wiederverwendet wird"""
+        try:
+            handles = self.driver.window_handles
+            if len(handles) > 1:
+                for handle in handles[1:]:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                self.driver.switch_to.window(handles[0])
+                self.logger.debug("%d zusätzliche Tabs geschlossen", len(handles) - 1)
+        except Exception as e:
+            self.logger.debug("Konnte Tabs nicht aufräumen: %s", e)
 
-                        service = FirefoxService(GeckoDriverManager().install())
-                        self.driver = webdriver.Firefox(service=service, options=firefox_options)
-                        self.logger.info(f"{Fore.GREEN}✓ Firefox-Browser gestartet (mit webdriver-manager)")
-                    except ImportError:
-                        # Fallback: Ohne webdriver-manager
-                        self.driver = webdriver.Firefox(options=firefox_options)
-                        self.logger.info(f"{Fore.GREEN}✓ Firefox-Browser gestartet")
+    def measure_page_load(self):
+        """Misst übertragene Bytes und Ladezeit der aktuellen Seite (Performance-API) - nur jede N-te Seite"""
+        self.page_loads += 1
+        if not self.page_stats_every or (self.page_loads - 1) % self.page_stats_every:
+            return
+        try:
+            result = self.driver.execute_script("""
+                const nav = performance.getEntriesByType('navigation')[0];
+                if (!nav) { return null; }
+                let bytes = nav.transferSize || 0;
+                for (const r of performance.getEntriesByType('resource')) { bytes += r.transferSize || 0; }
+                return {bytes: bytes, ms: nav.domContentLoadedEventEnd || nav.duration};
+            """)
+            if not result:
+                return
 
-                    return True
+            mode = 'lean' if self.lean_browser else 'normal'
+            self.page_stats.record(mode, result['bytes'], result['ms'])
 
-                except Exception as e2:
-                    self.logger.error(f"{Fore.RED}Firefox nicht verfügbar: {e2}")
-                    self.logger.error(f"{Fore.RED}Kein Browser verfügbar!")
-                    self.logger.error(f"{Fore.YELLOW}Tipp: Installiere 'pip install webdriver-manager' für automatisches Driver-Management")
-                    return False
+            savings = self.page_stats.savings() if self.lean_browser else None
+            if savings:
+                self.logger.info(f"{Fore.CYAN}📉 Einsatzseite: {result['bytes'] / 1024:.0f} KB in {result['ms']:.0f} ms "
+                                 f"(Lean spart Ø {savings[0] / 1024:.0f} KB / {savings[1]:.0f} ms pro Seite)")
+            else:
+                self.logger.debug("Einsatzseite (%s): %.0f KB in %.0f ms", mode, result['bytes'] / 1024, result['ms'])
+        except Exception as e:
+            self.logger.debug("Ladezeit-Messung fehlgeschlagen: %s", e)
+
+    def init_browser(self, headless=True):
+        """Initialisiert den Selenium-Browser (zuletzt funktionierender Browser zuerst)"""
+        driver = self.launch_driver(headless)
+        if driver is None:
+            return False
+        self.driver = driver
+        return True
+
+    def launch_driver(self, headless=True):
+        """Startet einen neuen WebDriver und gibt ihn zurück (None wenn kein Browser verfügbar)"""
+        try:
+            self.logger.info(f"{Fore.CYAN}Initialisiere Browser...")
+            names = {'chrome': 'Chrome', 'firefox': 'Firefox'}
+
+            for backend in self.driver_cache.backend_order():
+                if self.driver_cache.is_failed(backend):
+                    self.logger.info(f"{Fore.YELLOW}{names[backend]} ist zuletzt fehlgeschlagen - versuche trotzdem")
+
+                driver = None
+                error = None
+                driver_path = self.driver_cache.get_driver_path(backend)
+
+                try:
+                    driver = self.create_driver(backend, headless, driver_path)
+                except Exception as e:
+                    error = e
+                    if driver_path:
+                        # Gecachter Treiber veraltet (z.B. Browser-Update) - einmal neu auflösen
+                        self.logger.warning(f"{Fore.YELLOW}Gecachter {names[backend]}-Treiber funktioniert nicht mehr - löse neu auf")
+                        self.driver_cache.invalidate(backend)
+                        try:
+                            driver = self.create_driver(backend, headless)
+                            error = None
+                        except Exception as e2:
+                            error = e2
+
+                if driver is None:
+                    self.logger.warning(f"{Fore.YELLOW}{names[backend]} nicht verfügbar: {error}")
+                    self.driver_cache.record_failure(backend, error)
+                    continue
+
+                self.remember_driver(backend, driver)
+                self.metric_browser_starts.inc(backend=backend)
+                if self.call_accounting:
+                    self.call_accounting.wrap_driver(driver)
+                self.rate_governor.wrap_driver(driver)
+                if self.lean_browser:
+                    self.apply_lean_profile(backend, driver)
+                return driver
+
+            self.logger.error(f"{Fore.RED}Kein Browser verfügbar!")
+            self.logger.error(f"{Fore.YELLOW}Tipp: Installiere 'pip install webdriver-manager' für automatisches Driver-Management")
+            return None
 
         except Exception as e:
             self.logger.error(f"{Fore.RED}Fehler beim Initialisieren des Browsers: {e}")
             import traceback
             self.logger.error(traceback.format_exc())
-            return False
+            return None
 
     def close_browser(self):
-        """Schließt den Browser"""
+        """Schließt den Browser (und den Standby-Browser)"""
+        self.page_stats.save()
         if self.driver:
             try:
                 self.driver.quit()
                 self.logger.info(f"{Fore.CYAN}Browser geschlossen")
             except:
                 pass
+            self.driver = None
+            self.browser_last_used = None
+
+        with self.standby_lock:
+            self.standby_closing = True
+            standby, self.standby_driver = self.standby_driver, None
+        if standby:
+            try:
+                standby.quit()
+            except:
+                pass
+
+    def browser_healthy(self, driver=None):
+        """Prüft ob der WebDriver noch antwortet"""
+        driver = driver or self.driver
+        if not driver:
+            return False
+        try:
+            driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def prepare_standby(self):
+        """Startet im Hintergrund einen vorgewärmten, eingeloggten Ersatz-Browser (bot.standby_browser)"""
+        if not self.config.get('bot', {}).get('standby_browser', False) or not self.logged_in:
+            return
+        with self.standby_lock:
+            if self.standby_driver or self.standby_starting:
+                return
+            self.standby_starting = True
+            self.standby_closing = False
+
+        def worker():
+            driver = None
+            try:
+                headless = self.config.get('bot', {}).get('headless_browser', True)
+                driver = self.launch_driver(headless)
+                if driver:
+                    self.sync_cookies_to_driver(self.session_cookies(), driver)
+                    driver.get(f'{self.base_url}/')
+                    self.logger.info(f"{Fore.GREEN}✓ Standby-Browser bereit")
+            except Exception as e:
+                self.logger.warning(f"{Fore.YELLOW}⚠ Standby-Browser konnte nicht gestartet werden: {e}")
+            finally:
+                with self.standby_lock:
+                    self.standby_starting = False
+                    discard = driver is not None and self.standby_closing
+                    if driver and not discard:
+                        self.standby_driver = driver
+                if discard:
+                    # Browser wurde während des Starts geschlossen - nicht als Standby behalten
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+
+        threading.Thread(target=worker, name='standby-browser', daemon=True).start()
+
+    def refresh_standby_cookies(self):
+        """Überträgt die aktuellen Session-Cookies nach einem Login in den Standby-Browser"""
+        with self.standby_lock:
+            standby = self.standby_driver
+        if standby:
+            self.sync_cookies_to_driver(self.session_cookies(), standby)
+            self.logger.debug("Standby-Browser: Cookies aktualisiert")
+
+    def recover_browser(self):
+        """Ersetzt einen abgestürzten Browser - bevorzugt durch den Standby-Browser"""
+        start = time.time()
+        self.logger.warning(f"{Fore.YELLOW}⚠ Browser reagiert nicht mehr - ersetze ihn...")
+
+        dead_driver, self.driver = self.driver, None
+        if dead_driver:
+            try:
+                dead_driver.quit()
+            except Exception:
+                pass
+
+        with self.standby_lock:
+            standby, self.standby_driver = self.standby_driver, None
+
+        if standby and self.browser_healthy(standby):
+            self.driver = standby
+            self.browser_last_used = time.time()
+            self.logger.info(f"{Fore.GREEN}✓ Standby-Browser übernommen ({time.time() - start:.2f}s)")
+            self.metric_browser_recoveries.inc(source='standby')
+            self.prepare_standby()
+            return True
+
+        if standby:
+            try:
+                standby.quit()
+            except Exception:
+                pass
+
+        # Kein Standby verfügbar - kalt neu starten
+        if self.ensure_browser():
+            self.logger.info(f"{Fore.GREEN}✓ Browser neu gestartet ({time.time() - start:.2f}s)")
+            self.metric_browser_recoveries.inc(source='cold')
+            return True
+        return False
+
+    def ensure_browser(self):
+        """Startet den Browser erst, wenn eine Aktion ihn wirklich braucht"""
+        if self.driver:
+            if not self.browser_healthy():
+                return self.recover_browser()
+            self.browser_last_used = time.time()
+            return True
+
+        headless = self.config.get('bot', {}).get('headless_browser', True)
+        if not self.init_browser(headless=headless):
+            return False
+
+        self.browser_last_used = time.time()
+
+        # Bereits über HTTP eingeloggt - Session in den neuen Browser übernehmen
+        if self.logged_in:
+            self.sync_cookies_to_driver(self.session_cookies())
+            self.prepare_standby()
+        return True
+
+    def close_idle_browser(self):
+        """Schließt den Browser nach bot.browser_idle_timeout Sekunden ohne Nutzung (0 = nie)"""
+        idle_timeout = self.config.get('bot', {}).get('browser_idle_timeout', 300)
+        if not self.driver or not idle_timeout or self.browser_last_used is None:
+            return
+
+        idle = time.time() - self.browser_last_used
+        if idle >= idle_timeout:
+            self.logger.info(f"{Fore.CYAN}Browser seit {idle:.0f}s ungenutzt - wird geschlossen")
+            self.close_browser()
 
     def load_mission_cache(self):
         """Lädt den Mission-Cache aus der Datei"""
@@ -252,25 +862,105 @@ class LeitstellenspielBot:
             self.logger.error(f"{Fore.RED}Fehler beim Aktualisieren des Mission-Cache: {e}")
             return False
     
+    def get_account(self):
+        """Holt die Account-Daten aus der Config (unterstützt beide Formate)"""
+        account = None
+
+        # Neues Format: credentials
+        if 'credentials' in self.config:
+            account = self.config['credentials']
+            self.logger.info(f"{Fore.CYAN}Verwende credentials aus config")
+        # Altes Format: accounts
+        elif 'accounts' in self.config:
+            for acc in self.config.get('accounts', []):
+                if acc.get('enabled', True):
+                    account = acc
+                    break
+            self.logger.info(f"{Fore.CYAN}Verwende accounts aus config")
+
+        return account
+
+    def adopt_driver_cookies(self):
+        """Übernimmt die Cookies des Browsers in die requests-Session, speichert sie und wärmt den Ersatz-Browser vor"""
+        self.logger.info(f"{Fore.CYAN}Übertrage Session-Cookies...")
+        selenium_cookies = self.driver.get_cookies()
+        for cookie in selenium_cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
+        self.logger.info(f"{Fore.GREEN}✓ {len(selenium_cookies)} Cookies übertragen")
+        self.save_session(selenium_cookies)
+        self.refresh_standby_cookies()
+        self.prepare_standby()
+        return selenium_cookies
+
+    def save_session(self, cookies):
+        """Speichert die Login-Cookies für den nächsten Start"""
+        if not self.session_store or not self.config.get('bot', {}).get('reuse_session', True):
+            return
+        try:
+            if self.session_store.save(cookies, self.base_url):
+                self.logger.debug(f"Session gespeichert: {self.session_store.path}")
+            else:
+                self.logger.debug("Session nicht gespeichert - keine Verschlüsselung verfügbar (pip install cryptography)")
+        except Exception as e:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Konnte Session nicht speichern: {e}")
+
+    def session_cookies(self):
+        """Liefert die Cookies der requests-Session im Selenium-Format"""
+        return [{'name': c.name, 'value': c.value, 'path': c.path or '/', 'secure': bool(c.secure)}
+                for c in self.session.cookies]
+
+    def sync_cookies_to_driver(self, cookies, driver=None):
+        """Überträgt Session-Cookies in den Browser (Gegenstück zur Übertragung nach dem Login)"""
+        driver = driver or self.driver
+        if not driver:
+            return
+        try:
+            # Cookies lassen sich nur auf der eigenen Domain setzen - kleinste Seite laden
+            driver.get(f'{self.base_url}/robots.txt')
+            for cookie in cookies:
+                browser_cookie = {k: cookie[k] for k in ('name', 'value', 'path', 'secure', 'httpOnly', 'expiry') if k in cookie}
+                try:
+                    driver.add_cookie(browser_cookie)
+                except Exception as e:
+                    self.logger.debug("Cookie %s nicht übernommen: %s", cookie.get('name'), e)
+        except Exception as e:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Konnte Cookies nicht in den Browser übertragen: {e}")
+
+    def restore_session(self):
+        """Stellt eine gespeicherte Session wieder her - spart den Selenium-Login"""
+        if not self.session_store or not self.config.get('bot', {}).get('reuse_session', True):
+            return False
+
+        cookies = self.session_store.load(self.base_url)
+        if not cookies:
+            return False
+
+        self.logger.info(f"{Fore.CYAN}Prüfe gespeicherte Session...")
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+        if not self.check_session():
+            self.session.cookies.clear()
+            self.logger.info(f"{Fore.YELLOW}Gespeicherte Session ungültig - normaler Login")
+            return False
+
+        self.logged_in = True
+        self.sync_cookies_to_driver(cookies)
+        self.refresh_standby_cookies()
+        self.logger.info(f"{Fore.GREEN}✓ Gespeicherte Session wiederhergestellt - Login übersprungen")
+
+        # Aktualisiere Mission-Cache
+        if not self.mission_cache or (self.mission_cache_age and (time.time() - self.mission_cache_age) > 86400):
+            self.update_mission_cache()
+        return True
+
     def login(self):
-        """Meldet sich bei Leitstellenspiel.de an (mit Selenium)"""
+        """Meldet sich bei Leitstellenspiel.de an (gespeicherte Session oder Selenium)"""
         try:
             self.logger.info(f"{Fore.CYAN}Versuche Login...")
 
-            # Hole Account-Daten (unterstützt beide Formate)
-            account = None
-
-            # Neues Format: credentials
-            if 'credentials' in self.config:
-                account = self.config['credentials']
-                self.logger.info(f"{Fore.CYAN}Verwende credentials aus config")
-            # Altes Format: accounts
-            elif 'accounts' in self.config:
-                for acc in self.config.get('accounts', []):
-                    if acc.get('enabled', True):
-                        account = acc
-                        break
-                self.logger.info(f"{Fore.CYAN}Verwende accounts aus config")
+            account = self.get_account()
 
             if not account or not account.get('email') or not account.get('password'):
                 self.logger.error(f"{Fore.RED}Keine Login-Daten in config.json gefunden!")
@@ -279,6 +969,17 @@ class LeitstellenspielBot:
 
             self.logger.info(f"{Fore.CYAN}Login mit: {account['email']}")
 
+            # Gespeicherte Session wiederverwenden (Browser-Login nur wenn wirklich abgelaufen)
+            if not self.session_store or self.session_store.account_email != account['email'].strip().lower():
+                self.session_store = SessionStore(self.cache_dir, account['email'])
+            if self.restore_session():
+                return True
+
+            # Ab hier wird der Browser gebraucht
+            if not self.ensure_browser():
+                self.logger.error(f"{Fore.RED}Login nicht möglich - kein Browser verfügbar")
+                return False
+
             # Öffne Login-Seite
             self.driver.get(f'{self.base_url}/users/sign_in')
             # Warte bis Seite geladen ist (reduziert von 10s auf 3s)
@@ -291,6 +992,9 @@ class LeitstellenspielBot:
                 self.logged_in = True
                 self.logger.info(f"{Fore.GREEN}✓ Bereits eingeloggt!")
 
+                # Browser-Session ist gültig - die der requests-Session nicht (sonst wären wir nicht hier)
+                self.adopt_driver_cookies()
+
                 # Aktualisiere Mission-Cache
                 if not self.mission_cache or (self.mission_cache_age and (time.time() - self.mission_cache_age) > 86400):
                     self.update_mission_cache()
@@ -329,11 +1033,7 @@ class LeitstellenspielBot:
                     self.logger.info(f"{Fore.GREEN}✓ Login erfolgreich!")
 
                     # Übertrage Cookies von Selenium zu requests-Session
-                    self.logger.info(f"{Fore.CYAN}Übertrage Session-Cookies...")
-                    selenium_cookies = self.driver.get_cookies()
-                    for cookie in selenium_cookies:
-                        self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
-                    self.logger.info(f"{Fore.GREEN}✓ {len(selenium_cookies)} Cookies übertragen")
+                    self.adopt_driver_cookies()
 
                     # Aktualisiere Mission-Cache
                     if not self.mission_cache or (self.mission_cache_age and (time.time() - self.mission_cache_age) > 86400):
@@ -363,13 +1063,17 @@ class LeitstellenspielBot:
         try:
             # Nutze Cache wenn vorhanden und nicht zu alt
             if self.api_vehicles and not force_refresh:
+                self.metric_cache.inc(cache='api_vehicles', result='hit')
                 return self.api_vehicles
+            self.metric_cache.inc(cache='api_vehicles', result='miss')
 
             response = self.session.get(f'{self.base_url}/api/vehicles')
 
             if response.status_code == 200:
                 self.api_vehicles = response.json()
-                self.logger.debug(f"API: {len(self.api_vehicles)} Fahrzeuge geladen")
+                self.logger.debug("API: %d Fahrzeuge geladen", len(self.api_vehicles))
+                self.update_fleet(self.api_vehicles)
+                self.geo_index.set_vehicles(self.api_vehicles)
                 return self.api_vehicles
             else:
                 self.logger.warning(f"API-Fehler beim Laden der Fahrzeuge: {response.status_code}")
@@ -379,18 +1083,43 @@ class LeitstellenspielBot:
             self.logger.warning(f"Fehler beim Laden der Fahrzeuge-API: {e}")
             return []
 
+    def update_fleet(self, vehicles):
+        """Überträgt die Fahrzeugliste in den Flotten-Schnappschuss"""
+        if self.fleet is None:
+            return
+        try:
+            rebuilt = self.fleet.update(vehicles)
+            counts = self.fleet.available_by_category()
+            for category in self.fleet.categories:
+                self.metric_vehicles_available.set(counts.get(category, 0), category=category)
+            self.logger.debug("Flotte %s: %d Fahrzeuge", 'neu aufgebaut' if rebuilt else 'Status aktualisiert', len(self.fleet))
+        except Exception as e:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Flotten-Schnappschuss fehlgeschlagen: {e}")
+
+    def refresh_fleet(self):
+        """Lädt die Fahrzeuge neu, wenn der Schnappschuss älter als bot.fleet_refresh_interval ist"""
+        if self.fleet is None:
+            return
+        if self.fleet.updated_at and time.time() - self.fleet.updated_at < self.fleet_refresh_interval:
+            return
+        if self.get_api_vehicles(force_refresh=True):
+            self.logger.info(f"{Fore.CYAN}🚒 Verfügbar: {self.fleet.summary()}")
+
     def get_api_buildings(self, force_refresh=False):
         """Holt alle Gebäude über die offizielle API"""
         try:
             # Nutze Cache wenn vorhanden und nicht zu alt
             if self.api_buildings and not force_refresh:
+                self.metric_cache.inc(cache='api_buildings', result='hit')
                 return self.api_buildings
+            self.metric_cache.inc(cache='api_buildings', result='miss')
 
             response = self.session.get(f'{self.base_url}/api/buildings')
 
             if response.status_code == 200:
                 self.api_buildings = response.json()
-                self.logger.debug(f"API: {len(self.api_buildings)} Gebaeude geladen")
+                self.logger.debug("API: %d Gebaeude geladen", len(self.api_buildings))
+                self.geo_index.set_buildings(self.api_buildings)
                 return self.api_buildings
             else:
                 self.logger.warning(f"API-Fehler beim Laden der Gebaeude: {response.status_code}")
@@ -409,34 +1138,40 @@ class LeitstellenspielBot:
                 return False
 
             # Stelle sicher, dass die Session die aktuellen Cookies hat
-            self.logger.debug("Synchronisiere Cookies von Selenium zu requests-Session...")
-            for cookie in self.driver.get_cookies():
-                if 'domain' in cookie:
-                    self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'])
+            if self.driver:
+                self.logger.debug("Synchronisiere Cookies von Selenium zu requests-Session...")
+                for cookie in self.driver.get_cookies():
+                    if 'domain' in cookie:
+                        self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'])
 
             url = f'{self.base_url}/vehicles/{vehicle_id}/set_fms/{status}'
-            self.logger.debug(f"Setze Fahrzeug {vehicle_id} auf Status {status} via {url}")
+            self.logger.debug("Setze Fahrzeug %s auf Status %s via %s", vehicle_id, status, url)
 
             response = self.session.post(url)
 
-            self.logger.debug(f"Response Status Code: {response.status_code}")
-            self.logger.debug(f"Response Content: {response.text[:200]}")  # Erste 200 Zeichen
+            self.logger.debug("Response Status Code: %s", response.status_code)
+            self.logger.debug("Response Content: %.200s", response.text)  # Erste 200 Zeichen
 
             if response.status_code == 200:
                 # Prüfe ob Response JSON ist
                 try:
                     json_response = response.json()
-                    self.logger.debug(f"JSON Response: {json_response}")
+                    self.logger.debug("JSON Response: %s", json_response)
                 except:
                     pass
 
                 self.logger.info(f"{Fore.GREEN}✓ Fahrzeug {vehicle_id} auf Status {status} gesetzt")
+                self.metric_status_updates.inc(status=status, result='success')
+                if self.fleet is not None:
+                    self.fleet.set_state(vehicle_id, status)
                 return True
             else:
                 self.logger.warning(f"{Fore.YELLOW}⚠ Fehler beim Setzen des Status für Fahrzeug {vehicle_id}: HTTP {response.status_code}")
+                self.metric_status_updates.inc(status=status, result='failure')
                 return False
 
         except Exception as e:
+            self.metric_status_updates.inc(status=status, result='failure')
             self.logger.error(f"{Fore.RED}✗ Fehler beim Setzen des Fahrzeugstatus {vehicle_id}: {e}")
             import traceback
             self.logger.debug(traceback.format_exc())
@@ -452,6 +1187,7 @@ class LeitstellenspielBot:
                 # API gibt zurück: {"user_credits": 12345, "user_credits_current": 12345}
                 credits = data.get('user_credits', 0)
                 self.logger.debug(f"Aktuelle Credits: {credits:,}")
+                self.update_credits(credits)
                 return credits
             else:
                 self.logger.warning(f"Fehler beim Abrufen der Credits: {response.status_code}")
@@ -461,6 +1197,29 @@ class LeitstellenspielBot:
             self.logger.warning(f"Fehler beim Abrufen der Credits: {e}")
             return None
 
+    def update_credits(self, balance):
+        """Übernimmt einen abgefragten Kontostand und gleicht ihn mit der Schätzung pro Einsatz ab"""
+        reconcile = self.credit_tracker.sample(balance)
+        self.metric_credits.set(balance)
+        if reconcile and reconcile['missions']:
+            self.logger.info(f"{Fore.CYAN}💰 Credits: {reconcile['actual']:+,} in {reconcile['seconds'] / 60:.0f} min "
+                             f"(geschätzt {reconcile['estimated']:+,} aus {reconcile['missions']} Einsätzen)")
+        self.events.publish(CREDITS_UPDATED, credits=balance, earned=self.credit_tracker.earned, estimated=False)
+
+    def sample_credits(self):
+        """Fragt den Kontostand ab, wenn bot.credits_interval seit der letzten Abfrage vergangen ist"""
+        if self.credit_tracker.due():
+            return self.get_credits()
+        return None
+
+    def attribute_credits(self, mission):
+        """Schätzt die Credits eines erfolgreich alarmierten Einsatzes aus der Einsatz-Datenbank"""
+        mission_type = self.mission_cache.get(str(mission.get('mission_type_id')), {})
+        credits = mission_type.get('average_credits') or 0
+        if self.credit_tracker.attribute(mission['id'], credits):
+            self.metric_credits_estimated.inc(credits)
+            self.events.publish(CREDITS_UPDATED, credits=None, earned=self.credit_tracker.earned, estimated=True)
+
     def auto_expand_buildings(self):
         """Automatischer Gebäude-Ausbau"""
         try:
@@ -507,6 +1266,8 @@ class LeitstellenspielBot:
 
                 try:
                     # Ausbau über Selenium (da API keinen direkten Ausbau-Endpoint hat)
+                    if not self.ensure_browser():
+                        break
                     self.driver.get(f'{self.base_url}/buildings/{building_id}')
                     time.sleep(2)
 
@@ -557,7 +1318,7 @@ class LeitstellenspielBot:
             # Prüfe GitHub Releases
             update_url = "https://api.github.com/repos/RoMaSystems-source/Leitstellenspiel-bot/releases/latest"
 
-            response = requests.get(update_url, timeout=5)
+            response = self.public_session.get(update_url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 latest_version = data.get('tag_name', '').replace('v', '')
@@ -612,7 +1373,7 @@ class LeitstellenspielBot:
 
             # Lade Update herunter (mit erhöhtem Timeout für große Dateien)
             self.logger.info(f"{Fore.CYAN}📥 Starte Download... (kann bis zu 2 Minuten dauern)")
-            response = requests.get(download_url, timeout=120, stream=True)
+            response = self.public_session.get(download_url, timeout=120, stream=True)
             if response.status_code != 200:
                 self.logger.error(f"{Fore.RED}Download fehlgeschlagen: {response.status_code}")
                 return False
@@ -788,35 +1549,49 @@ class LeitstellenspielBot:
 
             return False
 
+    def session_expired(self, response):
+        """Rückruf des SessionGuard: Session ist abgelaufen (Umleitung auf sign_in oder 401)"""
+        if self.logged_in:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Session abgelaufen! ({response.request.method} {response.request.path_url})")
+        self.logged_in = False
+        if self.session_store:
+            self.session_store.clear()
+
     def check_session(self):
-        """Prüft ob die Session noch gültig ist"""
+        """Prüft eine wiederhergestellte Session (nur beim Start - danach erkennt der SessionGuard den Ablauf)"""
         try:
-            # Teste mit einem einfachen API-Call
-            response = self.session.get(f'{self.base_url}/api/credits', timeout=5)
+            # Teste mit einem einfachen API-Call (ohne automatischen Re-Login - wir sind mitten im Login)
+            with self.session_guard.suspended():
+                response = self.session.get(f'{self.base_url}/api/credits')
 
             # Wenn wir zur Login-Seite umgeleitet werden, ist die Session abgelaufen
-            if 'sign_in' in response.url or response.status_code == 401:
-                self.logger.warning(f"{Fore.YELLOW}⚠ Session abgelaufen!")
-                self.logged_in = False
+            if SessionGuard.is_expired(response):
+                return False
+
+            if response.status_code != 200:
                 return False
 
-            return response.status_code == 200
+            # Kontostand gleich mitnehmen (spart eine eigene Abfrage)
+            try:
+                self.update_credits(response.json().get('user_credits', 0))
+            except ValueError:
+                pass
+            return True
 
         except Exception as e:
             self.logger.warning(f"Session-Check Fehler: {e}")
             return False
 
     def ensure_logged_in(self):
-        """Stellt sicher, dass der Bot eingeloggt ist - loggt ggf. neu ein"""
-        if not self.logged_in or not self.check_session():
-            self.logger.info(f"{Fore.CYAN}🔄 Versuche automatischen Re-Login...")
-            if self.login():
-                self.logger.info(f"{Fore.GREEN}✓ Re-Login erfolgreich!")
-                return True
-            else:
-                self.logger.error(f"{Fore.RED}✗ Re-Login fehlgeschlagen!")
-                return False
-        return True
+        """Stellt sicher, dass der Bot eingeloggt ist - ohne Prüf-Anfrage, den Ablauf meldet der SessionGuard"""
+        if self.logged_in:
+            return True
+        self.logger.info(f"{Fore.CYAN}🔄 Versuche automatischen Re-Login...")
+        if self.session_guard.relogin():
+            self.logger.info(f"{Fore.GREEN}✓ Re-Login erfolgreich!")
+            return True
+        self.logger.error(f"{Fore.RED}✗ Re-Login fehlgeschlagen!")
+        return False
 
     def get_available_vehicles_api(self):
         """Gibt alle verfügbaren Fahrzeuge zurück (Status 2 = verfügbar)"""
@@ -842,19 +1617,13 @@ class LeitstellenspielBot:
             response = self.session.get(url)
             self.logger.info(f"{Fore.CYAN}Status Code: {response.status_code}")
 
+            # Abgelaufene Session: Re-Login und Wiederholung hat bereits der SessionGuard versucht
+            if SessionGuard.is_expired(response):
+                self.logger.error(f"{Fore.RED}✗ Einsätze nicht abrufbar - nicht eingeloggt")
+                return []
+
             if response.status_code != 200:
                 self.logger.error(f"{Fore.RED}Fehler beim Abrufen der Einsätze: Status {response.status_code}")
-                # Prüfe ob wir eingeloggt sind
-                if 'sign_in' in response.url:
-                    self.logger.warning(f"{Fore.YELLOW}Session abgelaufen! Versuche automatisch neu einzuloggen...")
-                    # Versuche neu einzuloggen
-                    if self.login():
-                        self.logger.info(f"{Fore.GREEN}✓ Automatischer Re-Login erfolgreich!")
-                        # Versuche nochmal Einsätze abzurufen
-                        return self.get_missions()
-                    else:
-                        self.logger.error(f"{Fore.RED}✗ Automatischer Re-Login fehlgeschlagen!")
-                        return []
                 return []
 
             # Debug: Zeige ersten Teil der Response
@@ -863,24 +1632,15 @@ class LeitstellenspielBot:
 
             # Extrahiere JSON aus JavaScript-Response
             # Suche nach: const mList = [...]
-            import re
-            match = re.search(r'const mList = (\[.*?\]);', response.text, re.DOTALL)
+            missions_data = extract_mission_list(response.text)
 
-            if not match:
+            if missions_data is None:
                 self.logger.warning(f"{Fore.YELLOW}Keine Einsätze gefunden (mList nicht im Response)")
                 self.logger.warning(f"{Fore.YELLOW}Response Länge: {len(response.text)} Zeichen")
                 # Speichere Response für Debug
-                with open(os.path.join(self.cache_dir, 'last_missions_response.txt'), 'w', encoding='utf-8') as f:
-                    f.write(response.text)
-                self.logger.info(f"{Fore.CYAN}Response gespeichert in: cache/last_missions_response.txt")
+                self.save_debug_file('last_missions_response.txt', response.text)
                 return []
 
-            json_str = match.group(1)
-            # Entferne trailing commas (JavaScript erlaubt sie, JSON nicht)
-            json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-
-            import json
-            missions_data = json.loads(json_str)
             self.logger.info(f"{Fore.CYAN}JSON geparst: {len(missions_data)} Einträge")
 
             missions = []
@@ -928,6 +1688,9 @@ class LeitstellenspielBot:
             if red_count > 0:
                 self.logger.info(f"{Fore.RED}🔴 {red_count} ROTE Einsätze (Priorität!)")
 
+            # Einsatzorte für die Auswahl der nächsten Fahrzeuge merken
+            self.mission_positions = {str(m['id']): coordinates(m) for m in missions if coordinates(m)}
+
             return missions
 
         except Exception as e:
@@ -946,20 +1709,12 @@ class LeitstellenspielBot:
                 return []
 
             # Extrahiere JSON aus JavaScript-Response
-            import re
-            match = re.search(r'const mList = (\[.*?\]);', response.text, re.DOTALL)
+            missions_data = extract_mission_list(response.text)
 
-            if not match:
+            if not missions_data:
                 # Keine Verbandseinsätze vorhanden
                 return []
 
-            json_str = match.group(1)
-            # Entferne trailing commas
-            json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-
-            import json
-            missions_data = json.loads(json_str)
-
             missions = []
             for mission in missions_data:
                 missions.append({
@@ -1070,13 +1825,24 @@ class LeitstellenspielBot:
             self.logger.error(f"{Fore.RED}Fehler bei Anforderungsanalyse: {e}")
             return None
 
+    def wait_for_page(self, timeout=5):
+        """Wartet bis das DOM der aktuellen Seite steht (readyState "interactive" oder "complete")"""
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") != 'loading'
+            )
+            return True
+        except TimeoutException:
+            self.logger.warning(f"{Fore.YELLOW}⚠ Seite nach {timeout}s noch nicht geladen")
+            return False
+
     def handle_alert(self):
         """Behandelt Browser-Alerts (z.B. Fahrzeug nicht verfügbar)"""
         try:
             WebDriverWait(self.driver, 1).until(EC.alert_is_present())
             alert = self.driver.switch_to.alert
             alert_text = alert.text
-            self.logger.debug(f"Alert: {alert_text}")
+            self.logger.debug("Alert: %s", alert_text)
             alert.accept()
 
             # Logge spezielle Fehler
@@ -1090,25 +1856,167 @@ class LeitstellenspielBot:
             return None
 
     def dispatch_vehicles(self, mission_id, mission_title="", missing_text_from_api="", patients_count=0, possible_patients_count=0):
+        """Alarmiert Fahrzeuge für einen Einsatz - bei abgestürztem Browser einmal auf dem Ersatz wiederholen"""
+        self.stage_timer = StageTimer(mission_id)
+        self.events.publish(MISSION_STARTED, mission_id=mission_id, title=mission_title)
+        started = time.time()
+        result = False
+        self.driver_busy = True
+        try:
+            result = self.dispatch_vehicles_once(mission_id, mission_title, missing_text_from_api,
+                                                 patients_count, possible_patients_count)
+            if result or self.browser_healthy():
+                return result
+
+            # Absturz nach dem Alarmieren-Klick: die Alarmierung kann angekommen sein
+            committed = self.stage_timer is not None and self.stage_timer.reached('commit')
+            if not self.recover_browser():
+                return False
+
+            if committed:
+                missing_text_from_api = self.missing_text_after_crash(mission_id, missing_text_from_api)
+                if missing_text_from_api is None:
+                    return False
+
+            self.logger.info(f"{Fore.CYAN}Wiederhole Alarmierung für Einsatz {mission_id} mit neuem Browser...")
+            result = self.dispatch_vehicles_once(mission_id, mission_title, missing_text_from_api,
+                                                 patients_count, possible_patients_count)
+            return result
+        finally:
+            self.driver_busy = False
+            self.finish_stage_timer(result)
+            if result:
+                self.events.publish(MISSION_DISPATCHED, mission_id=mission_id, title=mission_title,
+                                    vehicles=self.last_dispatched_count, seconds=time.time() - started)
+            else:
+                self.events.publish(MISSION_FAILED, mission_id=mission_id, title=mission_title,
+                                    seconds=time.time() - started)
+
+    @staticmethod
+    def mission_missing_text(mission):
+        """Fehlend-Text eines Einsatzes aus der Einsatzliste (missing_text kann Text, Dict oder JSON sein)"""
+        missing_text_raw = mission.get('missing_text', '')
+        missing_text = missing_text_raw
+        if isinstance(missing_text_raw, dict):
+            missing_text = missing_text_raw.get('vehicles', '')
+        elif isinstance(missing_text_raw, str) and missing_text_raw.strip().startswith('{'):
+            try:
+                missing_data = json.loads(missing_text_raw)
+                missing_text = missing_data.get('vehicles', '')
+            except:
+                pass
+        return missing_text
+
+    def missing_text_after_crash(self, mission_id, stale_missing_text):
+        """Liest den Einsatz nach einem Absturz während der Alarmierung neu ein
+
+        Returns:
+            str: aktueller Fehlend-Text, wenn eine Wiederholung sicher ist - None wenn nicht
+            (Einsatz weg, Fahrzeuge unterwegs oder Bedarf geändert: die Alarmierung ist wohl angekommen)
+        """
+        mission = next((m for m in self.get_missions() if str(m.get('id')) == str(mission_id)), None)
+        if mission is None:
+            self.logger.info(f"{Fore.CYAN}Einsatz {mission_id} nicht mehr offen - keine Wiederholung")
+            return None
+
+        missing_text = self.mission_missing_text(mission)
+        if mission.get('vehicle_state') or (missing_text or '').strip() != (stale_missing_text or '').strip():
+            self.logger.info(f"{Fore.CYAN}Einsatz {mission_id}: Alarmierung ist offenbar angekommen - keine Wiederholung "
+                             f"(wird im nächsten Durchlauf neu bewertet)")
+            return None
+        return missing_text
+
+    def count_dispatched_vehicles(self, not_dispatched=0):
+        """Verbucht die ausgewählten Fahrzeuge abzüglich der nicht alarmierten"""
+        self.last_dispatched_count = max(sum(self.last_selected_by_type.values()) - not_dispatched, 0)
+        self.metric_vehicles.inc(self.last_dispatched_count)
+
+    def begin_stage(self, stage):
+        """Startet eine neue Phase der laufenden Alarmierung (beendet die vorherige)"""
+        if self.stage_timer:
+            self.stage_timer.begin(stage)
+
+    def finish_stage_timer(self, result):
+        """Schließt die Zeitmessung des Einsatzes ab und verbucht den Datensatz"""
+        if not self.stage_timer:
+            return
+        try:
+            record = self.stage_timer.finish(result)
+            self.stage_stats.add(record)
+            self.metric_dispatches.inc(result='success' if result else 'failure')
+            self.metric_dispatch_duration.observe(record['total_ms'] / 1000)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                stages = ', '.join(f"{stage} {ms:.0f}" for stage, ms in record['stages'].items())
+                self.logger.debug("⏱ Einsatz %s: %.0f ms (%s)", record['mission_id'], record['total_ms'], stages)
+        except Exception as e:
+            self.logger.debug("Fehler bei der Zeitmessung: %s", e)
+        finally:
+            self.stage_timer = None
+
+    def log_call_summary(self):
+        """Loggt die Anzahl der WebDriver-Befehle und HTTP-Anfragen seit dem letzten Aufruf (pro Zyklus)"""
+        if not self.call_accounting:
+            return
+        calls = self.call_accounting.reset()
+        if not calls:
+            return
+
+        totals = CallAccounting.totals(calls)
+        http_count, http_ms = totals.get('http', (0, 0.0))
+        driver_count, driver_ms = totals.get('webdriver', (0, 0.0))
+        top = ', '.join(f"{method} {values['http'] + values['webdriver']}"
+                        for method, values in list(CallAccounting.by_method(calls).items())[:3])
+        self.logger.info(f"{Fore.CYAN}📡 Roundtrips: {http_count} HTTP ({http_ms / 1000:.1f}s), "
+                         f"{driver_count} WebDriver ({driver_ms / 1000:.1f}s) - meiste: {top}")
+
+        for (kind, command, method), (count, ms) in sorted(calls.items(), key=lambda item: -item[1][0]):
+            self.logger.debug("  %-35s %-9s %-25s %5dx %8.0f ms", method, kind, command, count, ms)
+
+    def log_budget_summary(self):
+        """Loggt die Wartezeit auf das Anfrage-Budget seit dem letzten Aufruf (pro Zyklus)"""
+        waited = self.rate_governor.reset()
+        if not waited:
+            return
+        for budget, (count, seconds) in waited.items():
+            self.metric_budget_wait.inc(seconds, budget=budget)
+        total = sum(seconds for count, seconds in waited.values())
+        detail = ', '.join(f"{budget} {seconds:.1f}s ({count}x)"
+                           for budget, (count, seconds) in sorted(waited.items(), key=lambda item: -item[1][1]))
+        self.logger.info(f"{Fore.CYAN}⏳ Wartezeit auf Anfrage-Budget: {total:.1f}s - {detail}")
+
+    def log_stage_summary(self):
+        """Loggt die rollenden p50/p95 der Alarmierungs-Phasen"""
+        if self.stage_stats.count:
+            self.logger.info(f"{Fore.CYAN}⏱ Phasen p50/p95 (letzte {min(self.stage_stats.count, self.stage_stats.window)} Einsätze): "
+                             f"{self.stage_stats.format_summary()}")
+
+    def dispatch_vehicles_once(self, mission_id, mission_title="", missing_text_from_api="", patients_count=0, possible_patients_count=0):
         """Alarmiert Fahrzeuge für einen Einsatz mit Selenium"""
         try:
-            self.logger.info(f"{Fore.MAGENTA}>>> DISPATCH_VEHICLES AUFGERUFEN:")
-            self.logger.info(f"{Fore.MAGENTA}>>> mission_id = {mission_id}")
-            self.logger.info(f"{Fore.MAGENTA}>>> mission_title = '{mission_title}'")
-            self.logger.info(f"{Fore.MAGENTA}>>> missing_text_from_api = '{missing_text_from_api}' (type: {type(missing_text_from_api)})")
-            self.logger.info(f"{Fore.MAGENTA}>>> patients_count = {patients_count}")
-            self.logger.info(f"{Fore.MAGENTA}>>> possible_patients_count = {possible_patients_count}")
+            self.logger.debug(">>> dispatch_vehicles(mission_id=%s, mission_title=%r, missing_text_from_api=%r, "
+                              "patients_count=%s, possible_patients_count=%s)", mission_id, mission_title,
+                              missing_text_from_api, patients_count, possible_patients_count)
 
             self.logger.info(f"{Fore.CYAN}Öffne Einsatz {mission_id}...")
+            self.last_selected_by_type = {}
+            self.last_dispatched_count = 0
 
-            # Öffne Einsatzseite
+            if not self.ensure_browser():
+                self.logger.error(f"{Fore.RED}Kein Browser verfügbar - Einsatz {mission_id} übersprungen")
+                return False
+
+            # Öffne Einsatzseite (immer im selben Tab)
+            self.begin_stage('page_load')
+            self.ensure_single_tab()
             self.driver.get(f'{self.base_url}/missions/{mission_id}')
             # Warte bis Seite geladen ist (statt fixer 2s)
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
+            self.measure_page_load()
 
             # Prüfe ob "Mehr Fahrzeuge laden" Button vorhanden ist und klicke ihn, bis er verschwindet
+            self.begin_stage('load_more')
             max_clicks = 50  # Maximal 50x klicken (Sicherheit gegen Endlosschleife)
             clicks = 0
             while clicks < max_clicks:
@@ -1131,7 +2039,7 @@ class LeitstellenspielBot:
                         self.logger.info(f"{Fore.GREEN}✓ Alle Fahrzeuge geladen ({clicks} Klicks)")
                     break
                 except Exception as e:
-                    self.logger.debug(f"Fehler beim Laden weiterer Fahrzeuge: {e}")
+                    self.logger.debug("Fehler beim Laden weiterer Fahrzeuge: %s", e)
                     break
 
             # Warnung wenn Maximum erreicht wurde
@@ -1139,6 +2047,7 @@ class LeitstellenspielBot:
                 self.logger.warning(f"{Fore.YELLOW}⚠ Maximum von {max_clicks} Klicks erreicht - eventuell nicht alle Fahrzeuge geladen!")
 
             # Debug: Speichere Seite
+            self.begin_stage('requirements')
             page_source = self.driver.page_source
 
             # Prüfe ob Einsatz abgeschlossen
@@ -1206,9 +2115,7 @@ class LeitstellenspielBot:
                 # Aber wir brechen NICHT ab - weiter unten wird aus Cache/Hilfe geladen
                 self.logger.info(f"{Fore.CYAN}Keine Anforderungen auf Seite gefunden, versuche Cache/Hilfe...")
                 # Speichere Seite für Debug
-                with open(os.path.join(self.cache_dir, f'mission_{mission_id}_no_requirements.html'), 'w', encoding='utf-8') as f:
-                    f.write(page_source)
-                self.logger.info(f"{Fore.CYAN}Seite gespeichert: cache/mission_{mission_id}_no_requirements.html")
+                self.save_debug_file(f'mission_{mission_id}_no_requirements.html', page_source)
 
                 # Versuche Anforderungen aus Cache/Hilfe zu laden
                 from bs4 import BeautifulSoup
@@ -1217,7 +2124,7 @@ class LeitstellenspielBot:
                 # HÖCHSTE PRIORITÄT: missing_text aus API (das was JETZT fehlt!)
                 mission_requirements = {}
                 import re
-                self.logger.info(f"{Fore.CYAN}>>> DEBUG: missing_text_from_api = '{missing_text_from_api}' (type: {type(missing_text_from_api)})")
+                self.logger.debug(">>> missing_text_from_api = %r", missing_text_from_api)
                 if missing_text_from_api and missing_text_from_api.strip():
                     self.logger.info(f"{Fore.CYAN}📝 Verwende missing_text aus API: {missing_text_from_api}")
                     mission_requirements = self.parse_missing_text(missing_text_from_api)
@@ -1226,7 +2133,7 @@ class LeitstellenspielBot:
                     else:
                         self.logger.warning(f"{Fore.YELLOW}⚠ parse_missing_text() gab leeres Dict zurück!")
                 else:
-                    self.logger.info(f"{Fore.YELLOW}>>> missing_text_from_api ist leer oder None - nutze Fallbacks")
+                    self.logger.debug(">>> missing_text_from_api ist leer oder None - nutze Fallbacks")
 
                 # FALLBACK 1: Versuche "Wir benötigen:" Text auf der Seite zu parsen
                 if not mission_requirements:
@@ -1270,8 +2177,9 @@ class LeitstellenspielBot:
                 # Wenn wir Anforderungen haben, wähle Fahrzeuge über Checkboxen aus
                 selected_vehicle_ids = []  # Speichere IDs für Personalmangel-Handling
                 if mission_requirements:
+                    self.begin_stage('selection')
                     self.logger.info(f"{Fore.CYAN}Wähle Fahrzeuge über Checkboxen aus...")
-                    selected_count, selected_vehicle_ids = self.select_vehicles_by_checkboxes(mission_requirements)
+                    selected_count, selected_vehicle_ids = self.select_vehicles_by_checkboxes(mission_requirements, mission_id)
                     if selected_count > 0:
                         self.logger.info(f"{Fore.GREEN}✓ {selected_count} Fahrzeuge ausgewählt")
                         self.logger.info(f"{Fore.CYAN}📋 Ausgewählte Fahrzeug-IDs: {selected_vehicle_ids}")
@@ -1289,6 +2197,7 @@ class LeitstellenspielBot:
 
             # Prüfe auf "Zusätzlich benötigte Fahrzeuge:"
             if "Zusätzlich benötigte Fahrzeuge:" in page_source:
+                self.begin_stage('selection')
                 self.logger.info(f"{Fore.CYAN}Nachalarmierung für Einsatz {mission_id}")
 
                 # Extrahiere benötigte Fahrzeuge
@@ -1319,9 +2228,11 @@ class LeitstellenspielBot:
                                 try:
                                     # Klicke auf Fahrzeug-Button
                                     button = self.driver.find_element(By.XPATH, f'//*[@title="1 {vehicle_type}"]')
+                                    # Kein Sleep nötig: handle_alert wartet selbst auf den Alert,
+                                    # das Klick-Tempo regelt das Budget "browser:clickElement"
                                     button.click()
-                                    time.sleep(0.1)  # Reduziert von 0.5s
                                     self.handle_alert()
+                                    self.last_selected_by_type[vehicle_type] = self.last_selected_by_type.get(vehicle_type, 0) + 1
                                     self.logger.info(f"{Fore.GREEN}✓ {vehicle_type} alarmiert")
                                 except NoSuchElementException:
                                     self.logger.warning(f"{Fore.YELLOW}⚠ Button für {vehicle_type} nicht gefunden")
@@ -1330,6 +2241,7 @@ class LeitstellenspielBot:
 
             # Wenn nichts Spezifisches benötigt wird, schicke 1 Fahrzeug als Vorhut
             elif "Wir benötigen noch min." in page_source:
+                self.begin_stage('selection')
                 self.logger.info(f"{Fore.CYAN}Schicke Vorhut für Einsatz {mission_id}")
 
                 # Suche alle verfügbaren Fahrzeug-Buttons
@@ -1355,7 +2267,6 @@ class LeitstellenspielBot:
                     button = self.driver.find_element(By.XPATH, '//*[@title="1 LF"]')
                     self.logger.info(f"{Fore.CYAN}LF-Button gefunden, klicke...")
                     button.click()
-                    time.sleep(0.05)  # Reduziert von 0.1s auf 0.05s
                     self.handle_alert()
                     self.logger.info(f"{Fore.GREEN}✓ 1 LF als Vorhut alarmiert")
                 except NoSuchElementException:
@@ -1365,7 +2276,6 @@ class LeitstellenspielBot:
                         button = self.driver.find_element(By.XPATH, '//*[@title="1 RTW"]')
                         self.logger.info(f"{Fore.CYAN}RTW-Button gefunden, klicke...")
                         button.click()
-                        time.sleep(0.05)  # Reduziert von 0.1s auf 0.05s
                         self.handle_alert()
                         self.logger.info(f"{Fore.GREEN}✓ 1 RTW als Vorhut alarmiert")
                     except NoSuchElementException:
@@ -1375,20 +2285,18 @@ class LeitstellenspielBot:
                             button = self.driver.find_element(By.XPATH, '//*[@title="1 FuStW"]')
                             self.logger.info(f"{Fore.CYAN}FuStW-Button gefunden, klicke...")
                             button.click()
-                            time.sleep(0.05)  # Reduziert von 0.1s auf 0.05s
                             self.handle_alert()
                             self.logger.info(f"{Fore.GREEN}✓ 1 FuStW als Vorhut alarmiert")
                         except NoSuchElementException:
                             self.logger.warning(f"{Fore.YELLOW}⚠ Kein Fahrzeug zum Alarmieren gefunden")
                             # Speichere Seite für Debug
-                            with open(os.path.join(self.cache_dir, f'mission_{mission_id}_page.html'), 'w', encoding='utf-8') as f:
-                                f.write(page_source)
-                            self.logger.info(f"{Fore.CYAN}Seite gespeichert: cache/mission_{mission_id}_page.html")
+                            self.save_debug_file(f'mission_{mission_id}_page.html', page_source)
                             return False
                 except Exception as e:
                     self.logger.error(f"{Fore.RED}Fehler beim Klicken: {e}")
 
             # Klicke "Alarmieren" Button
+            self.begin_stage('commit')
             try:
                 self.logger.info(f"{Fore.CYAN}Suche Alarmieren-Button...")
                 commit_button = self.driver.find_element(By.NAME, "commit")
@@ -1408,13 +2316,18 @@ class LeitstellenspielBot:
 
                     # Prüfe, ob Fahrzeuge wegen Personalmangel nicht alarmiert wurden
                     # Gehe zurück zur Einsatzseite und prüfe noch ausgewählte Checkboxen
+                    self.begin_stage('verify')
                     self.driver.get(f'{self.base_url}/missions/{mission_id}')
-                    time.sleep(0.5)  # Warte bis Seite geladen ist
+                    self.wait_for_page()
 
                     # Finde noch ausgewählte Checkboxen (= nicht alarmierte Fahrzeuge)
                     still_selected = self.driver.find_elements(By.CSS_SELECTOR, "input.vehicle_checkbox:checked")
+                    self.count_dispatched_vehicles(len(still_selected))
                     if len(still_selected) > 0:
                         self.logger.warning(f"{Fore.YELLOW}⚠ {len(still_selected)} Fahrzeuge wurden nicht alarmiert (vermutlich Personalmangel)")
+                        # Bedarf ist nicht vollständig gedeckt - nicht im Gedächtnis vormerken
+                        self.last_selected_by_type = {}
+                        self.begin_stage('status6')
                         for checkbox in still_selected:
                             vehicle_id = checkbox.get_attribute("value")
                             if vehicle_id:
@@ -1448,8 +2361,9 @@ class LeitstellenspielBot:
                             self.logger.warning(f"{Fore.YELLOW}⚠ Personalmangel/Ausbildungsproblem erkannt - setze Fahrzeuge auf Status 6...")
 
                             # Gehe zurück zur Einsatzseite und prüfe noch ausgewählte Checkboxen
+                            self.begin_stage('verify')
                             self.driver.get(f'{self.base_url}/missions/{mission_id}')
-                            time.sleep(0.5)  # Warte bis Seite geladen ist
+                            self.wait_for_page()
 
                             # Finde noch ausgewählte Checkboxen (= nicht alarmierte Fahrzeuge)
                             still_selected = self.driver.find_elements(By.CSS_SELECTOR, "input.vehicle_checkbox:checked")
@@ -1461,6 +2375,7 @@ class LeitstellenspielBot:
                                 vehicles_to_set = selected_vehicle_ids
 
                             if vehicles_to_set:
+                                self.begin_stage('status6')
                                 self.logger.warning(f"{Fore.YELLOW}⚠ {len(vehicles_to_set)} Fahrzeuge wurden nicht alarmiert (Personalmangel)")
                                 for vehicle_id in vehicles_to_set:
                                     self.logger.info(f"{Fore.CYAN}🔧 Setze Fahrzeug {vehicle_id} auf Status 6 (Personalmangel)...")
@@ -1475,23 +2390,71 @@ class LeitstellenspielBot:
                         return False
                     except NoSuchElementException:
                         # Keine Meldung gefunden - vermutlich erfolgreich
+                        self.count_dispatched_vehicles()
                         self.logger.info(f"{Fore.GREEN}✓ Fahrzeuge alarmiert für Einsatz {mission_id}")
                         return True
 
             except NoSuchElementException:
                 self.logger.warning(f"{Fore.YELLOW}⚠ Alarmieren-Button nicht gefunden")
                 # Speichere Seite für Debug
-                with open(os.path.join(self.cache_dir, f'mission_{mission_id}_no_button.html'), 'w', encoding='utf-8') as f:
-                    f.write(self.driver.page_source)
-                self.logger.info(f"{Fore.CYAN}Seite gespeichert: cache/mission_{mission_id}_no_button.html")
+                if self.debug_store.enabled:
+                    self.save_debug_file(f'mission_{mission_id}_no_button.html', self.driver.page_source)
                 return False
 
         except Exception as e:
             self.logger.error(f"{Fore.RED}Fehler beim Alarmieren von Fahrzeugen für {mission_id}: {e}")
             return False
 
-    def select_vehicles_by_checkboxes(self, requirements):
-        """Wählt Fahrzeuge über Checkboxen aus basierend auf Anforderungen
+    def checkbox_candidates(self, attr_names, strict_state=False):
+        """IDs der freien, noch nicht ausgewählten Fahrzeuge mit einem der Attribute (ein WebDriver-Aufruf)
+
+        strict_state: nur Fahrzeuge mit vehicle_state="2" (sonst auch ohne vehicle_state-Attribut)
+        """
+        return self.driver.execute_script("""
+            const attrs = arguments[0], strict = arguments[1];
+            return Array.from(document.querySelectorAll('input.vehicle_checkbox')).filter(cb => {
+                if (cb.checked) return false;
+                const state = cb.getAttribute('vehicle_state');
+                if (strict ? state !== '2' : (state && state !== '2')) return false;
+                return attrs.some(name => cb.getAttribute(name) === '1');
+            }).map(cb => cb.value);
+        """, attr_names, strict_state) or []
+
+    def click_vehicle_checkbox(self, vehicle_id):
+        """Wählt die Checkbox eines Fahrzeugs aus - False wenn sie fehlt oder schon ausgewählt ist"""
+        return bool(self.driver.execute_script("""
+            const cb = Array.from(document.querySelectorAll('input.vehicle_checkbox'))
+                .find(element => element.value === arguments[0]);
+            if (!cb || cb.checked) return false;
+            cb.scrollIntoView({block: 'center'});
+            cb.click();
+            return true;
+        """, str(vehicle_id)))
+
+    def mission_position(self, mission_id):
+        """(lat, lon) eines Einsatzes aus der letzten Einsatzliste - None wenn unbekannt oder abgeschaltet"""
+        if mission_id is None or not self.config.get('bot', {}).get('nearest_vehicles', True):
+            return None
+        position = self.mission_positions.get(str(mission_id))
+        if position is None:
+            return None
+
+        # Wachen und Fahrzeug-Zuordnung einmalig laden (danach aus dem Cache)
+        if not self.geo_index.positions:
+            self.get_api_buildings()
+        if not self.geo_index.vehicle_building:
+            self.get_api_vehicles()
+        return position if self.geo_index.positions else None
+
+    def format_vehicle_distance(self, vehicle_id, position):
+        """', 3.2 km' für das Log (leer wenn unbekannt)"""
+        if not position:
+            return ''
+        distance = self.geo_index.vehicle_distance(vehicle_id, *position)
+        return f", {distance:.1f} km" if distance is not None else ''
+
+    def select_vehicles_by_checkboxes(self, requirements, mission_id=None):
+        """Wählt Fahrzeuge über Checkboxen aus basierend auf Anforderungen (nächste Wachen zuerst)
 
         Returns:
             tuple: (selected_count, selected_vehicle_ids) - Anzahl und IDs der ausgewählten Fahrzeuge
@@ -1528,6 +2491,10 @@ class LeitstellenspielBot:
             }
 
             selected_count = 0
+            selected_by_type = {}  # Fahrzeugtyp -> Anzahl ausgewählt (inkl. Fallback)
+
+            # Einsatzort für die Sortierung nach Entfernung (None = Reihenfolge der Seite)
+            position = self.mission_position(mission_id)
 
             for vehicle_type, count_needed in requirements.items():
                 attr_names = vehicle_type_mapping.get(vehicle_type, [vehicle_type.lower()])
@@ -1535,82 +2502,24 @@ class LeitstellenspielBot:
                 # Wähle die benötigte Anzahl aus
                 selected_for_this_type = 0
 
-                # DEBUG: Zähle verfügbare Fahrzeuge dieses Typs
-                checkboxes_all = self.driver.find_elements(By.CLASS_NAME, "vehicle_checkbox")
-                available_count = 0
-                available_with_state_2 = 0
-
-                for cb in checkboxes_all:
-                    if cb.is_selected():
-                        continue
-                    for attr_name in attr_names:
-                        try:
-                            if cb.get_attribute(attr_name) == "1":
-                                available_count += 1
-                                # Prüfe vehicle_state
-                                v_state = cb.get_attribute("vehicle_state")
-                                if v_state == "2":
-                                    available_with_state_2 += 1
-                                break
-                        except:
-                            pass
-
-                self.logger.info(f"{Fore.CYAN}🔍 Suche {count_needed}x {vehicle_type} (gefunden: {available_count} Checkboxen, davon {available_with_state_2} mit state=2)")
+                # Alle passenden freien Fahrzeuge mit einem Aufruf holen, nächste zuerst
+                candidates = self.checkbox_candidates(attr_names)
+                if position:
+                    candidates = self.geo_index.rank_vehicles(candidates, *position, needed=count_needed)
+                self.logger.info(f"{Fore.CYAN}🔍 Suche {count_needed}x {vehicle_type} (gefunden: {len(candidates)} verfügbar)")
 
-                for i in range(count_needed):
+                for vehicle_id in candidates:
+                    if selected_for_this_type >= count_needed:
+                        break
                     try:
-                        # Hole Checkboxen JEDES MAL neu (weil sie nach Klick neu geladen werden)
-                        checkboxes = self.driver.find_elements(By.CLASS_NAME, "vehicle_checkbox")
-
-                        # Finde nächste passende, nicht-ausgewählte Checkbox
-                        found = False
-                        for checkbox in checkboxes:
-                            # Prüfe ob Checkbox bereits ausgewählt ist
-                            if checkbox.is_selected():
-                                continue
-
-                            # Prüfe ob Fahrzeug verfügbar ist (vehicle_state="2")
-                            vehicle_state = None
-                            try:
-                                vehicle_state = checkbox.get_attribute("vehicle_state")
-                            except:
-                                pass
-
-                            # Wenn vehicle_state existiert und NICHT "2" ist, überspringe
-                            if vehicle_state and vehicle_state != "2":
-                                continue
-
-                            # Prüfe alle möglichen Attributnamen
-                            for attr_name in attr_names:
-                                try:
-                                    attr_value = checkbox.get_attribute(attr_name)
-                                    if attr_value == "1":
-                                        # Hole Fahrzeug-ID
-                                        vehicle_id = checkbox.get_attribute("value")
-
-                                        # Scrolle zur Checkbox damit sie sichtbar ist
-                                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
-                                        time.sleep(0.02)  # Reduziert von 0.05s auf 0.02s
-
-                                        # Klicke die Checkbox
-                                        self.driver.execute_script("arguments[0].click();", checkbox)
-                                        selected_count += 1
-                                        selected_for_this_type += 1
-                                        selected_vehicle_ids.append(vehicle_id)  # Speichere ID
-                                        self.logger.info(f"{Fore.GREEN}✓ {vehicle_type} #{selected_for_this_type} ausgewählt (ID: {vehicle_id})")
-                                        time.sleep(0.05)  # Reduziert von 0.1s auf 0.05s
-                                        found = True
-                                        break
-                                except:
-                                    pass
-
-                            if found:
-                                break
-
-                        if not found:
-                            self.logger.warning(f"{Fore.YELLOW}⚠ Keine weiteren {vehicle_type} verfügbar")
-                            break
-
+                        # Bereits für einen anderen Typ ausgewählt oder inzwischen weg - nächsten nehmen
+                        if not self.click_vehicle_checkbox(vehicle_id):
+                            continue
+                        selected_count += 1
+                        selected_for_this_type += 1
+                        selected_vehicle_ids.append(vehicle_id)  # Speichere ID
+                        self.logger.info(f"{Fore.GREEN}✓ {vehicle_type} #{selected_for_this_type} ausgewählt "
+                                         f"(ID: {vehicle_id}{self.format_vehicle_distance(vehicle_id, position)})")
                     except Exception as e:
                         self.logger.warning(f"{Fore.YELLOW}⚠ Fehler beim Auswählen von {vehicle_type}: {e}")
 
@@ -1622,48 +2531,36 @@ class LeitstellenspielBot:
                     if fallback_type:
                         self.logger.info(f"{Fore.CYAN}Versuche Fallback: {fallback_type} statt {vehicle_type}")
 
-                        # Hole neue Checkboxen-Liste
-                        checkboxes = self.driver.find_elements(By.CLASS_NAME, "vehicle_checkbox")
-                        fallback_checkboxes = []
                         fallback_attr_names = vehicle_type_mapping.get(fallback_type, [fallback_type.lower()])
-
-                        for checkbox in checkboxes:
-                            if checkbox.is_selected():
-                                continue
-
-                            # Prüfe ob Fahrzeug verfügbar ist
-                            try:
-                                vehicle_state = checkbox.get_attribute("vehicle_state")
-                                if vehicle_state != "2":
-                                    continue
-                            except:
-                                pass
-
-                            for attr_name in fallback_attr_names:
-                                try:
-                                    attr_value = checkbox.get_attribute(attr_name)
-                                    if attr_value == "1":
-                                        fallback_checkboxes.append(checkbox)
-                                        break
-                                except:
-                                    pass
+                        fallback_candidates = self.checkbox_candidates(fallback_attr_names, strict_state=True)
+                        if position:
+                            fallback_candidates = self.geo_index.rank_vehicles(fallback_candidates, *position,
+                                                                               needed=still_needed)
 
                         # Wähle Fallback-Fahrzeuge
-                        for i in range(min(still_needed, len(fallback_checkboxes))):
+                        fallback_selected = 0
+                        for vehicle_id in fallback_candidates:
+                            if fallback_selected >= still_needed:
+                                break
                             try:
-                                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", fallback_checkboxes[i])
-                                time.sleep(0.05)  # Reduziert von 0.2s
-                                self.driver.execute_script("arguments[0].click();", fallback_checkboxes[i])
+                                if not self.click_vehicle_checkbox(vehicle_id):
+                                    continue
                                 selected_count += 1
                                 selected_for_this_type += 1
-                                self.logger.info(f"{Fore.GREEN}✓ {fallback_type} #{i+1} (Fallback für {vehicle_type}) ausgewählt")
-                                time.sleep(0.1)  # Reduziert von 0.3s
+                                fallback_selected += 1
+                                selected_vehicle_ids.append(vehicle_id)
+                                self.logger.info(f"{Fore.GREEN}✓ {fallback_type} #{fallback_selected} (Fallback für {vehicle_type}) ausgewählt "
+                                                 f"(ID: {vehicle_id}{self.format_vehicle_distance(vehicle_id, position)})")
                             except Exception as e:
                                 self.logger.warning(f"{Fore.YELLOW}⚠ Fehler beim Auswählen von {fallback_type}: {e}")
 
                     if selected_for_this_type < count_needed:
                         self.logger.warning(f"{Fore.YELLOW}⚠ Nur {selected_for_this_type}/{count_needed} {vehicle_type} verfügbar")
 
+                if selected_for_this_type > 0:
+                    selected_by_type[vehicle_type] = selected_for_this_type
+
+            self.last_selected_by_type.update(selected_by_type)
             return (selected_count, selected_vehicle_ids)
 
         except Exception as e:
@@ -1683,7 +2580,7 @@ class LeitstellenspielBot:
                 if match:
                     return match.group(1)
         except Exception as e:
-            self.logger.debug(f"Fehler beim Extrahieren der Mission-Type-ID: {e}")
+            self.logger.debug("Fehler beim Extrahieren der Mission-Type-ID: %s", e)
         return None
 
     def get_mission_requirements_from_cache(self, mission_type_id):
@@ -1693,7 +2590,9 @@ class LeitstellenspielBot:
 
         mission_data = self.mission_cache.get(str(mission_type_id))
         if not mission_data:
+            self.metric_cache.inc(cache='mission_types', result='miss')
             return {}
+        self.metric_cache.inc(cache='mission_types', result='hit')
 
         # Konvertiere API-Format zu internem Format
         requirements = {}
@@ -1786,71 +2685,7 @@ class LeitstellenspielBot:
                 return {}
 
             help_soup = BeautifulSoup(help_response.content, 'html.parser')
-
-            import re
-            requirements = {}
-
-            # Finde den Text-Bereich
-            text_content = help_soup.get_text()
-            lines = text_content.split('\n')
-
-            # Fahrzeugtypen-Mapping (was wir suchen -> was wir zurückgeben)
-            vehicle_mapping = {
-                'RTW': ['Rettungswagen', 'RTW'],
-                'NEF': ['Notarzteinsatzfahrzeug', 'NEF'],
-                'KTW': ['Krankentransportwagen', 'KTW'],
-                'NAW': ['Notarztwagen', 'NAW'],
-                'RTH': ['Rettungshubschrauber', 'RTH'],
-                'ITW': ['Intensivtransportwagen', 'ITW'],
-                'LF': ['Löschfahrzeug', 'LF'],
-                'DLK': ['Drehleiter', 'DLK'],
-                'TLF': ['Tanklöschfahrzeug', 'TLF'],
-                'RW': ['Rüstwagen', 'RW'],
-                'GW': ['Gerätewagen', 'GW'],
-                'ELW': ['Einsatzleitwagen', 'ELW'],
-                'MTW': ['Mannschaftstransportwagen', 'MTW'],
-                'SW': ['Schlauchwagen', 'SW'],
-                'FuStW': ['Funkstreifenwagen', 'FuStW'],
-                'GefKw': ['Gefangenenkraftwagen', 'GefKw'],
-                'GW-A': ['GW-A', 'GW A'],
-                'GW-L': ['GW-L', 'GW L'],
-                'GW-Öl': ['GW-Öl', 'GW Öl'],
-                'GW-Mess': ['GW-Mess', 'GW Mess'],
-            }
-
-            in_requirements = False
-            for line in lines:
-                line = line.strip()
-
-                # Starte bei "Mindestanforderung"
-                if 'Mindestanforderung' in line:
-                    in_requirements = True
-                    continue
-
-                # Stoppe bei bestimmten Schlüsselwörtern
-                if in_requirements and any(keyword in line for keyword in ['Weitere', 'Einsatzvarianten', 'Wahrscheinlichkeit', 'Voraussetzung']):
-                    break
-
-                if in_requirements and line:
-                    # Suche nach Muster: "Zahl x Fahrzeugtyp" oder "Zahl Fahrzeugtyp"
-                    match = re.match(r'^(\d+)\s*x?\s*(.+)$', line)
-                    if match:
-                        count = int(match.group(1))
-                        vehicle_desc = match.group(2).strip()
-
-                        # Bereinige Beschreibung (entferne Klammern etc.)
-                        vehicle_desc = re.sub(r'\s*\([^)]*\).*$', '', vehicle_desc)
-                        vehicle_desc = vehicle_desc.split(' oder ')[0].strip()
-
-                        # Finde passenden Fahrzeugtyp
-                        for vtype, aliases in vehicle_mapping.items():
-                            for alias in aliases:
-                                if alias.lower() in vehicle_desc.lower():
-                                    if vtype in requirements:
-                                        requirements[vtype] = max(requirements[vtype], count)
-                                    else:
-                                        requirements[vtype] = count
-                                    break
+            requirements = parse_help_requirements(help_soup.get_text())
 
             if requirements:
                 self.logger.info(f"{Fore.CYAN}Mindestanforderungen aus Hilfe-Seite:")
@@ -1900,48 +2735,8 @@ class LeitstellenspielBot:
         return False
 
     def parse_missing_text(self, missing_text):
-        """Parst missing_text und extrahiert Fahrzeuganforderungen (optimiert)"""
-        if not missing_text:
-            return {}
-
-        import re
-        requirements = {}
-
-        # Optimierte Patterns: Einzelnes kompiliertes Regex pro Fahrzeugtyp
-        # Format: (pattern, vehicle_type)
-        vehicle_patterns = [
-            (re.compile(r'(\d+)\s*x?\s*Rettungswagen|RTW', re.IGNORECASE), 'RTW'),
-            (re.compile(r'(\d+)\s*x?\s*Notarzteinsatzfahrzeug|NEF', re.IGNORECASE), 'NEF'),
-            (re.compile(r'(\d+)\s*x?\s*Notarztwagen|NAW', re.IGNORECASE), 'NAW'),
-            (re.compile(r'(\d+)\s*x?\s*Krankentransportwagen|KTW', re.IGNORECASE), 'KTW'),
-            (re.compile(r'(\d+)\s*x?\s*Rettungshubschrauber|RTH', re.IGNORECASE), 'RTH'),
-            (re.compile(r'(\d+)\s*x?\s*Intensivtransportwagen|ITW', re.IGNORECASE), 'ITW'),
-            (re.compile(r'(\d+)\s*x?\s*Leitender\s+Notarzt|LNA', re.IGNORECASE), 'LNA'),
-            (re.compile(r'(\d+)\s*x?\s*Organisatorischer\s+Leiter|OrgL|ORGL', re.IGNORECASE), 'ORGL'),
-            (re.compile(r'(\d+)\s*x?\s*KdoW-LNA|KdoW\s*LNA', re.IGNORECASE), 'KdoW-LNA'),
-            (re.compile(r'(\d+)\s*x?\s*KdoW-OrgL|KdoW\s*OrgL', re.IGNORECASE), 'KdoW-ORGL'),
-            (re.compile(r'(\d+)\s*x?\s*Löschfahrzeug|LF', re.IGNORECASE), 'LF'),
-            (re.compile(r'(\d+)\s*x?\s*Drehleiter|DLK', re.IGNORECASE), 'DLK'),
-            (re.compile(r'(\d+)\s*x?\s*Tanklöschfahrzeug|TLF', re.IGNORECASE), 'TLF'),
-            (re.compile(r'(\d+)\s*x?\s*Rüstwagen|RW', re.IGNORECASE), 'RW'),
-            (re.compile(r'(\d+)\s*x?\s*Gerätewagen(?!-)', re.IGNORECASE), 'GW'),  # Nicht GW-A etc.
-            (re.compile(r'(\d+)\s*x?\s*Einsatzleitwagen|ELW', re.IGNORECASE), 'ELW'),
-            (re.compile(r'(\d+)\s*x?\s*Mannschaftstransportwagen|MTW', re.IGNORECASE), 'MTW'),
-            (re.compile(r'(\d+)\s*x?\s*Funkstreifenwagen|FuStW|Polizeimotorrad', re.IGNORECASE), 'FuStW'),
-            (re.compile(r'(\d+)\s*x?\s*GW-A|GW\s*A', re.IGNORECASE), 'GW-A'),
-            (re.compile(r'(\d+)\s*x?\s*GW-L|GW\s*L', re.IGNORECASE), 'GW-L'),
-            (re.compile(r'(\d+)\s*x?\s*GW-Öl|GW\s*Öl', re.IGNORECASE), 'GW-Öl'),
-        ]
-
-        # Single-Pass durch alle Patterns
-        for pattern, vehicle_type in vehicle_patterns:
-            matches = pattern.findall(missing_text)
-            if matches:
-                # Summe alle gefundenen Zahlen
-                count = sum(int(match) for match in matches)
-                requirements[vehicle_type] = count
-
-        return requirements
+        """Parst missing_text und extrahiert Fahrzeuganforderungen (siehe missing_text.py)"""
+        return parse_missing_text(missing_text)
 
     def select_vehicles_intelligently(self, available_vehicles, requirements, soup, mission_id, mission_title=""):
         """Wählt intelligent Fahrzeuge basierend auf Anforderungen aus"""
@@ -1950,7 +2745,7 @@ class LeitstellenspielBot:
 
             # STRATEGIE 1 (PRIORITÄT): Parse missing_text - das ist was JETZT fehlt!
             missing_texts = requirements.get('missing', [])
-            self.logger.debug(f"Missing texts: {missing_texts}")
+            self.logger.debug("Missing texts: %s", missing_texts)
 
             for missing_text in missing_texts:
                 if missing_text:  # Nur wenn nicht leer
@@ -2108,31 +2903,72 @@ class LeitstellenspielBot:
             self.logger.error(f"{Fore.RED}Fehler bei Nachalarmierung {mission_id}: {e}")
             return False
 
+    def get_radio_message_urls_http(self):
+        """Liest Sprechwunsch-Links aus dem Funk-Panel per HTTP (ohne Browser)
+
+        Returns:
+            list: Fahrzeug-URLs, oder None wenn das Panel im HTML nicht gefunden wurde
+        """
+        try:
+            response = self.session.get(f'{self.base_url}/', timeout=10)
+            if response.status_code != 200 or 'sign_in' in response.url:
+                return None
+
+            soup = BeautifulSoup(response.text, 'html.parser')
+            panel = soup.find(id='radio_messages_important')
+            if panel is None:
+                return None
+
+            urls = []
+            for link in panel.select("a[href*='/vehicles/']"):
+                href = link.get('href', '')
+                if href and href not in urls:
+                    urls.append(href if href.startswith('http') else f'{self.base_url}{href}')
+            return urls
+        except Exception as e:
+            self.logger.debug("Sprechwunsch-Prüfung per HTTP fehlgeschlagen: %s", e)
+            return None
+
     def handle_radio_messages(self):
         """Bearbeitet Sprechwünsche (Patiententransporte) mit Selenium"""
         try:
             self.logger.info(f"{Fore.CYAN}🔍 Prüfe auf Sprechwünsche...")
 
-            # Öffne die Einsatzliste und warte auf das Funk-Panel (reduziert von 10s auf 3s)
-            self.driver.get(f'{self.base_url}/')
-            WebDriverWait(self.driver, 3).until(
-                EC.presence_of_element_located((By.ID, "radio_messages_important"))
-            )
+            # Erst per HTTP prüfen - der Browser wird nur gestartet, wenn es etwas zu tun gibt
+            vehicle_urls = self.get_radio_message_urls_http()
+            if vehicle_urls is not None and not vehicle_urls:
+                self.logger.info(f"{Fore.CYAN}✓ Keine Sprechwünsche gefunden")
+                return 0
 
-            # Suche nach Sprechwunsch-Fahrzeug-Links im Funk-Panel
-            try:
-                vehicle_links = self.driver.find_elements(By.CSS_SELECTOR, "#radio_messages_important a[href*='/vehicles/']")
-                if not vehicle_links:
-                    self.logger.info(f"{Fore.CYAN}✓ Keine Sprechwünsche gefunden")
-                    return 0
-                self.logger.info(f"{Fore.YELLOW}📞 {len(vehicle_links)} Sprechwünsche im Funk-Panel gefunden")
-            except Exception as e:
-                self.logger.warning(f"{Fore.YELLOW}⚠ Fehler beim Suchen von Sprechwünschen: {e}")
+            if not self.ensure_browser():
                 return 0
 
+            if vehicle_urls:
+                self.logger.info(f"{Fore.YELLOW}📞 {len(vehicle_urls)} Sprechwünsche im Funk-Panel gefunden")
+                vehicle_urls = vehicle_urls[:5]
+            else:
+                # Panel nicht im HTML (per JavaScript gerendert) - Fallback auf den Browser
+                # Öffne die Einsatzliste und warte auf das Funk-Panel (reduziert von 10s auf 3s)
+                self.driver.get(f'{self.base_url}/')
+                WebDriverWait(self.driver, 3).until(
+                    EC.presence_of_element_located((By.ID, "radio_messages_important"))
+                )
+
+                # Suche nach Sprechwunsch-Fahrzeug-Links im Funk-Panel
+                try:
+                    vehicle_links = self.driver.find_elements(By.CSS_SELECTOR, "#radio_messages_important a[href*='/vehicles/']")
+                    if not vehicle_links:
+                        self.logger.info(f"{Fore.CYAN}✓ Keine Sprechwünsche gefunden")
+                        return 0
+                    self.logger.info(f"{Fore.YELLOW}📞 {len(vehicle_links)} Sprechwünsche im Funk-Panel gefunden")
+                except Exception as e:
+                    self.logger.warning(f"{Fore.YELLOW}⚠ Fehler beim Suchen von Sprechwünschen: {e}")
+                    return 0
+
+                # Hole die Fahrzeug-URLs aus den Links (max 5 pro Durchlauf)
+                vehicle_urls = [link.get_attribute('href') for link in vehicle_links[:5] if link.get_attribute('href')]
+
             processed = 0
-            # Hole die Fahrzeug-URLs aus den Links (max 5 pro Durchlauf)
-            vehicle_urls = [link.get_attribute('href') for link in vehicle_links[:5] if link.get_attribute('href')]
 
             # Bearbeite jeden Sprechwunsch
             for url in vehicle_urls:
@@ -2153,6 +2989,7 @@ class LeitstellenspielBot:
                     
                     self.logger.info(f"{Fore.GREEN}✓ Sprechwunsch für Fahrzeug {vehicle_id} bearbeitet (Krankenhaus ausgewählt)")
                     processed += 1
+                    self.metric_radio_messages.inc()
                     
                     # Warte bis die Aktion verarbeitet wurde (Button wird stale) (reduziert von 5s auf 2s)
                     WebDriverWait(self.driver, 2).until(EC.staleness_of(anfahren_button))
@@ -2164,6 +3001,7 @@ class LeitstellenspielBot:
 
             if processed > 0:
                 self.logger.info(f"{Fore.GREEN}✓ {processed} Sprechwünsche bearbeitet")
+                self.events.publish(RADIO_HANDLED, count=processed)
 
             return processed
 
@@ -2181,43 +3019,72 @@ class LeitstellenspielBot:
         except Exception as e:
             self.logger.warning(f"{Fore.YELLOW}⚠ Fehler beim Prüfen von Sprechwünschen: {e}")
 
-    def process_missions(self):
-        """Verarbeitet alle offenen Einsätze"""
+    def get_missing_vehicles_text(self, mission):
+        """Liefert den Fehlend-Text eines Einsatzes (API liefert Dict, JSON-String oder String)"""
+        missing_text_raw = mission.get('missing_text', '')
+
+        if isinstance(missing_text_raw, dict):
+            return missing_text_raw.get('vehicles', '') or ''
+        if isinstance(missing_text_raw, str) and missing_text_raw.strip().startswith('{'):
+            try:
+                import json
+                return json.loads(missing_text_raw).get('vehicles', '') or ''
+            except Exception:
+                pass
+        return missing_text_raw or ''
+
+    def is_mission_covered(self, mission, missing_text):
+        """Prüft ob ein Einsatz durch kürzlich alarmierte Fahrzeuge bereits versorgt ist"""
+        try:
+            needed_by_type = self.parse_missing_text(missing_text)
+        except Exception as e:
+            # Bedarf unbekannt - lieber erneut prüfen als einen offenen Einsatz übergehen
+            self.logger.debug("Einsatz %s: missing_text nicht auswertbar (%s) - nicht überspringen", mission.get('id'), e)
+            return False
+
+        covered = self.dispatch_memory.is_covered(mission, missing_text, needed_by_type)
+        self.metric_cache.inc(cache='dispatch_memory', result='hit' if covered else 'miss')
+        return covered
+
+    def remember_dispatch(self, mission, missing_text):
+        """Merkt sich die Fahrzeuge der letzten erfolgreichen Alarmierung für diesen Einsatz"""
+        if self.last_selected_by_type:
+            self.dispatch_memory.remember(mission, missing_text, self.last_selected_by_type)
+            self.logger.debug("Einsatz %s vorgemerkt: %s", mission['id'], self.last_selected_by_type)
+
+    def process_missions(self, keep_running=None):
+        """Verarbeitet alle offenen Einsätze und gibt die Anzahl bearbeiteter Einsätze zurück
+        (keep_running: optionale Funktion, bei False wird nach dem aktuellen Einsatz abgebrochen)"""
         # Bearbeite Sprechwünsche vor dem Start
         try:
-            self.logger.info(f"{Fore.MAGENTA}>>> Starte Sprechwunsch-Prüfung...")
+            self.logger.debug(">>> Starte Sprechwunsch-Prüfung...")
             self.handle_radio_messages()
-            self.logger.info(f"{Fore.MAGENTA}>>> Sprechwunsch-Prüfung abgeschlossen")
+            self.logger.debug(">>> Sprechwunsch-Prüfung abgeschlossen")
         except Exception as e:
             self.logger.error(f"{Fore.RED}Fehler beim Bearbeiten von Sprechwünschen: {e}")
             import traceback
             self.logger.error(traceback.format_exc())
 
+        # Verfügbare Fahrzeuge pro Kategorie/Wache (höchstens alle bot.fleet_refresh_interval Sekunden)
+        self.refresh_fleet()
+
         missions = self.get_missions()
 
         if not missions:
             self.logger.info(f"{Fore.CYAN}Keine offenen Einsätze gefunden")
-            return
+            return 0
 
         self.logger.info(f"{Fore.CYAN}Gefunden: {len(missions)} offene Einsätze")
 
+        # Abgeschlossene Einsätze aus dem Gedächtnis entfernen
+        self.dispatch_memory.prune(mission['id'] for mission in missions)
+
         # Filtere nur GELBE oder ROTE Einsätze mit fehlenden Fahrzeugen
         filtered_missions = []
+        skipped_covered = 0
         for mission in missions:
             icon = mission.get('icon', '')
-            missing_text_raw = mission.get('missing_text', '')
-
-            # Parse missing_text wenn es JSON/Dict ist
-            missing_text = missing_text_raw
-            if isinstance(missing_text_raw, dict):
-                missing_text = missing_text_raw.get('vehicles', '')
-            elif isinstance(missing_text_raw, str) and missing_text_raw.strip().startswith('{'):
-                try:
-                    import json
-                    missing_data = json.loads(missing_text_raw)
-                    missing_text = missing_data.get('vehicles', '')
-                except:
-                    pass
+            missing_text = self.mission_missing_text(mission)
 
             # Gelbe oder rote Einsätze (dringend)
             # Icons können _rot (deutsch) oder _red (englisch) sein
@@ -2226,30 +3093,40 @@ class LeitstellenspielBot:
             # Nur Einsätze mit fehlenden Fahrzeugen
             has_missing = missing_text and missing_text.strip()
 
-            if is_urgent and has_missing:
+            if is_urgent and has_missing and self.is_mission_covered(mission, missing_text):
+                skipped_covered += 1
+                self.logger.debug("%s  ⊘ %s - Übersprungen (Fahrzeuge bereits auf Anfahrt)", Fore.YELLOW, mission['title'])
+            elif is_urgent and has_missing:
                 filtered_missions.append(mission)
                 color = "🔴" if '_rot' in icon.lower() or '_red' in icon.lower() else "🟡"
-                self.logger.debug(f"{Fore.CYAN}  ✓ {color} {mission['title']} - Fehlend: {missing_text}")
+                self.logger.debug("%s  ✓ %s %s - Fehlend: %s", Fore.CYAN, color, mission['title'], missing_text)
             else:
                 skip_reason = []
                 if not is_urgent:
                     skip_reason.append("nicht dringend (gelb/rot)")
                 if not has_missing:
                     skip_reason.append("keine fehlenden Fahrzeuge")
-                self.logger.debug(f"{Fore.YELLOW}  ⊘ {mission['title']} - Übersprungen ({', '.join(skip_reason)})")
+                self.logger.debug("%s  ⊘ %s - Übersprungen (%s)", Fore.YELLOW, mission['title'], ', '.join(skip_reason))
+
+        if skipped_covered:
+            self.logger.info(f"{Fore.CYAN}⊘ {skipped_covered} Einsätze übersprungen (Fahrzeuge bereits auf Anfahrt)")
 
         if not filtered_missions:
             self.logger.info(f"{Fore.CYAN}Keine dringenden Einsätze mit fehlenden Fahrzeugen gefunden")
-            return
+            return 0
 
         self.logger.info(f"{Fore.GREEN}✓ {len(filtered_missions)} dringende Einsätze mit fehlenden Fahrzeugen")
 
         max_missions = self.config.get('bot', {}).get('max_missions_per_cycle', 10)
         processed = 0
+        self.set_backlog(min(len(filtered_missions), max_missions))
 
         for mission in filtered_missions[:max_missions]:
             if processed >= max_missions:
                 break
+            if keep_running and not keep_running():
+                self.logger.info(f"{Fore.YELLOW}Bearbeitung abgebrochen (Bot wird gestoppt)")
+                break
 
             mission_id = mission['id']
             mission_title = mission['title']
@@ -2260,29 +3137,29 @@ class LeitstellenspielBot:
             # Parse missing_text - DIREKT hier, SOFORT!
             missing_text = missing_text_raw
 
-            self.logger.info(f"{Fore.CYAN}>>> DEBUG: missing_text_raw = '{missing_text_raw}' (type: {type(missing_text_raw)})")
+            self.logger.debug(">>> missing_text_raw = %r", missing_text_raw)
 
             # Wenn es ein Dict ist (von der API)
             if isinstance(missing_text_raw, dict):
-                self.logger.info(f"{Fore.CYAN}>>> missing_text_raw ist Dict")
+                self.logger.debug(">>> missing_text_raw ist Dict")
                 missing_text = missing_text_raw.get('vehicles', '')
             # Wenn es ein JSON-String ist
             elif isinstance(missing_text_raw, str) and missing_text_raw.strip().startswith('{'):
-                self.logger.info(f"{Fore.CYAN}>>> missing_text_raw ist JSON-String")
+                self.logger.debug(">>> missing_text_raw ist JSON-String")
                 try:
                     import json
                     missing_data = json.loads(missing_text_raw)
                     missing_text = missing_data.get('vehicles', '')
-                    self.logger.info(f"{Fore.CYAN}>>> Extrahiert: vehicles = '{missing_text}'")
+                    self.logger.debug(">>> Extrahiert: vehicles = %r", missing_text)
                 except Exception as e:
                     self.logger.warning(f"{Fore.YELLOW}>>> JSON-Parse fehlgeschlagen: {e}")
                     pass
             else:
-                self.logger.info(f"{Fore.CYAN}>>> missing_text_raw ist normaler String")
+                self.logger.debug(">>> missing_text_raw ist normaler String")
 
             self.logger.info(f"{Fore.YELLOW}[{processed+1}/{min(len(filtered_missions), max_missions)}] {mission_title} (ID: {mission_id})")
             self.logger.info(f"{Fore.YELLOW}  Fehlend: {missing_text}")
-            self.logger.info(f"{Fore.CYAN}>>> missing_text nach Parsing = '{missing_text}' (type: {type(missing_text)})")
+            self.logger.debug(">>> missing_text nach Parsing = %r", missing_text)
             if patients_count > 0:
                 self.logger.info(f"{Fore.CYAN}  👤 Patienten: {patients_count}")
             elif possible_patients_count > 0:
@@ -2293,22 +3170,28 @@ class LeitstellenspielBot:
 
             if details:
                 # Alarmiere Fahrzeuge
+                # Alarmierungen zählen gegen das Budget "dispatch" (statt fester Pause danach)
                 if self.config.get('bot', {}).get('auto_dispatch', True):
-                    self.dispatch_vehicles(mission_id, mission_title, missing_text_from_api=missing_text,
-                                         patients_count=patients_count, possible_patients_count=possible_patients_count)
-                    time.sleep(self.config.get('bot', {}).get('delay_between_actions', 0.5))  # Reduziert von 2s
+                    self.rate_governor.acquire('dispatch')
+                    if self.dispatch_vehicles(mission_id, mission_title, missing_text_from_api=missing_text,
+                                              patients_count=patients_count, possible_patients_count=possible_patients_count):
+                        self.remember_dispatch(mission, missing_text)
+                        self.attribute_credits(mission)
 
                 # Behandle Nachalarmierung
                 if details['has_follow_up'] and self.config.get('bot', {}).get('auto_follow_up', True):
+                    self.rate_governor.acquire('dispatch')
                     self.handle_follow_up(mission_id)
-                    time.sleep(self.config.get('bot', {}).get('delay_between_actions', 0.5))  # Reduziert von 2s
 
                 # Prüfe nach jedem Einsatz auf neue Sprechwünsche
                 self.check_radio_messages()
 
             processed += 1
+            self.set_backlog(self.mission_backlog - 1)
 
         self.logger.info(f"{Fore.GREEN}✓ {processed} Einsätze bearbeitet")
+        self.log_stage_summary()
+        return processed
 
     def run(self):
         """Hauptschleife des Bots"""
@@ -2316,11 +3199,7 @@ class LeitstellenspielBot:
         print(f"{Fore.CYAN}  Leitstellenspiel.de Bot (Selenium)")
         print(f"{Fore.CYAN}{'='*60}\n")
 
-        # Initialisiere Browser
-        headless = self.config.get('bot', {}).get('headless_browser', True)
-        if not self.init_browser(headless=headless):
-            return
-
+        # Der Browser wird erst gestartet, wenn er gebraucht wird (Login ohne gespeicherte Session, Alarmierung)
         try:
             # Login
             if not self.login():
@@ -2329,9 +3208,12 @@ class LeitstellenspielBot:
 
             print(f"\n{Fore.GREEN}Bot läuft... (Strg+C zum Beenden)\n")
 
+            self.start_metrics_server()
+
             cycle = 0
             while True:
                 cycle += 1
+                self.begin_cycle()
                 self.logger.info(f"{Fore.MAGENTA}{'='*60}")
                 self.logger.info(f"{Fore.MAGENTA}Zyklus #{cycle} - {datetime.now().strftime('%H:%M:%S')}")
                 self.logger.info(f"{Fore.MAGENTA}{'='*60}")
@@ -2353,8 +3235,13 @@ class LeitstellenspielBot:
                     except Exception as e:
                         self.logger.debug(f"Fehler beim Update-Check: {e}")
 
-                # Verarbeite Einsätze
-                self.process_missions()
+                # Verarbeite Einsätze (Durchlauf auch bei Fehlern abschließen, sonst bleibt das Profiling aktiv)
+                try:
+                    self.process_missions()
+                    self.sample_credits()
+                finally:
+                    self.end_cycle()
+                self.close_idle_browser()
 
                 # Warte bis zum nächsten Durchlauf
                 wait_time = self.config.get('bot', {}).get('check_interval', 30)
@@ -2369,6 +3256,7 @@ class LeitstellenspielBot:
             import traceback
             self.logger.error(traceback.format_exc())
         finally:
+            self.stop_metrics_server()
             self.close_browser()
 
 
@@ -2408,6 +3296,7 @@ class BotGUI:
         self.setup_ui()
         self.update_log_display()
         self.update_stats_display()
+        self.process_events()
 
     def load_settings(self):
         """Lädt Einstellungen aus cache/settings.json oder gibt Defaults zurück"""
@@ -2604,6 +3493,7 @@ class BotGUI:
             wrap="word"
         )
         self.log_text.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        self.log_view = LogView(self.log_text, max_lines=2000)
 
     def setup_settings_tab(self):
         """Erstellt die Einstellungen-Seite"""
@@ -2843,6 +3733,7 @@ class BotGUI:
                 },
                 "headless": settings.get('headless', True),
                 "bot": {
+                    "headless_browser": settings.get('headless', True),
                     "check_interval": settings.get('check_interval', 30),
                     "max_missions_per_cycle": settings.get('max_missions', 10),
                     "auto_dispatch": settings.get('auto_dispatch', True),
@@ -2881,11 +3772,13 @@ class BotGUI:
                         # Entferne ANSI-Farbcodes
                         import re
                         msg = re.sub(r'\x1b\[[0-9;]*m', '', msg)
-                        self.gui_callback(msg)
+                        self.gui_callback(msg, record.levelno)
                     except:
                         pass
 
             gui_handler = GUILogHandler(self.add_log)
+            # Level am Handler - der Logger bleibt auf dem konfigurierten Level (kein DEBUG-Aufwand im Bot-Thread)
+            gui_handler.setLevel(self.bot.logger.getEffectiveLevel())
             gui_handler.setFormatter(logging.Formatter('%(message)s'))
             self.bot.logger.addHandler(gui_handler)
 
@@ -2893,22 +3786,7 @@ class BotGUI:
             self.add_log(f"Headless: {'Ja' if settings.get('headless', True) else 'Nein'}")
             self.add_log(f"Intervall: {settings.get('check_interval', 30)}s")
 
-            # Initialisiere Browser
-            self.add_log("Starte Browser...")
-            headless = settings.get('headless', True)
-
-            try:
-                if not self.bot.init_browser(headless=headless):
-                    self.add_log("FEHLER: Browser konnte nicht gestartet werden!")
-                    self.add_log("Tipp: Installiere Chrome oder Firefox")
-                    self.stop_bot()
-                    return
-            except Exception as e:
-                self.add_log(f"FEHLER beim Browser-Start: {str(e)}")
-                self.stop_bot()
-                return
-
-            self.add_log("Browser gestartet!")
+            # Browser wird erst bei Bedarf gestartet (Login ohne gespeicherte Session, Alarmierung)
 
             # Login
             self.add_log("Versuche Login...")
@@ -2954,155 +3832,65 @@ class BotGUI:
                 self.add_log(f"FEHLER beim Laden der API-Daten: {str(e)}")
                 # Weiter machen, auch wenn API-Daten nicht geladen werden konnten
 
-            # Hole Start-Credits
+            # Start-Credits (Ausgangswert für credits_earned)
             start_credits = self.bot.get_credits()
             if start_credits is not None:
                 self.add_log(f"Start-Credits: {start_credits:,}")
-                self.stats['start_credits'] = start_credits
-            else:
-                self.stats['start_credits'] = 0
 
             # Hauptschleife
+            self.bot.start_metrics_server()
             cycle = 0
             while self.running:
                 cycle += 1
+                self.bot.begin_cycle()
                 self.add_log(f"\n=== Zyklus #{cycle} ===")
 
                 try:
-                    # Update-Check (alle 10 Zyklen = ca. alle 5 Minuten bei 30s Intervall)
-                    if cycle % 10 == 0 and settings.get('auto_update', True):
-                        try:
-                            self.add_log("🔄 Prüfe auf Updates...")
-                            has_update, version, release_data = self.bot.check_for_updates()
-                            if has_update:
-                                self.add_log(f"🆕 Update verfügbar: Version {version}")
-                                self.add_log("🔄 Starte automatisches Update...")
-                                if self.bot.auto_update(release_data):
-                                    self.add_log("✓ Update erfolgreich - Bot wird neu gestartet...")
-                                    # Der Bot wird automatisch neu gestartet
-                                    return
-                                else:
-                                    self.add_log("⚠ Update fehlgeschlagen - fahre mit alter Version fort")
-                        except Exception as e:
-                            self.add_log(f"⚠ Update-Check Fehler: {e}")
-
-                    # Session-Check (alle 5 Zyklen)
-                    if cycle % 5 == 0:
-                        if not self.bot.ensure_logged_in():
-                            self.add_log("⚠ Session-Check fehlgeschlagen - stoppe Bot")
-                            self.stop_bot()
-                            break
-
-                    # SPRECHWUNSCH-PRÜFUNG VOR EINSÄTZEN
                     try:
-                        self.add_log(">>> Starte Sprechwunsch-Prüfung...")
-                        self.bot.handle_radio_messages()
-                        self.add_log(">>> Sprechwunsch-Prüfung abgeschlossen")
-                    except Exception as e:
-                        self.add_log(f"FEHLER beim Bearbeiten von Sprechwünschen: {e}")
-
-                    # Hole Einsätze
-                    missions = self.bot.get_missions()
-                    self.add_log(f"Gefunden: {len(missions)} offene Einsätze")
-
-                    if len(missions) == 0:
-                        self.add_log("Keine Einsaetze vorhanden")
-                    else:
-                        # Bearbeite Einsätze
-                        max_missions = self.bot.config.get('bot', {}).get('max_missions_per_cycle', 10)
+                        # Update-Check (alle 10 Zyklen = ca. alle 5 Minuten bei 30s Intervall)
+                        if cycle % 10 == 0 and settings.get('auto_update', True):
+                            try:
+                                self.add_log("🔄 Prüfe auf Updates...")
+                                has_update, version, release_data = self.bot.check_for_updates()
+                                if has_update:
+                                    self.add_log(f"🆕 Update verfügbar: Version {version}")
+                                    self.add_log("🔄 Starte automatisches Update...")
+                                    if self.bot.auto_update(release_data):
+                                        self.add_log("✓ Update erfolgreich - Bot wird neu gestartet...")
+                                        # Der Bot wird automatisch neu gestartet
+                                        return
+                                    else:
+                                        self.add_log("⚠ Update fehlgeschlagen - fahre mit alter Version fort")
+                            except Exception as e:
+                                self.add_log(f"⚠ Update-Check Fehler: {e}")
 
-                        for i, mission in enumerate(missions[:max_missions], 1):
-                            if not self.running:
+                        # Session-Check (alle 5 Zyklen)
+                        if cycle % 5 == 0:
+                            if not self.bot.ensure_logged_in():
+                                self.add_log("⚠ Session-Check fehlgeschlagen - stoppe Bot")
+                                self.stop_bot()
                                 break
 
-                            title = mission.get('title', 'Unbekannt')
-                            mission_id = mission.get('id')
-
-                            self.add_log(f"[{i}/{min(len(missions), max_missions)}] {title} (ID: {mission_id})")
-
-                            # Prüfe ob Einsatz Fahrzeuge braucht
-                            missing_text_raw = mission.get('missing_text', '')
-                            patients_count = mission.get('patients_count', 0)
-                            possible_patients_count = mission.get('possible_patients_count', 0)
-
-                            # DEBUG: Schreibe in Datei
-                            with open('debug_missing_text.txt', 'a', encoding='utf-8') as f:
-                                f.write(f"\n=== Mission {mission.get('id')} ===\n")
-                                f.write(f"missing_text_raw type: {type(missing_text_raw)}\n")
-                                f.write(f"missing_text_raw value: {missing_text_raw}\n")
-                                if isinstance(missing_text_raw, dict):
-                                    f.write(f"IS DICT! Keys: {missing_text_raw.keys()}\n")
-                                    f.write(f"vehicles value: {missing_text_raw.get('vehicles', 'NOT FOUND')}\n")
-
-                            # Parse missing_text - extrahiere 'vehicles' aus JSON/Dict
-                            if isinstance(missing_text_raw, dict):
-                                missing_text = missing_text_raw.get('vehicles', '')
-                            elif isinstance(missing_text_raw, str) and missing_text_raw.strip().startswith('{'):
-                                try:
-                                    import json
-                                    missing_data = json.loads(missing_text_raw)
-                                    missing_text = missing_data.get('vehicles', '')
-                                except:
-                                    missing_text = missing_text_raw
-                            else:
-                                missing_text = missing_text_raw
+                        # Sprechwünsche, Einsätze und Nachalarmierung - dieselbe Schleife wie im Konsolenbetrieb,
+                        # die Statistiken kommen als Ereignisse (process_events im Tk-Thread)
+                        self.bot.process_missions(keep_running=lambda: self.running)
 
-                            if missing_text:
-                                self.add_log(f"  Fehlend: {missing_text}")
+                        # Kontostand nur alle bot.credits_interval Sekunden (Credits kommen als Ereignis)
+                        self.bot.sample_credits()
 
-                            # Bearbeite Einsatz
+                        # Gebäude-Ausbau (alle 10 Zyklen)
+                        if settings.get('auto_expand', False) and (cycle % 10 == 0):
                             try:
-                                # Hole Einsatzdetails
-                                details = self.bot.get_mission_details(mission_id)
-
-                                if details:
-                                    # Alarmiere Fahrzeuge
-                                    if self.bot.config.get('bot', {}).get('auto_dispatch', True):
-                                        self.add_log(f"  Alarmiere Fahrzeuge...")
-                                        self.bot.dispatch_vehicles(mission_id, title, missing_text_from_api=missing_text,
-                                                                 patients_count=patients_count, possible_patients_count=possible_patients_count)
-                                        self.stats['missions_processed'] += 1
-                                        time.sleep(self.bot.config.get('bot', {}).get('delay_between_actions', 0.5))  # Reduziert von 2s
-
-                                    # Behandle Nachalarmierung
-                                    if details.get('has_follow_up') and self.bot.config.get('bot', {}).get('auto_follow_up', True):
-                                        self.add_log(f"  Behandle Nachalarmierung...")
-                                        self.bot.handle_follow_up(mission_id)
-                                        time.sleep(self.bot.config.get('bot', {}).get('delay_between_actions', 0.5))  # Reduziert von 2s
-
-                                    self.add_log(f"  OK Einsatz bearbeitet")
-
-                                    # Update Credits
-                                    try:
-                                        current_credits = self.bot.get_credits()
-                                        if current_credits is not None and 'start_credits' in self.stats:
-                                            earned = current_credits - self.stats['start_credits']
-                                            self.stats['credits_earned'] = earned
-                                    except Exception as e:
-                                        pass  # Ignoriere Fehler beim Credits-Update
-
-                                    # SPRECHWUNSCH-PRÜFUNG NACH JEDEM EINSATZ
-                                    try:
-                                        self.add_log("  🔍 Prüfe auf Sprechwünsche...")
-                                        self.bot.handle_radio_messages()
-                                    except Exception as e:
-                                        self.add_log(f"  ⚠ Fehler bei Sprechwunsch-Prüfung: {e}")
-                                else:
-                                    self.add_log(f"  SKIP Keine Details verfuegbar")
-
+                                self.add_log("🏗️ Prüfe Gebäude-Ausbau...")
+                                self.bot.auto_expand_buildings()
                             except Exception as e:
-                                self.add_log(f"  FEHLER: {str(e)}")
+                                self.add_log(f"⚠ Fehler beim Gebäude-Ausbau: {e}")
+                    finally:
+                        # Roundtrips des Zyklus - auch nach einem Fehler, sonst bleibt das Profiling aktiv
+                        self.bot.end_cycle()
 
-                            # Kurze Pause zwischen Einsätzen
-                            time.sleep(0.3)  # Reduziert von 2s
-
-                    # Gebäude-Ausbau (alle 10 Zyklen)
-                    if settings.get('auto_expand', False) and (cycle % 10 == 0):
-                        try:
-                            self.add_log("🏗️ Prüfe Gebäude-Ausbau...")
-                            self.bot.auto_expand_buildings()
-                        except Exception as e:
-                            self.add_log(f"⚠ Fehler beim Gebäude-Ausbau: {e}")
+                    # Ungenutzten Browser freigeben (wird bei Bedarf neu gestartet)
+                    self.bot.close_idle_browser()
 
                     # Warte bis zum nächsten Durchlauf
                     wait_time = self.bot.config.get('check_interval', 30)
@@ -3125,28 +3913,57 @@ class BotGUI:
             self.add_log(traceback.format_exc())
             self.stop_bot()
         finally:
-            if self.bot and self.bot.driver:
+            if self.bot:
+                self.bot.stop_metrics_server()
+            if self.bot:
+                # Auch den Standby-Browser beenden und Seiten-Statistik/Driver-Cache sichern
+                had_browser = self.bot.driver is not None
                 try:
-                    self.bot.driver.quit()
-                    self.add_log("Browser geschlossen")
+                    self.bot.close_browser()
+                    if had_browser:
+                        self.add_log("Browser geschlossen")
                 except:
                     pass
 
-    def add_log(self, message):
-        """Fügt eine Log-Nachricht hinzu"""
+    def process_events(self):
+        """Übernimmt die Ereignisse des Bot-Threads gesammelt in die Statistiken (läuft im Tk-Thread)"""
+        try:
+            if self.bot:
+                for event in self.bot.events.drain():
+                    self.apply_event(event)
+        except Exception:
+            pass
+
+        # Wiederhole alle 250ms
+        self.root.after(250, self.process_events)
+
+    def apply_event(self, event):
+        """Verbucht ein einzelnes Bot-Ereignis"""
+        data = event.data
+        if event.kind in (MISSION_DISPATCHED, MISSION_FAILED):
+            self.stats['missions_processed'] += 1
+            if event.kind == MISSION_DISPATCHED:
+                self.stats['vehicles_dispatched'] += data.get('vehicles', 0)
+        elif event.kind == CREDITS_UPDATED:
+            self.stats['credits_earned'] = data['earned']
+
+    def add_log(self, message, level=None):
+        """Fügt eine Log-Nachricht hinzu (level = Logging-Level, sonst aus dem Text geschätzt)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
-        self.log_queue.put(log_message)
+        if level is None:
+            level = guess_level(message)
+        for line in str(message).strip('\n').split('\n'):
+            self.log_queue.put((level, f"[{timestamp}] {line}"))
 
     def update_log_display(self):
-        """Aktualisiert die Log-Anzeige"""
+        """Aktualisiert die Log-Anzeige - alle neuen Zeilen mit einem Insert pro Tick"""
         try:
-            while True:
-                message = self.log_queue.get_nowait()
-                self.log_text.insert("end", message)
-                self.log_text.see("end")
+            for _ in range(2000):
+                level, line = self.log_queue.get_nowait()
+                self.log_view.add(line, level)
         except queue.Empty:
             pass
+        self.log_view.flush()
 
         # Wiederhole alle 100ms
         self.root.after(100, self.update_log_display)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Credits ohne Abfrage pro Einsatz
+Der Kontostand wird nur in festen Abständen (bot.credits_interval) oder
+nebenbei bei ohnehin laufenden /api/credits-Aufrufen übernommen. Dazwischen
+wird jeder erfolgreich alarmierte Einsatz mit seinen durchschnittlichen
+Credits aus der Einsatz-Datenbank (average_credits) geschätzt; beim nächsten
+echten Kontostand wird die Schätzung abgeglichen.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CreditTracker:
+    def __init__(self, interval=300, max_missions=5000):
+        """interval = Sekunden zwischen zwei Abfragen des Kontostands"""
+        self.interval = interval
+        self.max_missions = max_missions
+        self.start_balance = None
+        self.balance = None
+        self.sampled_at = None
+        self.pending = 0             # Geschätzte Credits seit dem letzten Kontostand
+        self.pending_missions = 0
+        self.estimated_total = 0     # Alle Schätzungen seit dem Start
+        self.attributed = OrderedDict()  # Einsatz-ID -> geschätzte Credits (jeder Einsatz nur einmal)
+        self.lock = threading.Lock()
+
+    def due(self):
+        """True wenn der Kontostand (erneut) abgefragt werden sollte"""
+        return self.sampled_at is None or time.time() - self.sampled_at >= self.interval
+
+    def attribute(self, mission_id, credits):
+        """Verbucht die geschätzten Credits eines alarmierten Einsatzes - liefert False wenn schon verbucht"""
+        with self.lock:
+            if mission_id in self.attributed:
+                return False
+            self.attributed[mission_id] = credits
+            if len(self.attributed) > self.max_missions:
+                self.attributed.popitem(last=False)
+            self.pending += credits
+            self.pending_missions += 1
+            self.estimated_total += credits
+            return True
+
+    def sample(self, balance):
+        """Übernimmt einen echten Kontostand und liefert den Abgleich seit dem letzten Stand
+        (None beim ersten Stand)"""
+        with self.lock:
+            previous = self.balance
+            result = None
+            if previous is None:
+                self.start_balance = balance
+            else:
+                result = {
+                    'actual': balance - previous,
+                    'estimated': self.pending,
+                    'missions': self.pending_missions,
+                    'seconds': time.time() - self.sampled_at,
+                }
+            self.balance = balance
+            self.sampled_at = time.time()
+            self.pending = 0
+            self.pending_missions = 0
+            return result
+
+    @property
+    def earned(self):
+        """Verdiente Credits seit dem Start: letzter echter Stand plus Schätzung seither"""
+        with self.lock:
+            if self.start_balance is None:
+                return self.pending
+            return self.balance - self.start_balance + self.pending
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ablage für Debug-Dateien (Seitenquelltexte, API-Antworten)
+Schreibt im Hintergrund gzip-komprimiert nach cache/debug/, überspringt
+identische Inhalte (SHA-1) und hält Anzahl und Gesamtgröße der Dateien in
+einem festen Rahmen - die ältesten Dateien werden zuerst gelöscht.
+"""
+
+import gzip
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+
+
+class DebugStore:
+    def __init__(self, directory, enabled=False, max_files=50, max_bytes=20 * 1024 * 1024):
+        """Initialisiert die Ablage (enabled=False: capture() tut nichts)"""
+        self.directory = directory
+        self.enabled = enabled
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.digests = set()
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+            # Hashes bereits gespeicherter Dateien stehen im Dateinamen
+            for name in os.listdir(self.directory):
+                match = re.search(r'_([0-9a-f]{12})\.[^.]+\.gz$', name)
+                if match:
+                    self.digests.add(match.group(1))
+
+    def capture(self, name, content):
+        """Merkt content zum Speichern vor und liefert den Zielpfad (None wenn aus oder bereits vorhanden)"""
+        if not self.enabled or content is None:
+            return None
+
+        data = content.encode('utf-8', errors='replace') if isinstance(content, str) else bytes(content)
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        with self.lock:
+            if digest in self.digests:
+                return None
+            self.digests.add(digest)
+            self.start()
+
+        stem, ext = os.path.splitext(re.sub(r'[^\w.-]', '_', name))
+        filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{stem}_{digest}{ext or '.txt'}.gz"
+        path = os.path.join(self.directory, filename)
+        self.queue.put((path, data))
+        return path
+
+    def start(self):
+        """Startet den Schreib-Thread (einmalig)"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.writer, name='debug-store', daemon=True)
+            self.thread.start()
+
+    def writer(self):
+        """Hintergrund-Thread: komprimiert, schreibt und hält das Budget ein"""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                temp_path = path + '.tmp'
+                with gzip.open(temp_path, 'wb', compresslevel=6) as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                self.enforce_budget()
+            except Exception:
+                pass
+            finally:
+                self.queue.task_done()
+
+    def enforce_budget(self):
+        """Löscht die ältesten Dateien, bis Anzahl und Größe im Rahmen sind"""
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.gz'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name, path))
+
+        files.sort()
+        total = sum(size for _, size, _, _ in files)
+        while files and (len(files) > self.max_files or total > self.max_bytes):
+            _, size, name, path = files.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            match = re.search(r'_([0-9a-f]{12})\.[^.]+\.gz$', name)
+            if match:
+                with self.lock:
+                    self.digests.discard(match.group(1))
+
+    def flush(self, timeout=5):
+        """Wartet bis alle vorgemerkten Dateien geschrieben sind"""
+        if self.thread is None:
+            return
+        deadline = time.time() + timeout
+        while self.queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
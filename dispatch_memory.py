@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kurzzeit-Gedächtnis für alarmierte Einsätze
+Merkt sich pro Einsatz, was wann geschickt wurde, damit Einsätze mit
+anfahrenden Fahrzeugen nicht in jedem Zyklus erneut geöffnet werden.
+"""
+
+import time
+
+
+class DispatchMemory:
+    def __init__(self, ttl_seconds=300):
+        """Initialisiert das Gedächtnis (ttl_seconds = wie lange ein Eintrag gilt)"""
+        self.ttl_seconds = ttl_seconds
+        self.entries = {}  # mission_id -> {'sent': {...}, 'marker': (...), 'timestamp': float}
+
+    @staticmethod
+    def marker_state(mission, missing_text):
+        """Bildet den Marker-Zustand eines Einsatzes (Icon, Fahrzeugstatus, Fehlend-Text)"""
+        return (
+            mission.get('icon', ''),
+            mission.get('vehicle_state', 0),
+            (missing_text or '').strip()
+        )
+
+    def remember(self, mission, missing_text, sent_by_type):
+        """Speichert eine erfolgreiche Alarmierung"""
+        if not sent_by_type:
+            return
+
+        # Der Marker wechselt durch die Alarmierung selbst (rot -> gelb), daher wird
+        # der Vergleichszustand erst beim nächsten Abruf der Einsatzliste festgehalten
+        self.entries[str(mission['id'])] = {
+            'sent': dict(sent_by_type),
+            'marker': None,
+            'timestamp': time.time()
+        }
+
+    def forget(self, mission_id):
+        """Entfernt einen Einsatz aus dem Gedächtnis"""
+        self.entries.pop(str(mission_id), None)
+
+    def is_covered(self, mission, missing_text, needed_by_type):
+        """Prüft ob der fehlende Bedarf bereits durch anfahrende Fahrzeuge gedeckt ist
+
+        Ein Eintrag verfällt nach Ablauf der TTL oder sobald sich der
+        Marker-Zustand des Einsatzes ändert.
+        """
+        entry = self.entries.get(str(mission['id']))
+        if not entry:
+            return False
+
+        if time.time() - entry['timestamp'] > self.ttl_seconds:
+            self.forget(mission['id'])
+            return False
+
+        marker = self.marker_state(mission, missing_text)
+        if entry['marker'] is None:
+            entry['marker'] = marker
+        elif entry['marker'] != marker:
+            self.forget(mission['id'])
+            return False
+
+        # Ohne erkennbaren Bedarf lässt sich nichts vergleichen - gleicher Marker reicht
+        if not needed_by_type:
+            return True
+
+        sent = entry['sent']
+        return all(sent.get(vtype, 0) >= count for vtype, count in needed_by_type.items())
+
+    def prune(self, open_mission_ids=None):
+        """Entfernt abgelaufene und nicht mehr offene Einsätze"""
+        now = time.time()
+        open_ids = {str(mid) for mid in open_mission_ids} if open_mission_ids is not None else None
+
+        for mission_id in list(self.entries.keys()):
+            entry = self.entries[mission_id]
+            if now - entry['timestamp'] > self.ttl_seconds:
+                del self.entries[mission_id]
+            elif open_ids is not None and mission_id not in open_ids:
+                del self.entries[mission_id]
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache für die WebDriver-Auflösung
+Merkt sich, welcher Browser funktioniert, wo der passende Treiber liegt und
+welche Versionen zuletzt liefen. Spätere Starts gehen direkt zum
+funktionierenden Browser - ohne webdriver-manager-Abfrage und ohne Probieren.
+Schreibzugriffe sind per Lock geschützt (der Standby-Browser startet im Hintergrund).
+"""
+
+import json
+import os
+import threading
+import time
+
+DEFAULT_BACKENDS = ('chrome', 'firefox')
+
+
+def major_version(version):
+    """Liefert die Hauptversion ('131.0.6778.85' -> '131')"""
+    return str(version or '').split('.')[0].strip()
+
+
+class DriverCache:
+    def __init__(self, cache_dir, failure_ttl=86400, max_age=7 * 86400):
+        """Initialisiert den Cache (failure_ttl = wie lange ein Fehlschlag gilt, max_age = Neuauflösung nach)"""
+        self.path = os.path.join(cache_dir, 'webdriver_cache.json')
+        self.failure_ttl = failure_ttl
+        self.max_age = max_age
+        self.lock = threading.RLock()
+        self.data = self.load()
+
+    def load(self):
+        """Lädt den Cache aus der Datei"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    data.setdefault('backends', {})
+                    data.setdefault('failed', {})
+                    return data
+        except Exception:
+            pass
+        return {'preferred': None, 'backends': {}, 'failed': {}}
+
+    def save(self):
+        """Speichert den Cache"""
+        with self.lock:
+            try:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(self.data, f, indent=2)
+            except Exception:
+                pass
+
+    def backend_order(self, backends=DEFAULT_BACKENDS):
+        """Reihenfolge der Browser: zuletzt funktionierender zuerst, kürzlich fehlgeschlagene zuletzt"""
+        now = time.time()
+        preferred = self.data.get('preferred')
+        ordered = sorted(backends, key=lambda b: 0 if b == preferred else 1)
+
+        working = [b for b in ordered if now - self.data['failed'].get(b, {}).get('at', 0) > self.failure_ttl]
+        failed = [b for b in ordered if b not in working]
+        return working + failed
+
+    def is_failed(self, backend):
+        """Prüft ob ein Browser kürzlich fehlgeschlagen ist"""
+        return time.time() - self.data['failed'].get(backend, {}).get('at', 0) <= self.failure_ttl
+
+    def get_driver_path(self, backend):
+        """Liefert den gecachten Treiberpfad, falls vorhanden und nicht zu alt"""
+        entry = self.data['backends'].get(backend)
+        if not entry or not entry.get('driver_path'):
+            return None
+        if not os.path.exists(entry['driver_path']):
+            return None
+        if time.time() - entry.get('resolved_at', 0) > self.max_age:
+            return None
+        return entry['driver_path']
+
+    def record_success(self, backend, driver_path, browser_version, driver_version):
+        """Merkt sich einen erfolgreichen Start
+
+        Returns:
+            bool: False wenn Browser- und Treiber-Hauptversion nicht zusammenpassen
+        """
+        with self.lock:
+            entry = self.data['backends'].get(backend, {})
+            if driver_path and driver_path != entry.get('driver_path'):
+                entry['resolved_at'] = time.time()
+            entry.update({
+                'driver_path': driver_path,
+                'browser_version': browser_version,
+                'driver_version': driver_version,
+                'last_success': time.time()
+            })
+            entry.setdefault('resolved_at', time.time())
+
+            versions_match = True
+            if backend == 'chrome' and browser_version and driver_version:
+                versions_match = major_version(browser_version) == major_version(driver_version)
+                if not versions_match:
+                    # Beim nächsten Start neu auflösen
+                    entry['driver_path'] = None
+
+            self.data['backends'][backend] = entry
+            self.data['preferred'] = backend
+            self.data['failed'].pop(backend, None)
+            self.save()
+        return versions_match
+
+    def record_failure(self, backend, error):
+        """Merkt sich einen fehlgeschlagenen Browser"""
+        with self.lock:
+            self.data['failed'][backend] = {'at': time.time(), 'error': str(error)[:300]}
+            if self.data.get('preferred') == backend:
+                self.data['preferred'] = None
+            self.save()
+
+    def invalidate(self, backend):
+        """Verwirft den gecachten Treiberpfad eines Browsers"""
+        with self.lock:
+            entry = self.data['backends'].get(backend)
+            if entry:
+                entry['driver_path'] = None
+                self.save()
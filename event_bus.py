@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ereignisse aus dem Bot-Kern
+Der Bot-Thread veröffentlicht typisierte Ereignisse (Einsatz begonnen,
+alarmiert, fehlgeschlagen, Sprechwunsch bearbeitet, Credits aktualisiert),
+das GUI holt sie gesammelt im Tk-Thread ab (root.after) und aktualisiert
+daraus seine Statistiken. publish() blockiert nie - ist die Warteschlange
+voll, wird das Ereignis verworfen und mitgezählt.
+"""
+
+import queue
+import time
+from collections import namedtuple
+
+MISSION_STARTED = 'mission_started'
+MISSION_DISPATCHED = 'mission_dispatched'
+MISSION_FAILED = 'mission_failed'
+RADIO_HANDLED = 'radio_handled'
+CREDITS_UPDATED = 'credits_updated'
+
+EVENT_KINDS = (MISSION_STARTED, MISSION_DISPATCHED, MISSION_FAILED, RADIO_HANDLED, CREDITS_UPDATED)
+
+Event = namedtuple('Event', ['kind', 'time', 'data'])
+
+
+class EventBus:
+    def __init__(self, max_size=10000):
+        """Thread-sichere Warteschlange für Bot-Ereignisse"""
+        self.queue = queue.Queue(maxsize=max_size)
+        self.dropped = 0
+
+    def publish(self, kind, **data):
+        """Veröffentlicht ein Ereignis (aus beliebigem Thread, blockiert nicht)"""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unbekannter Ereignistyp: {kind}")
+        try:
+            self.queue.put_nowait(Event(kind, time.time(), data))
+        except queue.Full:
+            self.dropped += 1
+
+    def drain(self, max_items=500):
+        """Liefert bis zu max_items wartende Ereignisse (leere Liste wenn keine da sind)"""
+        events = []
+        try:
+            while len(events) < max_items:
+                events.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return events
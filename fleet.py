@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verfügbarkeit der Fahrzeugflotte als NumPy-Spalten
+Die Fahrzeuge aus /api/vehicles werden in Spalten (ID, Typ, FMS-Status,
+Wache) abgelegt. Fragen wie "wie viele RTW, LF, FuStW sind frei und wo"
+werden über vektorisierte Zählungen beantwortet statt über Python-Schleifen.
+Bei neuen API-Daten mit unveränderter Flotte wird nur die Status-Spalte
+ersetzt, eigene Statuswechsel (set_state) werden sofort eingetragen.
+NumPy ist optional - ohne NumPy ist NUMPY_AVAILABLE False und der Bot
+verzichtet auf den Schnappschuss.
+"""
+
+import threading
+import time
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from vehicle_types import VEHICLE_TYPES
+
+# FMS 1 = einsatzbereit über Funk, 2 = einsatzbereit auf Wache (6 = außer Dienst)
+AVAILABLE_STATES = (1, 2)
+
+
+class FleetSnapshot:
+    def __init__(self, vehicle_types=VEHICLE_TYPES):
+        """Legt die Zuordnung Fahrzeugtyp -> Kategorie (vehicle_types 'short') an"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("FleetSnapshot benötigt NumPy (pip install numpy)")
+        self.categories = sorted({info['short'] for info in vehicle_types.values()})
+        category_index = {category: i for i, category in enumerate(self.categories)}
+        # Nachschlage-Tabelle Typ-ID -> Kategorie-Index (-1 = unbekannter Typ)
+        self.type_to_category = np.full(max(vehicle_types) + 1, -1, dtype=np.int16)
+        for type_id, info in vehicle_types.items():
+            self.type_to_category[type_id] = category_index[info['short']]
+
+        self.ids = np.empty(0, dtype=np.int64)        # aufsteigend sortiert
+        self.types = np.empty(0, dtype=np.int32)
+        self.states = np.empty(0, dtype=np.int8)
+        self.buildings = np.empty(0, dtype=np.int64)
+        self.category = np.empty(0, dtype=np.int16)
+        self.updated_at = None
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def update(self, vehicles):
+        """Übernimmt die Fahrzeugliste der API - liefert True bei komplettem Neuaufbau, False wenn nur Status"""
+        ids = np.fromiter((v.get('id', 0) for v in vehicles), dtype=np.int64, count=len(vehicles))
+        order = np.argsort(ids, kind='stable')
+        ids = ids[order]
+        states = np.fromiter((v.get('fms_real') or 0 for v in vehicles), dtype=np.int8, count=len(vehicles))[order]
+
+        with self.lock:
+            self.updated_at = time.time()
+            if np.array_equal(ids, self.ids):
+                self.states = states
+                return False
+
+            types = np.fromiter((v.get('vehicle_type') or 0 for v in vehicles), dtype=np.int32, count=len(vehicles))[order]
+            self.ids = ids
+            self.states = states
+            self.types = types
+            self.buildings = np.fromiter((v.get('building_id') or 0 for v in vehicles), dtype=np.int64,
+                                         count=len(vehicles))[order]
+            known = (types >= 0) & (types < len(self.type_to_category))
+            self.category = np.where(known, self.type_to_category[np.clip(types, 0, len(self.type_to_category) - 1)], -1)
+            return True
+
+    def set_state(self, vehicle_id, state):
+        """Trägt einen eigenen Statuswechsel ein (z.B. Status 6 bei Personalmangel)"""
+        with self.lock:
+            index = np.searchsorted(self.ids, int(vehicle_id))
+            if index < len(self.ids) and self.ids[index] == int(vehicle_id):
+                self.states[index] = state
+                return True
+        return False
+
+    def available_mask(self):
+        return np.isin(self.states, AVAILABLE_STATES)
+
+    def available_by_category(self):
+        """{Kategorie: Anzahl verfügbarer Fahrzeuge} (nur Kategorien mit mindestens einem Fahrzeug)"""
+        with self.lock:
+            mask = self.available_mask() & (self.category >= 0)
+            counts = np.bincount(self.category[mask], minlength=len(self.categories))
+        return {self.categories[i]: int(counts[i]) for i in np.nonzero(counts)[0]}
+
+    def available_by_building(self, categories=None):
+        """{Wache: {Kategorie: Anzahl}} der verfügbaren Fahrzeuge (optional nur bestimmte Kategorien)"""
+        with self.lock:
+            mask = self.available_mask() & (self.category >= 0)
+            if categories is not None:
+                wanted = [self.categories.index(c) for c in categories if c in self.categories]
+                mask &= np.isin(self.category, wanted)
+            buildings, building_index = np.unique(self.buildings[mask], return_inverse=True)
+            width = len(self.categories)
+            counts = np.bincount(building_index * width + self.category[mask],
+                                 minlength=len(buildings) * width).reshape(len(buildings), width)
+
+        result = {}
+        for row, column in zip(*np.nonzero(counts)):
+            result.setdefault(int(buildings[row]), {})[self.categories[column]] = int(counts[row, column])
+        return result
+
+    def available_ids(self, category, building_id=None):
+        """IDs der verfügbaren Fahrzeuge einer Kategorie (optional nur einer Wache)"""
+        if category not in self.categories:
+            return []
+        with self.lock:
+            mask = self.available_mask() & (self.category == self.categories.index(category))
+            if building_id is not None:
+                mask &= self.buildings == int(building_id)
+            return self.ids[mask].tolist()
+
+    def summary(self, categories=('RTW', 'LF', 'FuStW')):
+        """Kurztext der verfügbaren Fahrzeuge für das Log"""
+        counts = self.available_by_category()
+        return ', '.join(f"{counts.get(category, 0)} {category}" for category in categories)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Räumlicher Index der Wachen
+Wachen aus /api/buildings liegen in einem gleichmäßigen Gitter (Zellen von
+cell_km Kantenlänge). Die nächsten Wachen zu einem Einsatz werden ringweise
+um dessen Zelle gesucht, statt alle Wachen zu vergleichen. Zum Sortieren der
+Fahrzeuge (Zuordnung Fahrzeug -> Wache aus /api/vehicles) sortiert rank_vehicles
+die Kandidaten-Wachen direkt. Nur wenn viele Wachen in Frage kommen, aber wenige
+Fahrzeuge gebraucht werden, holt es per Ringsuche nur die nächsten Wachen - die
+Anfahrtszeit begrenzt, wie schnell Einsätze fertig werden.
+"""
+
+import math
+import threading
+from collections import defaultdict
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+DIRECT_SORT_LIMIT = 64  # bis zu so vielen Kandidaten-Wachen immer direkt sortieren
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Luftlinie zwischen zwei Koordinaten (Haversine)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def coordinates(item):
+    """(lat, lon) aus einem API-Objekt oder None"""
+    try:
+        lat, lon = float(item.get('latitude')), float(item.get('longitude'))
+    except (TypeError, ValueError):
+        return None
+    if lat == 0 and lon == 0:
+        return None
+    return lat, lon
+
+
+class GeoIndex:
+    def __init__(self, cell_km=10):
+        """cell_km = Kantenlänge einer Gitterzelle"""
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.cells = defaultdict(list)   # (Zeile, Spalte) -> [(Wache, lat, lon)]
+        self.positions = {}              # Wache -> (lat, lon)
+        self.vehicle_building = {}       # Fahrzeug -> Wache
+        self.rows = (0, 0)
+        self.columns = (0, 0)
+        self.lock = threading.Lock()
+
+    def cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def set_buildings(self, buildings):
+        """Baut das Gitter aus der Gebäudeliste der API neu auf"""
+        cells = defaultdict(list)
+        positions = {}
+        for building in buildings:
+            position = coordinates(building)
+            if position is None or building.get('id') is None:
+                continue
+            positions[building['id']] = position
+            cells[self.cell(*position)].append((building['id'], position[0], position[1]))
+
+        with self.lock:
+            self.cells = cells
+            self.positions = positions
+            if cells:
+                self.rows = (min(r for r, _ in cells), max(r for r, _ in cells))
+                self.columns = (min(c for _, c in cells), max(c for _, c in cells))
+
+    def set_vehicles(self, vehicles):
+        """Übernimmt die Zuordnung Fahrzeug -> Wache aus der Fahrzeugliste der API"""
+        mapping = {str(v['id']): v.get('building_id') for v in vehicles if v.get('id') is not None}
+        with self.lock:
+            self.vehicle_building = mapping
+
+    def nearest_buildings(self, lat, lon, limit=10, max_km=None, building_ids=None):
+        """Die limit nächsten Wachen als [(Entfernung km, Wache)], aufsteigend (building_ids = nur diese Wachen)"""
+        wanted = None
+        if building_ids is not None:
+            wanted = set(building_ids)
+            limit = min(limit, len(wanted))
+            if not limit:
+                return []
+        with self.lock:
+            if not self.cells:
+                return []
+            row, column = self.cell(lat, lon)
+            max_ring = max(abs(row - self.rows[0]), abs(row - self.rows[1]),
+                           abs(column - self.columns[0]), abs(column - self.columns[1]))
+
+            found = []
+            for ring in range(max_ring + 1):
+                # Noch nicht durchsuchte Wachen sind mindestens ring - 1 volle Zellen entfernt
+                bound = self.ring_distance_km(lat, ring)
+                if len(found) >= limit and found[limit - 1][0] <= bound:
+                    break
+                if wanted is not None and len(found) == len(wanted):
+                    break  # alle gesuchten Wachen gefunden
+                if max_km is not None and bound > max_km:
+                    break
+                for cell in self.ring_cells(row, column, ring):
+                    for building_id, b_lat, b_lon in self.cells.get(cell, ()):
+                        if wanted is not None and building_id not in wanted:
+                            continue
+                        found.append((distance_km(lat, lon, b_lat, b_lon), building_id))
+                found.sort()
+
+        if max_km is not None:
+            found = [entry for entry in found if entry[0] <= max_km]
+        return found[:limit]
+
+    @staticmethod
+    def ring_cells(row, column, ring):
+        """Zellen auf dem Rand des Quadrats mit Abstand ring (nur der Rand, 8 * ring Zellen)"""
+        if ring == 0:
+            yield row, column
+            return
+        for c in range(column - ring, column + ring + 1):
+            yield row - ring, c
+            yield row + ring, c
+        for r in range(row - ring + 1, row + ring):
+            yield r, column - ring
+            yield r, column + ring
+
+    def ring_distance_km(self, lat, ring):
+        """Untergrenze der Entfernung zu Wachen ab Ring ring (Längengrade werden zu den Polen hin schmaler)"""
+        if ring <= 1:
+            return 0.0
+        widest_lat = min(abs(lat) + ring * self.cell_deg, 89.0)
+        return 0.99 * (ring - 1) * self.cell_deg * KM_PER_DEGREE * math.cos(math.radians(widest_lat))
+
+    def vehicle_distance(self, vehicle_id, lat, lon):
+        """Entfernung der Wache eines Fahrzeugs zum Einsatz (None wenn unbekannt)"""
+        position = self.positions.get(self.vehicle_building.get(str(vehicle_id)))
+        if position is None:
+            return None
+        return distance_km(lat, lon, *position)
+
+    def rank_vehicles(self, vehicle_ids, lat, lon, needed=None):
+        """Sortiert Fahrzeug-IDs nach Entfernung ihrer Wache zum Einsatz
+
+        needed = Anzahl benötigter Fahrzeuge: bei vielen Kandidaten-Wachen werden nur die 2 * needed
+        nächsten per Ringsuche bestimmt, die übrigen folgen in übergebener Reihenfolge. Fahrzeuge
+        derselben Wache und solche ohne bekannte Wache behalten die übergebene Reihenfolge,
+        letztere stehen am Ende.
+        """
+        by_building = {}
+        unknown = []
+        for vehicle_id in vehicle_ids:
+            building_id = self.vehicle_building.get(str(vehicle_id))
+            if building_id in self.positions:
+                by_building.setdefault(building_id, []).append(vehicle_id)
+            else:
+                unknown.append(vehicle_id)
+
+        ranked = []
+        if needed is not None and len(by_building) > max(DIRECT_SORT_LIMIT, 2 * needed):
+            # Jede Kandidaten-Wache hat mindestens ein Fahrzeug - die 2 * needed nächsten reichen
+            nearest = self.nearest_buildings(lat, lon, limit=2 * needed, building_ids=by_building)
+        else:
+            # Vollständige Sortierung: direkt ist schneller als jede Ringsuche über alle Wachen
+            nearest = sorted((distance_km(lat, lon, *self.positions[building_id]), building_id)
+                             for building_id in by_building)
+        for _, building_id in nearest:
+            ranked.extend(by_building.pop(building_id))
+        # Übrige bzw. zwischen zwei Aufrufen neu geladene Wachen - in übergebener Reihenfolge ans Ende
+        remaining = [vehicle_id for vehicle_id in vehicle_ids
+                     if self.vehicle_building.get(str(vehicle_id)) in by_building]
+        return ranked + remaining + unknown
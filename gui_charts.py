@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Live-Diagramme für das GUI
+Einfache Verlaufslinien (Sparklines) auf einem Tk-Canvas - ohne matplotlib.
+Werte werden mit fester Rate aus bot.metrics_snapshot() nachgeschoben.
+"""
+
+import tkinter as tk
+from collections import deque
+
+import customtkinter as ctk
+
+
+class Sparkline(ctk.CTkFrame):
+    def __init__(self, parent, title, unit='', colors=('#3498db',), labels=None, max_points=150, height=90):
+        """Diagramm mit einer oder mehreren Linien (colors/labels je Linie)"""
+        super().__init__(parent)
+        self.unit = unit
+        self.colors = colors
+        self.labels = labels or [''] * len(colors)
+        self.series = [deque(maxlen=max_points) for _ in colors]
+        self.max_points = max_points
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", padx=10, pady=(8, 0))
+        ctk.CTkLabel(header, text=title, font=ctk.CTkFont(size=13, weight="bold")).pack(side="left")
+        self.value_label = ctk.CTkLabel(header, text="-", font=ctk.CTkFont(size=13))
+        self.value_label.pack(side="right")
+
+        self.canvas = tk.Canvas(self, height=height, bg="#1e1e1e", highlightthickness=0)
+        self.canvas.pack(fill="x", expand=True, padx=10, pady=(4, 10))
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+
+    def push(self, *values):
+        """Hängt je Linie einen Wert an (None = Lücke, wird als 0 gezeichnet)"""
+        for series, value in zip(self.series, values):
+            series.append(value if value is not None else 0)
+
+        parts = []
+        for label, value in zip(self.labels, values):
+            text = '-' if value is None else f"{value:,.1f}".rstrip('0').rstrip('.')
+            parts.append(f"{label} {text}".strip())
+        self.value_label.configure(text=' / '.join(parts) + (f' {self.unit}' if self.unit else ''))
+        self.redraw()
+
+    def redraw(self):
+        """Zeichnet alle Linien neu (höchstens max_points Punkte je Linie)"""
+        canvas = self.canvas
+        canvas.delete('all')
+        width = max(canvas.winfo_width(), 10)
+        height = max(canvas.winfo_height(), 10)
+
+        peak = max((max(series) for series in self.series if series), default=0)
+        if peak <= 0:
+            peak = 1
+        canvas.create_text(4, 2, text=f"{peak:,.0f}", anchor='nw', fill='#7f8c8d', font=('Consolas', 8))
+
+        step = width / max(self.max_points - 1, 1)
+        for series, color in zip(self.series, self.colors):
+            if len(series) < 2:
+                continue
+            offset = self.max_points - len(series)
+            points = []
+            for i, value in enumerate(series):
+                points.append((offset + i) * step)
+                points.append(height - 4 - (value / peak) * (height - 14))
+            canvas.create_line(*points, fill=color, width=2)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemeinsamer HTTP-Client des Bots
+requests-Session mit fester Poolgröße und Keep-Alive, Timeouts pro Endpunkt,
+Wiederholung mit Backoff und Zufallsanteil (nur für idempotente Anfragen wie
+GET, bei Verbindungsfehlern, 429 und 5xx) sowie gzip/brotli-Kompression.
+Einstellungen unter "game" in config.json: timeout, max_retries, pool_size, timeouts.
+"""
+
+import random
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401 - urllib3 entpackt "br" nur mit installiertem brotli
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+# Timeouts in Sekunden nach Pfad-Präfix (der längste passende Präfix gewinnt)
+DEFAULT_TIMEOUTS = {
+    '/api/credits': 5,
+    '/api/': 20,
+    '/map/': 15,
+    '/missions/': 15,
+    '/vehicles/': 10,
+    '/einsaetze.json': 60,
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class JitterRetry(Retry):
+    """Exponentieller Backoff mit Zufallsanteil - parallele Bots wiederholen nicht im Gleichschritt"""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, backoff) if backoff > 0 else 0
+
+
+class BotSession(requests.Session):
+    def __init__(self, timeout=30, max_retries=3, pool_size=10, timeouts=None, backoff_factor=0.5):
+        """timeout = Standard-Timeout in Sekunden, timeouts = {Pfad-Präfix: Sekunden} zusätzlich zu DEFAULT_TIMEOUTS"""
+        super().__init__()
+        self.timeout = timeout
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+
+        retry = JitterRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # kein POST - Alarmierungen nie doppelt senden
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+        self.headers.update({
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+        })
+
+    def timeout_for(self, url):
+        """Timeout für eine URL anhand des Pfad-Präfixes"""
+        path = urlsplit(url).path
+        best = None
+        for prefix in self.timeouts:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.timeouts[best] if best else self.timeout
+
+    def request(self, method, url, *args, **kwargs):
+        """Wie requests.Session.request, aber immer mit Timeout"""
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout_for(url)
+        return super().request(method, url, *args, **kwargs)
+
+
+def create_session(game_config=None):
+    """BotSession mit den Einstellungen aus dem "game"-Abschnitt der Config"""
+    game_config = game_config or {}
+    return BotSession(
+        timeout=game_config.get('timeout', 30),
+        max_retries=game_config.get('max_retries', 3),
+        pool_size=game_config.get('pool_size', 10),
+        timeouts=game_config.get('timeouts'),
+    )
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zeitmessung der Alarmierungs-Phasen und Zählung der Roundtrips
+Misst pro Einsatz die Dauer der einzelnen Phasen von dispatch_vehicles()
+(Seite laden, weitere Fahrzeuge laden, Anforderungen, Auswahl, Alarmieren,
+Ergebnis prüfen, Status 6), schreibt je Einsatz einen JSON-Datensatz (im
+Hintergrund, Datei rotiert nach Größe) und berechnet rollende Perzentile über
+die letzten Einsätze.
+Zusätzlich zählt und misst CallAccounting jeden WebDriver-Befehl und jede
+HTTP-Anfrage, zugeordnet zur aufrufenden Bot-Methode.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Reihenfolge der Phasen für die Ausgabe
+DISPATCH_STAGES = ['page_load', 'load_more', 'requirements', 'selection', 'commit', 'verify', 'status6']
+
+
+class StageTimer:
+    def __init__(self, mission_id):
+        """Startet die Zeitmessung für einen Einsatz"""
+        self.mission_id = mission_id
+        self.started = time.perf_counter()
+        self.stages = {}  # Phase -> Millisekunden (bei Wiederholung aufsummiert)
+        self.current = None
+        self.current_start = None
+
+    def begin(self, stage):
+        """Beendet die laufende Phase und startet die nächste"""
+        now = time.perf_counter()
+        self.close(now)
+        self.current = stage
+        self.current_start = now
+
+    def close(self, now=None):
+        """Beendet die laufende Phase"""
+        if self.current is None:
+            return
+        now = now if now is not None else time.perf_counter()
+        self.stages[self.current] = self.stages.get(self.current, 0.0) + (now - self.current_start) * 1000
+        self.current = None
+
+    def reached(self, stage):
+        """True wenn die Phase begonnen wurde (auch wenn sie noch läuft)"""
+        return stage == self.current or stage in self.stages
+
+    def finish(self, result):
+        """Beendet die Messung und liefert den Datensatz des Einsatzes"""
+        self.close()
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'mission_id': str(self.mission_id),
+            'result': bool(result),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'stages': {stage: round(ms, 1) for stage, ms in self.stages.items()},
+        }
+
+
+class StageStats:
+    def __init__(self, window=200, records_file=None, max_bytes=5 * 1024 * 1024, backup_count=3):
+        """Rollende Statistik über die letzten window Einsätze
+        (records_file = JSON-Lines-Datei oder None, rotiert bei max_bytes mit backup_count alten Dateien)"""
+        self.window = window
+        self.records_file = records_file
+        self.samples = {}  # Phase -> deque der letzten Dauern
+        self.count = 0
+        self.records = None
+        self.listener = None
+        if records_file:
+            self.open_records(max_bytes, backup_count)
+
+    def open_records(self, max_bytes, backup_count):
+        """Datensätze gehen über eine Queue an einen Hintergrund-Schreiber - keine Datei-I/O in der Alarmierung"""
+        handler = RotatingFileHandler(self.records_file, maxBytes=max_bytes, backupCount=backup_count,
+                                      encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        records_queue = queue.SimpleQueue()
+        self.listener = QueueListener(records_queue, handler)
+        self.listener.start()
+        atexit.register(self.close)
+
+        self.records = logging.getLogger(f'dispatch_timings.{id(self)}')
+        self.records.propagate = False
+        self.records.setLevel(logging.INFO)
+        self.records.addHandler(QueueHandler(records_queue))
+
+    def close(self):
+        """Schreibt ausstehende Datensätze und beendet den Hintergrund-Schreiber"""
+        listener, self.listener = self.listener, None
+        if listener:
+            listener.stop()
+
+    def add(self, record):
+        """Verbucht den Datensatz eines Einsatzes"""
+        self.count += 1
+        for stage, ms in record['stages'].items():
+            self.samples.setdefault(stage, deque(maxlen=self.window)).append(ms)
+        self.samples.setdefault('total', deque(maxlen=self.window)).append(record['total_ms'])
+        self.write(record)
+
+    def write(self, record):
+        """Reiht den Datensatz für die JSON-Lines-Datei ein"""
+        if not self.records or not self.listener:
+            return
+        try:
+            self.records.info(json.dumps(record))
+        except Exception:
+            pass
+
+    def percentile(self, stage, pct):
+        """Perzentil einer Phase in ms (None ohne Messwerte)"""
+        values = self.samples.get(stage)
+        if not values:
+            return None
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100.0)))
+        return ordered[index]
+
+    def summary(self):
+        """Liefert {Phase: {'count', 'p50', 'p95', 'max'}} in fester Reihenfolge"""
+        stages = [s for s in DISPATCH_STAGES if s in self.samples]
+        stages += [s for s in self.samples if s not in stages]
+        return {
+            stage: {
+                'count': len(self.samples[stage]),
+                'p50': self.percentile(stage, 50),
+                'p95': self.percentile(stage, 95),
+                'max': max(self.samples[stage]),
+            }
+            for stage in stages
+        }
+
+    def format_summary(self):
+        """Kurzform für das Log, z.B. 'page_load 310/820 ms, commit 150/400 ms'"""
+        return ', '.join(f"{stage} {values['p50']:.0f}/{values['p95']:.0f} ms"
+                         for stage, values in self.summary().items())
+
+
+class CallAccounting:
+    def __init__(self, source_files):
+        """Zählt WebDriver-Befehle und HTTP-Anfragen pro aufrufender Methode (source_files = Bot-Module)"""
+        self.source_files = {os.path.normcase(os.path.abspath(path)) for path in source_files}
+        self.calls = {}  # (Art, Befehl, Methode) -> [Anzahl, ms]
+        self.is_source = {}  # co_filename -> gehört zu den Bot-Modulen
+        self.lifetime = {'http': 0, 'webdriver': 0}  # Summen seit Start (werden nicht zurückgesetzt)
+        self.lock = threading.Lock()
+
+    def caller(self):
+        """Name der nächsten Methode aus den Bot-Modulen im Aufruf-Stack"""
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            is_source = self.is_source.get(filename)
+            if is_source is None:
+                is_source = self.is_source[filename] = os.path.normcase(os.path.abspath(filename)) in self.source_files
+            if is_source:
+                return frame.f_code.co_name
+            frame = frame.f_back
+        return '?'
+
+    def record(self, kind, command, caller, ms):
+        """Verbucht einen Aufruf"""
+        key = (kind, command, caller)
+        with self.lock:
+            entry = self.calls.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += ms
+            self.lifetime[kind] = self.lifetime.get(kind, 0) + 1
+
+    def wrap_session(self, session):
+        """Misst alle Anfragen einer requests-Session"""
+        original = session.request
+
+        def request(method, url, *args, **kwargs):
+            caller = self.caller()
+            start = time.perf_counter()
+            try:
+                return original(method, url, *args, **kwargs)
+            finally:
+                self.record('http', method.upper(), caller, (time.perf_counter() - start) * 1000)
+
+        session.request = request
+
+    def wrap_driver(self, driver):
+        """Misst alle Befehle eines WebDrivers (auch die von WebElements, sie laufen über driver.execute)"""
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            caller = self.caller()
+            command = driver_command
+            # get_attribute() läuft in Selenium 4 als Skript - getrennt ausweisen
+            if params and str(params.get('script', '')).startswith('/* getAttribute */'):
+                command = 'getAttribute'
+            start = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                self.record('webdriver', command, caller, (time.perf_counter() - start) * 1000)
+
+        driver.execute = execute
+        return driver
+
+    def reset(self):
+        """Liefert die bisherigen Zählungen und setzt sie zurück"""
+        with self.lock:
+            calls, self.calls = self.calls, {}
+        return calls
+
+    @staticmethod
+    def totals(calls):
+        """Summen pro Art: {'http': (Anzahl, ms), 'webdriver': (Anzahl, ms)}"""
+        result = {}
+        for (kind, _, _), (count, ms) in calls.items():
+            total = result.get(kind, (0, 0.0))
+            result[kind] = (total[0] + count, total[1] + ms)
+        return result
+
+    @staticmethod
+    def by_method(calls):
+        """Pro Methode: {Methode: {'http': n, 'webdriver': n, 'ms': float}} absteigend nach Anzahl"""
+        methods = {}
+        for (kind, _, caller), (count, ms) in calls.items():
+            entry = methods.setdefault(caller, {'http': 0, 'webdriver': 0, 'ms': 0.0})
+            entry[kind] += count
+            entry['ms'] += ms
+        return dict(sorted(methods.items(), key=lambda item: item[1]['http'] + item[1]['webdriver'], reverse=True))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log-Anzeige für das GUI
+Ringpuffer mit fester Zeilenzahl (mehrzeilige Meldungen zählen pro Zeile). Neue Zeilen werden pro Tick gesammelt in
+einem einzigen insert() ins Textfeld geschrieben, überzählige Zeilen oben
+abgeschnitten. Level-Filter zeichnen nur den (begrenzten) Puffer neu, die
+Suche markiert Treffer per Tag ohne neu zu zeichnen.
+"""
+
+import logging
+from collections import deque
+
+LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+}
+
+
+def guess_level(message):
+    """Level für GUI-Meldungen ohne Logging-Record (add_log)"""
+    upper = message.upper()
+    if 'FEHLER' in upper or 'ERROR' in upper or '✗' in message:
+        return logging.ERROR
+    if '⚠' in message or 'WARNUNG' in upper:
+        return logging.WARNING
+    return logging.INFO
+
+
+class LogView:
+    def __init__(self, textbox, max_lines=2000, min_level=logging.DEBUG):
+        """Verbindet den Ringpuffer mit einem (CTk)Textbox-Widget"""
+        self.textbox = textbox
+        self.max_lines = max_lines
+        self.min_level = min_level
+        self.entries = deque(maxlen=max_lines)  # (Level, Zeile) - gesamte Historie im Rahmen
+        self.visible = deque()                  # Zeilen, die gerade im Textfeld stehen
+        self.pending = []                       # Neue Einträge seit dem letzten flush()
+        self.search_text = ''
+        self.match_count = 0
+        self.autoscroll = True
+        try:
+            self.textbox.tag_config('search_match', background='#f1c40f', foreground='#000000')
+        except Exception:
+            pass
+
+    def add(self, line, level=logging.INFO):
+        """Merkt eine Meldung für den nächsten flush() vor
+
+        Mehrzeilige Meldungen (Tracebacks, Profil-Zusammenfassung) werden in einzelne Einträge mit
+        demselben Level aufgeteilt - ein Eintrag entspricht immer genau einer Zeile im Textfeld.
+        """
+        for part in line.rstrip('\n').split('\n'):
+            self.pending.append((level, part.rstrip('\r')))
+
+    def flush(self):
+        """Schreibt alle vorgemerkten Zeilen mit einem insert() ins Textfeld"""
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        self.entries.extend(pending)
+
+        lines = [line for level, line in pending if self.accepts(level, line)]
+        if not lines:
+            return
+        lines = lines[-self.max_lines:]
+
+        self.textbox.insert('end', '\n'.join(lines) + '\n')
+        self.visible.extend(lines)
+
+        # Überzählige Zeilen oben in einem Schritt entfernen
+        excess = len(self.visible) - self.max_lines
+        if excess > 0:
+            self.textbox.delete('1.0', f'{excess + 1}.0')
+            for _ in range(excess):
+                self.visible.popleft()
+
+        if self.search_text:
+            self.highlight(start_line=len(self.visible) - len(lines))
+        if self.autoscroll:
+            self.textbox.see('end')
+
+    def accepts(self, level, line):
+        """Prüft den Level-Filter"""
+        return level >= self.min_level
+
+    def set_level(self, level_name):
+        """Setzt den Level-Filter und zeichnet den Puffer neu"""
+        self.min_level = LEVELS.get(level_name, logging.DEBUG)
+        self.visible = deque(line for level, line in self.entries if self.accepts(level, line))
+        self.textbox.delete('1.0', 'end')
+        if self.visible:
+            self.textbox.insert('end', '\n'.join(self.visible) + '\n')
+        if self.search_text:
+            self.highlight()
+        self.textbox.see('end')
+
+    def search(self, text):
+        """Markiert alle Treffer und springt zum letzten - liefert die Anzahl"""
+        self.search_text = text.strip().lower()
+        self.textbox.tag_remove('search_match', '1.0', 'end')
+        if not self.search_text:
+            self.autoscroll = True
+            return 0
+
+        last = self.highlight()
+        # Beim Suchen nicht wegscrollen
+        self.autoscroll = False
+        if last:
+            self.textbox.see(last)
+        return self.match_count
+
+    def highlight(self, start_line=0):
+        """Markiert Treffer ab start_line (0-basiert) und liefert die Position des letzten Treffers"""
+        if start_line == 0:
+            self.match_count = 0
+        last = None
+        length = len(self.search_text)
+        for index in range(max(start_line, 0), len(self.visible)):
+            line = self.visible[index].lower()
+            column = line.find(self.search_text)
+            while column != -1:
+                start = f'{index + 1}.{column}'
+                self.textbox.tag_add('search_match', start, f'{index + 1}.{column + length}')
+                self.match_count += 1
+                last = start
+                column = line.find(self.search_text, column + length)
+        return last
+
+    def clear(self):
+        """Leert Puffer und Anzeige"""
+        self.entries.clear()
+        self.visible.clear()
+        self.pending = []
+        self.textbox.delete('1.0', 'end')
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metriken für den Dauerbetrieb
+Zähler, Gauges und Histogramme im Prometheus-Textformat, optional über einen
+lokalen HTTP-Endpunkt abrufbar (metrics.enabled / metrics.port in config.json):
+
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Standard-Buckets in Sekunden (Alarmierung ~1-10s, Zyklus bis Minuten)
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def format_labels(labels):
+    """('key', 'value')-Tupel -> {key="value",...}"""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def format_value(value):
+    """Zahl im Prometheus-Format"""
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, description, lock):
+        self.name = name
+        self.description = description
+        self.lock = lock
+        self.values = {}  # Label-Tupel -> Wert
+
+    @staticmethod
+    def key(labels):
+        return tuple(sorted(labels.items()))
+
+    def header(self):
+        return [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Erhöht den Zähler"""
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(self.key(labels), 0)
+
+    def render(self):
+        return [f'{self.name}{format_labels(key)} {format_value(value)}' for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        """Setzt den aktuellen Wert"""
+        with self.lock:
+            self.values[self.key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, description, lock, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, description, lock)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        """Verbucht einen Messwert"""
+        key = self.key(labels)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry['counts'][i] += 1
+                    break
+            entry['sum'] += value
+            entry['count'] += 1
+
+    def render(self):
+        lines = []
+        for key, entry in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry['counts']):
+                cumulative += count
+                labels = format_labels(key + (('le', format_value(float(bound))),))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(key)} {format_value(entry["sum"])}')
+            lines.append(f'{self.name}_count{format_labels(key)} {entry["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, prefix='lss_'):
+        """Sammlung aller Metriken eines Bots"""
+        self.prefix = prefix
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, cls, name, description, **kwargs):
+        name = self.prefix + name
+        if name not in self.metrics:
+            self.metrics[name] = cls(name, description, self.lock, **kwargs)
+        return self.metrics[name]
+
+    def counter(self, name, description):
+        return self.register(Counter, name, description)
+
+    def gauge(self, name, description):
+        return self.register(Gauge, name, description)
+
+    def histogram(self, name, description, buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram, name, description, buckets=buckets)
+
+    def render(self):
+        """Alle Metriken im Prometheus-Textformat"""
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                lines.extend(metric.header())
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    def __init__(self, registry, host='127.0.0.1', port=9108):
+        """Lokaler HTTP-Endpunkt /metrics"""
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """Startet den Endpunkt im Hintergrund (OSError wenn der Port belegt ist)"""
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Beendet den Endpunkt"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parser für missing_text ("Fehlende Fahrzeuge: 2 Löschfahrzeuge, 1 RTW, ...")
+Ohne Selenium/requests importierbar, damit er getestet und gebenchmarkt werden kann.
+"""
+
+import re
+
+# (Pattern, Fahrzeugtyp) - die Anzahl steht immer vor Name oder Kurzform,
+# Kurzformen mit Wortgrenze (sonst trifft z.B. "ITW" in "Einsatzleitwagen")
+VEHICLE_PATTERNS = [
+    (re.compile(r'(\d+)\s*x?\s*(?:Rettungswagen|RTW\b)', re.IGNORECASE), 'RTW'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Notarzteinsatzfahrzeug|NEF\b)', re.IGNORECASE), 'NEF'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Notarztwagen|NAW\b)', re.IGNORECASE), 'NAW'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Krankentransportwagen|KTW\b)', re.IGNORECASE), 'KTW'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Rettungshubschrauber|RTH\b)', re.IGNORECASE), 'RTH'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Intensivtransportwagen|ITW\b)', re.IGNORECASE), 'ITW'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Leitender\s+Notarzt|LNA\b)', re.IGNORECASE), 'LNA'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Organisatorischer\s+Leiter|OrgL\b)', re.IGNORECASE), 'ORGL'),
+    (re.compile(r'(\d+)\s*x?\s*KdoW[-\s]*LNA\b', re.IGNORECASE), 'KdoW-LNA'),
+    (re.compile(r'(\d+)\s*x?\s*KdoW[-\s]*OrgL\b', re.IGNORECASE), 'KdoW-ORGL'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Löschfahrzeug|LF\b)', re.IGNORECASE), 'LF'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Drehleiter|DLK\b)', re.IGNORECASE), 'DLK'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Tanklöschfahrzeug|TLF\b)', re.IGNORECASE), 'TLF'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Rüstwagen|RW\b)', re.IGNORECASE), 'RW'),
+    (re.compile(r'(\d+)\s*x?\s*Gerätewagen(?!-)', re.IGNORECASE), 'GW'),  # Nicht GW-A etc.
+    (re.compile(r'(\d+)\s*x?\s*(?:Einsatzleitwagen|ELW\b)', re.IGNORECASE), 'ELW'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Mannschaftstransportwagen|MTW\b)', re.IGNORECASE), 'MTW'),
+    (re.compile(r'(\d+)\s*x?\s*(?:Funkstreifenwagen|FuStW\b|Polizeimotorrad)', re.IGNORECASE), 'FuStW'),
+    (re.compile(r'(\d+)\s*x?\s*GW[-\s]*A\b', re.IGNORECASE), 'GW-A'),
+    (re.compile(r'(\d+)\s*x?\s*GW[-\s]*L\b', re.IGNORECASE), 'GW-L'),
+    (re.compile(r'(\d+)\s*x?\s*GW[-\s]*Öl\b', re.IGNORECASE), 'GW-Öl'),
+]
+
+
+def parse_missing_text(missing_text):
+    """Fahrzeuganforderungen aus missing_text als {Fahrzeugtyp: Anzahl} ({} wenn leer)"""
+    if not missing_text:
+        return {}
+
+    requirements = {}
+    for pattern, vehicle_type in VEHICLE_PATTERNS:
+        matches = pattern.findall(missing_text)
+        if matches:
+            # Summe aller gefundenen Zahlen
+            requirements[vehicle_type] = sum(int(match) for match in matches)
+
+    return requirements
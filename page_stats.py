@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Statistik für Einsatzseiten-Ladevorgänge
+Sammelt übertragene Bytes und Ladezeit pro Browser-Modus (normal/lean) und
+speichert die Durchschnitte, damit die Ersparnis des Lean-Modus auch über
+Neustarts hinweg verglichen werden kann.
+"""
+
+import json
+import os
+
+
+class PageLoadStats:
+    def __init__(self, cache_dir):
+        """Initialisiert die Statistik (persistiert in cache/page_load_stats.json)"""
+        self.path = os.path.join(cache_dir, 'page_load_stats.json')
+        self.modes = self.load()
+
+    def load(self):
+        """Lädt gespeicherte Durchschnitte"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
+
+    def save(self):
+        """Speichert die Durchschnitte"""
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.modes, f, indent=2)
+        except Exception:
+            pass
+
+    def record(self, mode, transfer_bytes, load_ms):
+        """Verbucht einen Seitenaufruf"""
+        entry = self.modes.setdefault(mode, {'pages': 0, 'bytes': 0, 'load_ms': 0.0})
+        entry['pages'] += 1
+        entry['bytes'] += int(transfer_bytes)
+        entry['load_ms'] += float(load_ms)
+        # Nicht bei jedem Einsatz schreiben
+        if entry['pages'] % 10 == 1:
+            self.save()
+
+    def average(self, mode):
+        """Liefert (Ø Bytes, Ø Ladezeit ms) eines Modus oder None"""
+        entry = self.modes.get(mode)
+        if not entry or not entry['pages']:
+            return None
+        return entry['bytes'] / entry['pages'], entry['load_ms'] / entry['pages']
+
+    def savings(self, mode='lean', baseline='normal'):
+        """Liefert (gesparte Bytes, gesparte ms) pro Seite gegenüber der Baseline oder None"""
+        current = self.average(mode)
+        reference = self.average(baseline)
+        if not current or not reference:
+            return None
+        return reference[0] - current[0], reference[1] - current[1]
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profiling auf Abruf
+Läuft die nächsten N Durchläufe unter cProfile und speichert das Ergebnis als
+cache/profile_<Zeit>.prof (auswertbar mit "python -m pstats" oder snakeviz).
+Ausgelöst über bot.profile_cycles in config.json oder den Button im GUI.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+from datetime import datetime
+
+
+class CycleProfiler:
+    def __init__(self, cache_dir, top=20):
+        """Initialisiert den Profiler (top = Anzahl Funktionen in der Zusammenfassung)"""
+        self.cache_dir = cache_dir
+        self.top = top
+        self.remaining = 0
+        self.cycles = 0
+        self.profile = None
+        self.lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.profile is not None or self.remaining > 0
+
+    def request(self, cycles):
+        """Profiliert die nächsten cycles Durchläufe (auch aus einem anderen Thread aufrufbar)"""
+        with self.lock:
+            if self.profile is None:
+                self.remaining = max(int(cycles), 0)
+                self.cycles = self.remaining
+
+    def begin(self):
+        """Zu Beginn eines Durchlaufs (im Bot-Thread) - startet bzw. setzt die Messung fort"""
+        with self.lock:
+            if self.remaining <= 0:
+                return
+            if self.profile is None:
+                self.profile = cProfile.Profile()
+            try:
+                self.profile.enable()
+            except ValueError:
+                # Ein anderer Profiler ist bereits aktiv
+                self.profile = None
+                self.remaining = 0
+
+    def end(self):
+        """Am Ende eines Durchlaufs - liefert (Pfad, Zusammenfassung) nach dem letzten Durchlauf, sonst None"""
+        with self.lock:
+            if self.profile is None:
+                return None
+            self.profile.disable()
+            self.remaining -= 1
+            if self.remaining > 0:
+                return None
+            profile, self.profile = self.profile, None
+
+        path = os.path.join(self.cache_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+        profile.dump_stats(path)
+        return path, self.summary(profile)
+
+    def summary(self, profile):
+        """Top-Funktionen nach kumulierter Zeit als Text"""
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.strip_dirs().sort_stats('cumulative').print_stats(self.top)
+        # Kopfzeilen von pstats überspringen, ab der Tabellenüberschrift ausgeben
+        lines = stream.getvalue().splitlines()
+        for i, line in enumerate(lines):
+            if line.lstrip().startswith('ncalls'):
+                return '\n'.join(lines[i:]).rstrip()
+        return stream.getvalue().rstrip()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zentrales Anfrage-Budget (Token Buckets)
+Jede HTTP-Anfrage, jeder WebDriver-Befehl und jede Alarmierung holt sich vorher
+ein Token aus ihrem Budget. Solange Tokens da sind, geht es ohne Pause weiter -
+gewartet wird nur, wenn die erlaubte Rate wirklich ausgeschöpft ist. Die
+Wartezeit wird pro Budget mitgezählt.
+
+Budgets (limits.budgets in config.json) heißen "<Art>" oder "<Art>:<Schlüssel>",
+z.B. "http", "http:/api/", "browser", "browser:get", "dispatch". Eine Anfrage
+zählt gegen das Budget ihrer Art und das längste passende Schlüssel-Budget
+(Schlüssel mit "/" am Ende gelten als Präfix, alle anderen nur exakt).
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_BUDGETS = {
+    'http': {'rate': 10, 'burst': 20},
+    'http:/api/': {'rate': 4, 'burst': 8},
+    'http:/map/': {'rate': 2, 'burst': 4},
+    'browser': {'rate': 25, 'burst': 50},
+    'browser:get': {'rate': 3, 'burst': 5},
+    'browser:clickElement': {'rate': 5, 'burst': 5},
+    'dispatch': {'rate': 1, 'burst': 3},
+}
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        """rate = Tokens pro Sekunde, burst = maximale Anzahl angesparter Tokens"""
+        self.rate = float(rate)
+        self.burst = float(max(burst, 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Bucht Tokens (auch auf Vorschuss) und liefert die nötige Wartezeit in Sekunden"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            if self.tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateGovernor:
+    def __init__(self, budgets=None):
+        """budgets = {Name: {'rate': ..., 'burst': ...}} zusätzlich zu bzw. statt DEFAULT_BUDGETS"""
+        config = dict(DEFAULT_BUDGETS)
+        config.update(budgets or {})
+        self.buckets = {name: TokenBucket(values.get('rate', 1), values.get('burst', 1))
+                        for name, values in config.items() if values}
+        self.waited = {}   # Budget -> [Anzahl Wartevorgänge, Sekunden] seit reset()
+        self.lifetime = 0.0
+        self.lock = threading.Lock()
+
+    def budget_for(self, kind, key=''):
+        """Name des spezifischsten Schlüssel-Budgets (None wenn keins passt)"""
+        best = None
+        prefix = kind + ':'
+        for name in self.buckets:
+            if not name.startswith(prefix):
+                continue
+            pattern = name[len(prefix):]
+            if key == pattern or (pattern.endswith('/') and key.startswith(pattern)):
+                if best is None or len(name) > len(best):
+                    best = name
+        return best
+
+    def acquire(self, kind, key=''):
+        """Holt ein Token für eine Aktion (wartet nur bei ausgeschöpftem Budget) - liefert die Wartezeit"""
+        delay = 0.0
+        budget = kind
+        for name in (kind, self.budget_for(kind, key)):
+            bucket = self.buckets.get(name) if name else None
+            if bucket:
+                wait = bucket.reserve()
+                if wait > delay:
+                    delay, budget = wait, name
+
+        if delay > 0:
+            time.sleep(delay)
+            with self.lock:
+                entry = self.waited.setdefault(budget, [0, 0.0])
+                entry[0] += 1
+                entry[1] += delay
+                self.lifetime += delay
+        return delay
+
+    def wrap_session(self, session):
+        """Alle Anfragen einer requests-Session laufen über das Budget "http" (Schlüssel = Pfad)"""
+        original = session.request
+
+        def request(method, url, *args, **kwargs):
+            self.acquire('http', urlsplit(url).path)
+            return original(method, url, *args, **kwargs)
+
+        session.request = request
+
+    def wrap_driver(self, driver):
+        """Alle Befehle eines WebDrivers laufen über das Budget "browser" (Schlüssel = Befehl)"""
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            self.acquire('browser', driver_command)
+            return original(driver_command, params)
+
+        driver.execute = execute
+
+    def reset(self):
+        """Liefert die Wartezeiten seit dem letzten Aufruf und setzt sie zurück"""
+        with self.lock:
+            waited, self.waited = self.waited, {}
+        return waited
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Überwachung der Login-Session in der HTTP-Schicht
+Ein Response-Hook der requests-Session erkennt abgelaufene Sessions an jeder
+Antwort (Umleitung auf sign_in oder 401). Dann wird genau ein Re-Login
+ausgeführt - gleichzeitige Aufrufer warten darauf - und die Anfrage einmal
+mit den neuen Cookies wiederholt. Eigene Prüf-Anfragen sind nicht nötig.
+Darf gerade nicht eingeloggt werden (can_relogin liefert False, z.B. während
+einer Alarmierung im Browser), wird nur pending gesetzt - der Aufrufer holt
+den Re-Login dann an einer passenden Stelle nach.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class SessionGuard:
+    def __init__(self, login, on_expired=None, retry_after=60, can_relogin=None):
+        """login = Funktion ohne Argumente (True bei Erfolg), on_expired = Rückruf beim Erkennen des Ablaufs,
+        retry_after = Sekunden Pause nach einem fehlgeschlagenen Re-Login,
+        can_relogin = Funktion ohne Argumente - False verschiebt den Re-Login (pending)"""
+        self.login = login
+        self.on_expired = on_expired
+        self.retry_after = retry_after
+        self.can_relogin = can_relogin
+        self.pending = False     # Re-Login wurde verschoben und steht noch aus
+        self.session = None
+        self.generation = 0      # Zählt erfolgreiche Re-Logins
+        self.failed_at = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def attach(self, session):
+        """Hängt den Hook an eine requests-Session"""
+        self.session = session
+        session.hooks['response'].append(self.response_hook)
+
+    @contextmanager
+    def suspended(self):
+        """Innerhalb des Blocks (im aktuellen Thread) nur erkennen, nicht neu einloggen"""
+        busy = getattr(self.local, 'busy', False)
+        self.local.busy = True
+        try:
+            yield
+        finally:
+            self.local.busy = busy
+
+    @staticmethod
+    def is_expired(response):
+        """True wenn die Antwort auf eine abgelaufene Session hinweist"""
+        if 'sign_in' in (response.request.url if response.request else ''):
+            return False  # Aufrufe der Login-Seite selbst
+        if response.status_code == 401 or 'sign_in' in response.url:
+            return True
+        return response.is_redirect and 'sign_in' in response.headers.get('Location', '')
+
+    def response_hook(self, response, **kwargs):
+        """requests-Hook: bei abgelaufener Session neu einloggen und die Anfrage einmal wiederholen"""
+        if not self.is_expired(response):
+            return None
+
+        seen = self.generation
+        if self.on_expired:
+            self.on_expired(response)
+
+        # Während des Logins bzw. der Wiederholung nicht erneut einloggen
+        if getattr(self.local, 'busy', False):
+            return None
+        if self.can_relogin and not self.can_relogin():
+            self.pending = True
+            return None
+        if not self.relogin(seen):
+            return None
+
+        request = response.request.copy()
+        request.headers.pop('Cookie', None)
+        request.prepare_cookies(self.session.cookies)
+        with self.suspended():
+            return self.session.send(request, **kwargs)
+
+    def relogin(self, seen_generation=None):
+        """Führt einen Re-Login aus - hat ein anderer Thread das inzwischen erledigt, wird nur gewartet"""
+        if seen_generation is None:
+            seen_generation = self.generation
+        with self.lock:
+            if self.generation != seen_generation:
+                return True
+            if self.failed_at and time.time() - self.failed_at < self.retry_after:
+                return False
+
+            try:
+                with self.suspended():
+                    success = bool(self.login())
+            except Exception:
+                success = False
+
+            if success:
+                self.generation += 1
+                self.failed_at = None
+                self.pending = False
+            else:
+                self.failed_at = time.time()
+            return success
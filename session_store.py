@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Speicher für die Login-Session
+Sichert die Cookies einer erfolgreichen Anmeldung im Cache, damit beim nächsten
+Start kein Selenium-Login nötig ist. Der Inhalt ist verschlüsselt: unter
+Windows per DPAPI (an den Windows-Benutzer gebunden), sonst per Fernet mit
+rechnergebundenem Schlüssel (benötigt das Paket cryptography). Ohne beides
+wird keine Session gespeichert. Zusätzlich ist sie per HMAC an den Account gebunden.
+"""
+
+import base64
+import ctypes
+import hashlib
+import hmac
+import json
+import os
+import platform
+import sys
+import time
+import uuid
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    FERNET_AVAILABLE = True
+except ImportError:
+    Fernet = InvalidToken = None
+    FERNET_AVAILABLE = False
+
+DPAPI_AVAILABLE = sys.platform == 'win32'
+ENCRYPTION_AVAILABLE = DPAPI_AVAILABLE or FERNET_AVAILABLE
+
+
+def get_machine_key():
+    """Leitet einen rechnergebundenen Schlüssel ab (gleiche Merkmale wie die Lizenz-Hardware-ID)"""
+    try:
+        mac = ':'.join(['{:02x}'.format((uuid.getnode() >> elements) & 0xff)
+                        for elements in range(0, 2*6, 2)][::-1])
+    except Exception:
+        mac = "unknown"
+
+    hw_string = f"{platform.system()}-{platform.node()}-{platform.machine()}-{mac}"
+    return hashlib.sha256(f"session-store:{hw_string}".encode()).digest()
+
+
+def dpapi(data, entropy, protect=True):
+    """Ver-/Entschlüsselt mit der Windows-DPAPI (CryptProtectData/CryptUnprotectData)"""
+    from ctypes import wintypes
+
+    class DataBlob(ctypes.Structure):
+        _fields_ = [('cbData', wintypes.DWORD), ('pbData', ctypes.POINTER(ctypes.c_char))]
+
+    def blob(value):
+        buffer = ctypes.create_string_buffer(value, len(value))
+        return DataBlob(len(value), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char))), buffer
+
+    blob_in, buffer_in = blob(data)
+    blob_entropy, buffer_entropy = blob(entropy)
+    blob_out = DataBlob()
+    function = ctypes.windll.crypt32.CryptProtectData if protect else ctypes.windll.crypt32.CryptUnprotectData
+    CRYPTPROTECT_UI_FORBIDDEN = 0x01
+    if not function(ctypes.byref(blob_in), None, ctypes.byref(blob_entropy), None, None,
+                    CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)):
+        raise ctypes.WinError()
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+class SessionStore:
+    def __init__(self, cache_dir, account_email, max_age=7 * 86400):
+        """Initialisiert den Speicher für einen Account (max_age = maximale Lebensdauer in Sekunden)"""
+        self.account_email = (account_email or '').strip().lower()
+        account_hash = hashlib.sha256(self.account_email.encode()).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f'session_{account_hash}.dat')
+        self.max_age = max_age
+        self.key = get_machine_key()
+
+    def encrypt(self, data):
+        """Verschlüsselt die Nutzdaten (DPAPI unter Windows, sonst Fernet)"""
+        if DPAPI_AVAILABLE:
+            return 'dpapi', base64.b64encode(dpapi(data, self.account_email.encode())).decode('ascii')
+        fernet = Fernet(base64.urlsafe_b64encode(self.key))
+        return 'fernet', fernet.encrypt(data).decode('ascii')
+
+    def decrypt(self, method, token):
+        """Gegenstück zu encrypt() - wirft eine Exception bei falschem Schlüssel oder Benutzer"""
+        if method == 'dpapi' and DPAPI_AVAILABLE:
+            return dpapi(base64.b64decode(token), self.account_email.encode(), protect=False)
+        if method == 'fernet' and FERNET_AVAILABLE:
+            return Fernet(base64.urlsafe_b64encode(self.key)).decrypt(token.encode('ascii'))
+        raise ValueError(f"Verschlüsselung {method!r} hier nicht verfügbar")
+
+    def sign(self, payload):
+        """Berechnet die Signatur über Account und Nutzdaten"""
+        message = self.account_email.encode() + b'\n' + payload.encode('utf-8')
+        return hmac.new(self.key, message, hashlib.sha256).hexdigest()
+
+    def save(self, cookies, base_url):
+        """Speichert die Cookies verschlüsselt (Liste von Dicts wie von Selenium get_cookies())
+
+        Returns:
+            bool: False wenn keine Verschlüsselung verfügbar ist (dann wird nichts gespeichert)
+        """
+        if not ENCRYPTION_AVAILABLE:
+            return False
+
+        payload = json.dumps({
+            'saved_at': time.time(),
+            'base_url': base_url,
+            'cookies': [
+                {k: cookie.get(k) for k in ('name', 'value', 'domain', 'path', 'expiry', 'secure', 'httpOnly')
+                 if cookie.get(k) is not None}
+                for cookie in cookies if cookie.get('name')
+            ]
+        }, ensure_ascii=False)
+
+        signed = json.dumps({'payload': payload, 'signature': self.sign(payload)})
+        method, token = self.encrypt(signed.encode('utf-8'))
+        data = json.dumps({'encryption': method, 'data': token})
+
+        # Unter Linux/macOS zusätzlich nur für den aktuellen Benutzer lesbar
+        tmp_path = self.path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        try:
+            os.chmod(self.path, 0o600)
+        except OSError:
+            pass
+        return True
+
+    def load(self, base_url):
+        """Lädt die gespeicherten Cookies - None wenn nicht vorhanden, manipuliert oder abgelaufen"""
+        try:
+            if not os.path.exists(self.path):
+                return None
+
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+
+            # Nicht entschlüsselbar (anderer Rechner/Benutzer, alte unverschlüsselte Datei) - verwerfen
+            try:
+                data = json.loads(self.decrypt(stored.get('encryption'), stored.get('data', '')).decode('utf-8'))
+            except Exception:
+                self.clear()
+                return None
+
+            payload = data.get('payload', '')
+            if not hmac.compare_digest(self.sign(payload), data.get('signature', '')):
+                self.clear()
+                return None
+
+            session = json.loads(payload)
+            if session.get('base_url') != base_url:
+                return None
+
+            now = time.time()
+            if now - session.get('saved_at', 0) > self.max_age:
+                self.clear()
+                return None
+
+            cookies = [c for c in session.get('cookies', []) if not c.get('expiry') or c['expiry'] > now]
+            return cookies or None
+
+        except Exception:
+            return None
+
+    def clear(self):
+        """Löscht die gespeicherte Session"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError:
+            pass
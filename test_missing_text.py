@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests für den missing_text-Parser (alte Texte unverändert, Kurzformen ohne Absturz)
+Ausführen: python -m unittest test_missing_text
+"""
+
+import unittest
+
+from missing_text import parse_missing_text
+
+
+class ParseMissingTextTest(unittest.TestCase):
+    def test_empty_text(self):
+        self.assertEqual(parse_missing_text(''), {})
+        self.assertEqual(parse_missing_text(None), {})
+
+    def test_long_names_unchanged(self):
+        # Texte, die auch das alte Pattern ("<Anzahl> <Name>|<Kurzform>") schon richtig gelesen hat
+        cases = {
+            'Fehlende Fahrzeuge: 1 Löschfahrzeug': {'LF': 1},
+            'Fehlende Fahrzeuge: 2 Löschfahrzeuge, 1 Drehleiter': {'LF': 2, 'DLK': 1},
+            'Fehlende Fahrzeuge: 3 Rettungswagen, 1 Notarzteinsatzfahrzeug, 1 Rettungshubschrauber':
+                {'RTW': 3, 'NEF': 1, 'RTH': 1},
+            'Fehlende Fahrzeuge: 4 Löschfahrzeuge, 2 Drehleitern, 1 Rüstwagen, 1 GW-A, 1 GW-L':
+                {'LF': 4, 'DLK': 2, 'RW': 1, 'GW-A': 1, 'GW-L': 1},
+            'Fehlende Fahrzeuge: 2 Funkstreifenwagen': {'FuStW': 2},
+            'Fehlende Fahrzeuge: 1 Tanklöschfahrzeug, 2 x Gerätewagen': {'TLF': 1, 'GW': 2},
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_missing_text(text), expected)
+
+    def test_abbreviation_inside_word_is_ignored(self):
+        # Früher traf "ITW" in "Einsatzleitwagen" und int('') warf ValueError
+        self.assertEqual(parse_missing_text('Fehlende Fahrzeuge: 2 Löschfahrzeuge, 1 Einsatzleitwagen, 1 ITW'),
+                         {'LF': 2, 'ELW': 1, 'ITW': 1})
+
+    def test_abbreviations_take_the_count(self):
+        # Früher lieferte die Kurzform allein eine leere Gruppe statt der Anzahl
+        self.assertEqual(parse_missing_text('Fehlende Fahrzeuge: 2 RTW, 1 NEF, 3 LF'),
+                         {'RTW': 2, 'NEF': 1, 'LF': 3})
+        self.assertEqual(parse_missing_text('Fehlende Fahrzeuge: 2 Funkstreifenwagen, 1 Polizeimotorrad'), {'FuStW': 3})
+
+    def test_kdow_lna_is_not_counted_as_lna(self):
+        self.assertEqual(parse_missing_text('Fehlende Fahrzeuge: 1 Einsatzleitwagen 2, 2 Rettungswagen, 1 KdoW-LNA, 1 GW-Öl'),
+                         {'ELW': 1, 'RTW': 2, 'KdoW-LNA': 1, 'GW-Öl': 1})
+        self.assertEqual(parse_missing_text('Fehlende Fahrzeuge: 1 LNA, 1 KdoW LNA'), {'LNA': 1, 'KdoW-LNA': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests für Token-Bucket und Budget-Zuordnung des RateGovernor (ohne echte Wartezeiten)
+Ausführen: python -m unittest test_rate_governor
+"""
+
+import unittest
+from unittest import mock
+
+import rate_governor
+from rate_governor import RateGovernor, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class ClockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(rate_governor.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TokenBucketTest(ClockTestCase):
+    def test_burst_is_free_then_waits_at_rate(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    def test_refills_over_time_up_to_burst(self):
+        bucket = TokenBucket(rate=1, burst=2)
+        bucket.reserve()
+        bucket.reserve()
+        self.clock.now += 100
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    def test_zero_rate_never_waits(self):
+        bucket = TokenBucket(rate=0, burst=1)
+        self.assertEqual([bucket.reserve() for _ in range(5)], [0.0] * 5)
+
+
+class BudgetMatchingTest(unittest.TestCase):
+    def setUp(self):
+        self.governor = RateGovernor({'http:/api/credits': {'rate': 1, 'burst': 1}})
+
+    def test_longest_prefix_wins(self):
+        self.assertEqual(self.governor.budget_for('http', '/api/vehicles'), 'http:/api/')
+        self.assertEqual(self.governor.budget_for('http', '/map/mission_markers_own.js.erb'), 'http:/map/')
+        self.assertEqual(self.governor.budget_for('http', '/missions/123'), None)
+
+    def test_keys_without_slash_match_exactly(self):
+        self.assertEqual(self.governor.budget_for('http', '/api/credits'), 'http:/api/credits')
+        self.assertEqual(self.governor.budget_for('http', '/api/credits_history'), 'http:/api/')
+        self.assertEqual(self.governor.budget_for('browser', 'get'), 'browser:get')
+        self.assertEqual(self.governor.budget_for('browser', 'getTitle'), None)
+        self.assertEqual(self.governor.budget_for('browser', 'clickElement'), 'browser:clickElement')
+
+    def test_other_kinds_do_not_match(self):
+        self.assertEqual(self.governor.budget_for('dispatch', 'get'), None)
+
+    def test_disabled_budget_is_skipped(self):
+        governor = RateGovernor({'browser:get': None})
+        self.assertEqual(governor.budget_for('browser', 'get'), None)
+
+
+class AcquireTest(ClockTestCase):
+    def test_waits_for_the_tighter_budget_and_records_it(self):
+        governor = RateGovernor({'http': {'rate': 100, 'burst': 100}, 'http:/api/': {'rate': 1, 'burst': 1}})
+        self.assertEqual(governor.acquire('http', '/api/vehicles'), 0.0)
+        self.assertAlmostEqual(governor.acquire('http', '/api/vehicles'), 1.0)
+        # Andere Pfade zählen nur gegen "http"
+        self.assertEqual(governor.acquire('http', '/missions/1'), 0.0)
+
+        waited = governor.reset()
+        self.assertEqual(list(waited), ['http:/api/'])
+        self.assertEqual(waited['http:/api/'][0], 1)
+        self.assertAlmostEqual(waited['http:/api/'][1], 1.0)
+        self.assertEqual(governor.reset(), {})
+        self.assertAlmostEqual(governor.lifetime, 1.0)
+
+    def test_wrap_session_acquires_by_path(self):
+        governor = RateGovernor()
+        calls = []
+
+        class Session:
+            def request(self, method, url, *args, **kwargs):
+                return (method, url)
+
+        session = Session()
+        governor.wrap_session(session)
+        with mock.patch.object(governor, 'acquire', side_effect=lambda kind, key='': calls.append((kind, key))):
+            self.assertEqual(session.request('GET', 'https://www.leitstellenspiel.de/api/credits?x=1'),
+                             ('GET', 'https://www.leitstellenspiel.de/api/credits?x=1'))
+        self.assertEqual(calls, [('http', '/api/credits')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests für den SessionGuard (ohne Netzwerk, mit Fake-Session)
+Ausführen: python -m unittest test_session_guard
+"""
+
+import unittest
+
+from session_guard import SessionGuard
+
+
+class FakeRequest:
+    def __init__(self, url, cookies=''):
+        self.url = url
+        self.method = 'GET'
+        self.path_url = url.split('leitstellenspiel.de', 1)[-1]
+        self.headers = {'Cookie': cookies} if cookies else {}
+
+    def copy(self):
+        return FakeRequest(self.url, self.headers.get('Cookie', ''))
+
+    def prepare_cookies(self, cookies):
+        self.headers['Cookie'] = '; '.join(f"{name}={value}" for name, value in cookies.items())
+
+
+class FakeResponse:
+    def __init__(self, request, status_code=200, url=None, location=None):
+        self.request = request
+        self.status_code = status_code
+        self.url = url or request.url
+        self.headers = {'Location': location} if location else {}
+        self.is_redirect = location is not None
+
+
+class FakeSession:
+    """Antwortet mit 200, solange das Session-Cookie dem aktuell gültigen entspricht"""
+
+    def __init__(self, valid_cookie):
+        self.hooks = {'response': []}
+        self.cookies = {'session': 'alt'}
+        self.valid_cookie = valid_cookie
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request)
+        if request.headers.get('Cookie') == f"session={self.valid_cookie}":
+            return FakeResponse(request)
+        return FakeResponse(request, 302, location='https://www.leitstellenspiel.de/users/sign_in')
+
+    def get(self, url):
+        """Wie requests: Antwort erzeugen und durch die Response-Hooks schicken"""
+        request = FakeRequest(url)
+        request.prepare_cookies(self.cookies)
+        response = self.send(request)
+        for hook in self.hooks['response']:
+            response = hook(response) or response
+        return response
+
+
+class SessionGuardTest(unittest.TestCase):
+    URL = 'https://www.leitstellenspiel.de/api/credits'
+
+    def make_guard(self, login, **kwargs):
+        session = FakeSession(valid_cookie='neu')
+        guard = SessionGuard(login, **kwargs)
+        guard.attach(session)
+        return guard, session
+
+    def test_valid_session_passes_through(self):
+        logins = []
+        guard, session = self.make_guard(lambda: logins.append(1) or True)
+        session.cookies['session'] = 'neu'
+        response = session.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(logins, [])
+        self.assertEqual(len(session.sent), 1)
+
+    def test_expired_session_relogs_and_resends_with_new_cookies(self):
+        expired = []
+
+        def login():
+            session.cookies['session'] = 'neu'
+            return True
+
+        guard, session = self.make_guard(login, on_expired=expired.append)
+        response = session.get(self.URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(expired), 1)
+        self.assertEqual(guard.generation, 1)
+        self.assertEqual(session.sent[-1].headers['Cookie'], 'session=neu')
+
+    def test_already_logged_in_without_cookie_transfer_fails_again(self):
+        # Login meldet Erfolg ("bereits angemeldet"), übernimmt aber keine Cookies:
+        # die Wiederholung läuft erneut auf sign_in und es wird nicht ein zweites Mal eingeloggt
+        logins = []
+        guard, session = self.make_guard(lambda: logins.append(1) or True)
+        response = session.get(self.URL)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(logins, [1])
+        self.assertEqual(len(session.sent), 2)
+
+    def test_already_logged_in_with_cookie_transfer_stops_relogins(self):
+        logins = []
+
+        def login():
+            # Zweig "Du bist bereits angemeldet": Cookies des Browsers übernehmen
+            logins.append(1)
+            session.cookies['session'] = 'neu'
+            return True
+
+        guard, session = self.make_guard(login)
+        for _ in range(3):
+            self.assertEqual(session.get(self.URL).status_code, 200)
+        self.assertEqual(logins, [1])
+
+    def test_relogin_deferred_while_driver_busy(self):
+        logins = []
+        busy = [True]
+        guard, session = self.make_guard(lambda: logins.append(1) or True, can_relogin=lambda: not busy[0])
+
+        response = session.get(self.URL)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(logins, [])
+        self.assertTrue(guard.pending)
+
+        # Nächster Durchlauf: Re-Login wird nachgeholt
+        busy[0] = False
+        self.assertTrue(guard.relogin())
+        self.assertEqual(logins, [1])
+        self.assertFalse(guard.pending)
+
+    def test_failed_relogin_is_not_retried_immediately(self):
+        logins = []
+        guard, session = self.make_guard(lambda: logins.append(1) or False, retry_after=60)
+        session.get(self.URL)
+        session.get(self.URL)
+        self.assertEqual(logins, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()